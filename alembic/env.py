@@ -24,7 +24,8 @@ if config.config_file_name is not None:
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
 
-from app.models.models import Base 
+from app.models.base import Base
+from app.models import user, order  # registra as tabelas no metadata
 
 target_metadata = Base.metadata
 
@@ -0,0 +1,33 @@
+"""Indices em pedidos e itens_pedidos
+
+Revision ID: 8c1f4e2a9b7d
+Revises: 3ea07037adb4
+Create Date: 2026-10-18 10:12:41.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1f4e2a9b7d'
+down_revision: Union[str, Sequence[str], None] = '3ea07037adb4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # (usuario_id, id) também atende buscas só por usuario_id
+    op.create_index('ix_pedidos_usuario_id_id', 'pedidos', ['usuario_id', 'id'], unique=False)
+    op.create_index('ix_pedidos_status_id', 'pedidos', ['status', 'id'], unique=False)
+    op.create_index('ix_itens_pedidos_pedido', 'itens_pedidos', ['pedido'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_itens_pedidos_pedido', table_name='itens_pedidos')
+    op.drop_index('ix_pedidos_status_id', table_name='pedidos')
+    op.drop_index('ix_pedidos_usuario_id_id', table_name='pedidos')
@@ -0,0 +1,29 @@
+"""Versao do pedido
+
+Revision ID: b41d7e93c5a2
+Revises: 8c1f4e2a9b7d
+Create Date: 2026-10-18 20:31:07.518243
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41d7e93c5a2'
+down_revision: Union[str, Sequence[str], None] = '8c1f4e2a9b7d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('pedidos', sa.Column('versao', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('pedidos') as batch_op:
+        batch_op.drop_column('versao')
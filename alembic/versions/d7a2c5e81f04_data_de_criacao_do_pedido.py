@@ -0,0 +1,31 @@
+"""Data de criacao do pedido
+
+Revision ID: d7a2c5e81f04
+Revises: b41d7e93c5a2
+Create Date: 2026-10-18 21:14:52.903116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a2c5e81f04'
+down_revision: Union[str, Sequence[str], None] = 'b41d7e93c5a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Sem server_default: o SQLite não aceita default não constante em ADD COLUMN.
+    # O valor vem do model (func.now()) a cada inserção.
+    op.add_column('pedidos', sa.Column('criado_em', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('pedidos') as batch_op:
+        batch_op.drop_column('criado_em')
@@ -0,0 +1,55 @@
+"""Resumo de pedidos por usuario
+
+Revision ID: e3b9f6a1c2d8
+Revises: d7a2c5e81f04
+Create Date: 2026-10-18 22:02:41.336718
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b9f6a1c2d8'
+down_revision: Union[str, Sequence[str], None] = 'd7a2c5e81f04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'resumo_pedidos',
+        sa.Column('usuario_id', sa.Integer(), nullable=False),
+        sa.Column('pendentes', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('cancelados', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('finalizados', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('total_gasto', sa.Float(), server_default='0', nullable=False),
+        sa.Column('ultimo_pedido_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['usuario_id'], ['usuarios.id'], ),
+        sa.PrimaryKeyConstraint('usuario_id')
+    )
+    # Preenche com os pedidos existentes (em bancos grandes, prefira
+    # python -m app.cli reconstruir-resumos, que processa em lotes)
+    op.execute(
+        """
+        INSERT INTO resumo_pedidos
+            (usuario_id, pendentes, cancelados, finalizados, total_gasto, ultimo_pedido_id)
+        SELECT
+            usuario_id,
+            SUM(CASE WHEN status = 'PENDENTE' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN status = 'CANCELADO' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN status = 'FINALIZADO' THEN 1 ELSE 0 END),
+            COALESCE(SUM(CASE WHEN status = 'FINALIZADO' THEN preco ELSE 0 END), 0),
+            MAX(id)
+        FROM pedidos
+        GROUP BY usuario_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('resumo_pedidos')
@@ -1,14 +1,12 @@
 from fastapi import APIRouter, Depends, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from app.db.session import get_session
-from app.models.user import Usuario
-from app.schemas.user import UserCreate
+from app.db.session import get_db
+from app.schemas.user import UserCreate, UserPrincipal
 from app.schemas.auth import TokenResponse, UserLogin
 from app.core.deps import get_current_user
 from app.services.auth_service import (
-    create_user,
-    authenticate_user,
+    create_user_async,
+    authenticate_user_async,
     refresh_access_token,
 )
 auth_router = APIRouter(
@@ -20,7 +18,7 @@ auth_router = APIRouter(
 # Rota base de autenticação
 # -------------------------------------------------
 @auth_router.get("/")
-def auth_home():
+async def auth_home():
     """
     Rota base do módulo de autenticação.
 
@@ -40,17 +38,17 @@ def auth_home():
     "/sign-up",
     status_code=status.HTTP_201_CREATED
 )
-def sign_up(
+async def sign_up(
     user_data: UserCreate,
-    db: Session = Depends(get_session),
-    current_user: Usuario = Depends(get_current_user)
+    db=Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user)
 ):
     """
     Cria um novo usuário no sistema.
 
     Apenas administradores podem criar usuários admin.
     """
-    user = create_user(
+    user = await create_user_async(
         user_data=user_data,
         db=db,
         current_user=current_user
@@ -71,14 +69,14 @@ def sign_up(
     "/sign-in",
     response_model=TokenResponse
 )
-def sign_in(
+async def sign_in(
     login_data: UserLogin,
-    db: Session = Depends(get_session)
+    db=Depends(get_db)
 ):
     """
     Autentica o usuário e retorna um token JWT.
     """
-    return authenticate_user(
+    return await authenticate_user_async(
         login_data=login_data,
         db=db
     )
@@ -91,9 +89,9 @@ def sign_in(
     "/sign-in-form",
     response_model=TokenResponse
 )
-def sign_in_form(
+async def sign_in_form(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_session)
+    db=Depends(get_db)
 ):
     """
     Autenticação via formulário (OAuth2).
@@ -105,7 +103,7 @@ def sign_in_form(
         senha=form_data.password
     )
 
-    return authenticate_user(
+    return await authenticate_user_async(
         login_data=login_data,
         db=db
     )
@@ -118,8 +116,8 @@ def sign_in_form(
     "/refresh",
     response_model=TokenResponse
 )
-def refresh_token(
-    user: Usuario = Depends(get_current_user)
+async def refresh_token(
+    user: UserPrincipal = Depends(get_current_user)
 ):
     """
     Gera um novo token de acesso usando o token atual.
@@ -0,0 +1,105 @@
+from typing import Optional
+from fastapi import APIRouter, Header
+from fastapi.responses import PlainTextResponse
+from app.core.config import settings
+from app.core.deps import user_cache
+from app.core.events import get_order_broker
+from app.core.exceptions import UnauthorizedException
+from app.core.metrics import metrics
+from app.core.password_pool import password_pool
+from app.db.pool import pool_stats
+from app.db.session import active_engine, read_replicas
+from app.api.routes.order_routes import order_cache
+from app.services.analytics_service import analytics_cache
+
+metrics_router = APIRouter(tags=["metrics"])
+
+# -------------------------------------------------
+# Estado lido na hora da coleta
+# -------------------------------------------------
+db_pool_size = metrics.gauge(
+    "delivery_db_pool_size", "Tamanho configurado do pool de conexões.", ("engine",)
+)
+db_pool_checked_out = metrics.gauge(
+    "delivery_db_pool_checked_out", "Conexões em uso.", ("engine",)
+)
+db_pool_overflow = metrics.gauge(
+    "delivery_db_pool_overflow", "Conexões abertas além do pool_size.", ("engine",)
+)
+db_pool_checkout_timeouts = metrics.counter(
+    "delivery_db_pool_checkout_timeouts_total",
+    "Checkouts que estouraram o pool_timeout.",
+    ("engine",)
+)
+cache_hits = metrics.counter("delivery_cache_hits_total", "Acertos do cache.", ("cache",))
+cache_misses = metrics.counter("delivery_cache_misses_total", "Falhas do cache.", ("cache",))
+cache_hit_ratio = metrics.gauge(
+    "delivery_cache_hit_ratio", "Acertos / consultas desde o início do processo.", ("cache",)
+)
+password_pool_in_flight = metrics.gauge(
+    "delivery_password_pool_in_flight", "Operações de bcrypt em andamento ou na fila."
+)
+password_pool_rejected = metrics.counter(
+    "delivery_password_pool_rejected_total", "Operações de bcrypt recusadas (429)."
+)
+order_events_subscribers = metrics.gauge(
+    "delivery_order_events_subscribers", "Conexões SSE assinando eventos de pedidos."
+)
+order_events_published = metrics.counter(
+    "delivery_order_events_published_total", "Eventos de pedidos publicados."
+)
+
+CACHES = {
+    "usuarios": user_cache,
+    "pedidos": order_cache,
+    "relatorio": analytics_cache,
+}
+
+
+def _engines():
+    yield "primario", active_engine()
+    for indice, engine in enumerate(read_replicas.engines):
+        yield f"replica_{indice}", getattr(engine, "sync_engine", engine)
+
+
+def _collect():
+    for nome, engine in _engines():
+        stats = pool_stats(engine.pool)
+        if "size" in stats:
+            db_pool_size.set(stats["size"], nome)
+            db_pool_checked_out.set(stats["checked_out"], nome)
+            db_pool_overflow.set(stats["overflow"], nome)
+        if "timeouts" in stats:
+            db_pool_checkout_timeouts.set(stats["timeouts"], nome)
+
+    for nome, cache in CACHES.items():
+        stats = cache.stats()
+        cache_hits.set(stats["hits"], nome)
+        cache_misses.set(stats["misses"], nome)
+        cache_hit_ratio.set(stats["hit_ratio"], nome)
+
+    stats = password_pool.stats()
+    password_pool_in_flight.set(stats["in_flight"])
+    password_pool_rejected.set(stats["rejected"])
+
+    stats = get_order_broker().stats()
+    order_events_subscribers.set(stats.get("subscribers", 0))
+    order_events_published.set(stats.get("published", 0))
+
+
+# -------------------------------------------------
+# Métricas (Prometheus)
+# -------------------------------------------------
+@metrics_router.get("/metrics", include_in_schema=False)
+async def metrics_endpoint(authorization: Optional[str] = Header(None)):
+    """
+    Métricas do processo no formato texto do Prometheus.
+    """
+    if settings.METRICS_TOKEN and authorization != f"Bearer {settings.METRICS_TOKEN}":
+        raise UnauthorizedException("Token de métricas inválido")
+
+    _collect()
+    return PlainTextResponse(
+        metrics.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
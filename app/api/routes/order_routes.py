@@ -1,24 +1,207 @@
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
-from typing import List
-from app.db.session import get_session
-from app.core.deps import get_current_user
-from app.models.user import Usuario
-from app.schemas.order import OrderItem, ResponsePedidoSchema
-from app.services import order_service
+import hashlib
+import json
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import Literal, Optional
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.events import get_order_broker
+from app.core.exceptions import PayloadTooLargeException
+from app.db.session import (
+    get_db,
+    run_in_session,
+    run_write,
+    read_replicas,
+    session_bind,
+    stream_partitions,
+)
+from app.core.deps import get_current_user, get_read_db
+from app.schemas.user import UserPrincipal
+from app.schemas.order import (
+    OrderItem,
+    OrderCreate,
+    OrderItemsBatch,
+    ResponsePedidoSchema,
+    FiltroPedidos,
+    FiltroExportacao,
+    PaginaPedidosSchema,
+    PaginaPedidosAdminSchema,
+    ResultadoImportacao,
+    ResumoPedidosSchema,
+    FiltroRelatorio,
+    RelatorioPedidosSchema,
+)
+from app.services import (
+    order_service,
+    export_service,
+    import_service,
+    summary_service,
+    analytics_service,
+)
 
 order_router = APIRouter(
     prefix="/orders",
-    tags=["orders"]
+    tags=["orders"],
+    default_response_class=ORJSONResponse
+)
+
+
+# -------------------------------------------------
+# Serialização dentro da sessão
+# (itens são carregados sob demanda e não podem ser
+# acessados depois que a sessão assíncrona devolve o controle)
+#
+# Listagens e consultas usam a projeção em dicts do order_service:
+# sem objetos ORM e sem jsonable_encoder. /listar devolve o dict, validado
+# pelo response_model; as rotas com ETag respondem direto (o 304 não tem
+# corpo) e o schema fica só na documentação
+# -------------------------------------------------
+def _list_all_orders(db, user, filtros, cursor, limite):
+    pedidos = order_service.list_all_orders_projected(db, user, filtros, cursor, limite)
+    return {
+        "pedidos": pedidos,
+        "next_cursor": order_service.next_cursor(pedidos, limite)
+    }
+
+
+def _update_items(db, pedido_id, itens, user):
+    pedido = order_service.update_order_items(db, pedido_id, itens, user)
+    return ResponsePedidoSchema.model_validate(pedido)
+
+
+# -------------------------------------------------
+# Consultas condicionais (ETag / If-None-Match)
+# -------------------------------------------------
+# Pedidos já serializados, por (id, versão): uma nova versão gera uma nova
+# chave, então nada precisa ser invalidado
+order_cache = TTLCache(
+    maxsize=settings.ORDER_CACHE_MAXSIZE,
+    ttl=settings.ORDER_CACHE_TTL_SECONDS
 )
 
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag
+        for tag in if_none_match.split(",")
+    )
+
+
+def _conditional_response(etag: str, corpo) -> Response:
+    """
+    304 sem corpo quando corpo é None; senão o JSON com a ETag.
+    """
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if corpo is None:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return ORJSONResponse(corpo, headers=headers)
+
+
+def _load_orders(db, ids) -> dict:
+    """
+    Projeta os pedidos informados e guarda cada um no cache pela versão lida.
+    """
+    carregados = {}
+    for versao, corpo in order_service.get_orders_projected(db, ids):
+        order_cache.set((corpo["id"], versao), corpo)
+        carregados[corpo["id"]] = corpo
+    return carregados
+
+
+def _list_user_orders(db, user, filtros, cursor, limite, if_none_match):
+    """
+    A ETag da página vem dos pares (id, versão); só os pedidos
+    fora do cache são carregados (com os itens).
+    """
+    versoes = order_service.list_user_order_versions(db, user, filtros, cursor, limite)
+    digest = hashlib.sha1(
+        repr((limite, [tuple(linha) for linha in versoes])).encode()
+    ).hexdigest()
+    etag = f'"{digest}"'
+    if _etag_matches(if_none_match, etag):
+        return etag, None
+
+    corpos = {
+        pedido_id: order_cache.get((pedido_id, versao))
+        for pedido_id, versao in versoes
+    }
+    faltando = [pedido_id for pedido_id, corpo in corpos.items() if corpo is None]
+    corpos.update(_load_orders(db, faltando))
+
+    return etag, {
+        "pedidos": [corpos[pedido_id] for pedido_id, _ in versoes],
+        "next_cursor": order_service.next_cursor(versoes, limite)
+    }
+
+
+def _view_order(db, pedido_id, user, if_none_match):
+    """
+    ETag e corpo saem da mesma linha do pedido: uma alteração entre duas
+    leituras não gera uma ETag de uma versão com o corpo de outra.
+    """
+    linha = order_service.get_order_row(db, pedido_id, user)
+    etag = f'"{pedido_id}-{linha.versao}"'
+    if _etag_matches(if_none_match, etag):
+        return etag, None
+
+    corpo = order_cache.get((pedido_id, linha.versao))
+    if corpo is None:
+        corpo = order_service.project_orders(db, [linha])[0]
+        order_cache.set((pedido_id, linha.versao), corpo)
+    return etag, corpo
+
+
+# -------------------------------------------------
+# Eventos de pedidos (Server-Sent Events)
+# -------------------------------------------------
+async def _order_event_stream(usuario_id: int, keepalive: float):
+    """
+    Eventos dos pedidos do usuário no formato SSE, com comentários de
+    keep-alive para proxies não fecharem a conexão ociosa.
+    """
+    broker = get_order_broker()
+    inscricao = broker.subscribe(usuario_id)
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            evento = await inscricao.get(timeout=keepalive)
+            if evento is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield (
+                f"id: {evento['pedido_id']}-{evento['versao']}\n"
+                f"event: pedido\n"
+                f"data: {json.dumps(evento)}\n\n"
+            )
+    finally:
+        broker.unsubscribe(inscricao)
+
+
+# -------------------------------------------------
+# Exportação em streaming
+# -------------------------------------------------
+async def _export_stream(bind, statement, exportador):
+    """
+    Lê e envia em lotes: a memória usada não depende do tamanho da tabela.
+    """
+    yield exportador.header()
+    async for lote in stream_partitions(bind, statement, export_service.EXPORT_BATCH_SIZE):
+        bloco = exportador.encode(lote)
+        if bloco:
+            yield bloco
+    yield exportador.finish()
+
+
 # -------------------------------------------------
 # Rota base
 # -------------------------------------------------
 @order_router.get("/")
-def orders_home(
-    user: Usuario = Depends(get_current_user)
+async def orders_home(
+    user: UserPrincipal = Depends(get_current_user)
 ):
     """
     Rota base do módulo de pedidos.
@@ -38,17 +221,26 @@ def orders_home(
     "/pedido",
     status_code=status.HTTP_201_CREATED
 )
-def create_order(
-    db: Session = Depends(get_session),
-    user: Usuario = Depends(get_current_user)
+async def create_order(
+    pedido_data: Optional[OrderCreate] = None,
+    db=Depends(get_db),
+    user: UserPrincipal = Depends(get_current_user)
 ):
     """
     Cria um novo pedido para o usuário autenticado.
+
+    O corpo é opcional: envie os itens iniciais para criar o pedido
+    completo em uma única requisição.
     """
-    pedido = order_service.create_order(db, user)
+    itens = pedido_data.itens if pedido_data else None
+    pedido = await run_write(
+        db, order_service.create_order, user, itens
+    )
+    read_replicas.mark_write(user.id)
     return {
         "message": "Pedido criado com sucesso",
-        "pedido_id": pedido.id
+        "pedido_id": pedido.id,
+        "preco_total": pedido.preco
     }
 
 
@@ -56,15 +248,18 @@ def create_order(
 # Cancelar pedido
 # -------------------------------------------------
 @order_router.post("/pedido/cancelar/{pedido_id}")
-def cancel_order(
+async def cancel_order(
     pedido_id: int,
-    db: Session = Depends(get_session),
-    user: Usuario = Depends(get_current_user)
+    db=Depends(get_db),
+    user: UserPrincipal = Depends(get_current_user)
 ):
     """
     Cancela um pedido existente.
     """
-    pedido = order_service.cancel_order(db, pedido_id, user)
+    pedido = await run_write(
+        db, order_service.cancel_order, pedido_id, user
+    )
+    read_replicas.mark_write(user.id)
     return {
         "message": "Pedido cancelado com sucesso",
         "status": pedido.status
@@ -75,15 +270,18 @@ def cancel_order(
 # Finalizar pedido
 # -------------------------------------------------
 @order_router.post("/pedido/finalizar/{pedido_id}")
-def finalize_order(
+async def finalize_order(
     pedido_id: int,
-    db: Session = Depends(get_session),
-    user: Usuario = Depends(get_current_user)
+    db=Depends(get_db),
+    user: UserPrincipal = Depends(get_current_user)
 ):
     """
     Finaliza um pedido.
     """
-    pedido = order_service.finalize_order(db, pedido_id, user)
+    pedido = await run_write(
+        db, order_service.finalize_order, pedido_id, user
+    )
+    read_replicas.mark_write(user.id)
     return {
         "message": "Pedido finalizado com sucesso",
         "status": pedido.status
@@ -93,15 +291,149 @@ def finalize_order(
 # -------------------------------------------------
 # Listar pedidos (admin)
 # -------------------------------------------------
-@order_router.get("/listar")
-def list_orders(
-    db: Session = Depends(get_session),
-    user: Usuario = Depends(get_current_user)
+@order_router.get(
+    "/listar",
+    response_model=PaginaPedidosAdminSchema,
+    response_class=ORJSONResponse
+)
+async def list_orders(
+    filtros: FiltroPedidos = Depends(),
+    cursor: Optional[int] = None,
+    limite: int = Query(order_service.PAGE_SIZE_DEFAULT, ge=1, le=order_service.PAGE_SIZE_MAX),
+    db=Depends(get_read_db),
+    user: UserPrincipal = Depends(get_current_user)
+):
+    """
+    Lista os pedidos do sistema (admin), paginados por cursor.
+
+    Envie o next_cursor recebido como cursor para obter a próxima página.
+    """
+    return await run_in_session(
+        db, _list_all_orders, user, filtros, cursor, limite
+    )
+
+
+# -------------------------------------------------
+# Exportar pedidos (admin)
+# -------------------------------------------------
+@order_router.get("/exportar")
+async def export_orders(
+    formato: Literal["ndjson", "csv"] = "ndjson",
+    filtros: FiltroExportacao = Depends(),
+    db=Depends(get_read_db),
+    user: UserPrincipal = Depends(get_current_user)
+):
+    """
+    Exporta todos os pedidos com os itens (admin), em NDJSON (um pedido
+    por linha) ou CSV (uma linha por item), transmitidos em lotes.
+
+    Filtros opcionais: status, faixa de id (id_min, id_max) e data de
+    criação (criado_de, criado_ate).
+    """
+    statement = export_service.export_statement(user, filtros)
+    exportador = export_service.EXPORTADORES[formato]()
+    return StreamingResponse(
+        _export_stream(session_bind(db), statement, exportador),
+        media_type=exportador.media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="pedidos.{exportador.extensao}"'
+        }
+    )
+
+
+# -------------------------------------------------
+# Relatório de pedidos (admin)
+# -------------------------------------------------
+@order_router.get(
+    "/relatorio",
+    response_model=RelatorioPedidosSchema
+)
+async def order_report(
+    filtros: FiltroRelatorio = Depends(),
+    atualizar: bool = False,
+    db=Depends(get_read_db),
+    user: UserPrincipal = Depends(get_current_user)
 ):
     """
-    Lista todos os pedidos do sistema (admin).
+    Pedidos, receita e ticket médio por status, com as combinações
+    sabor/tamanho mais vendidas (top) em cada status (admin).
+
+    O resultado fica em cache por ANALYTICS_CACHE_TTL_SECONDS (veja
+    gerado_em); envie atualizar=true para recalcular na hora.
     """
-    return order_service.list_all_orders(db, user)
+    analytics_service.check_analytics_permission(user)
+    return await analytics_service.order_analytics_async(
+        db,
+        filtros.top,
+        filtros.criado_de,
+        filtros.criado_ate,
+        atualizar=atualizar
+    )
+
+
+# -------------------------------------------------
+# Importar pedidos (admin)
+# -------------------------------------------------
+async def _read_ndjson(request: Request, lote: int, max_bytes: int):
+    """
+    Linhas do corpo em grupos de ao menos `lote`, separadas à medida que
+    os pedaços chegam (a linha incompleta do fim de um pedaço segue para
+    o próximo): o corpo nunca fica inteiro em memória.
+    """
+    tamanho = request.headers.get("content-length")
+    if tamanho and tamanho.isdigit() and int(tamanho) > max_bytes:
+        raise PayloadTooLargeException(f"Corpo acima de {max_bytes} bytes")
+
+    recebidos = 0
+    resto = b""
+    linhas = []
+    async for pedaco in request.stream():
+        recebidos += len(pedaco)
+        if recebidos > max_bytes:
+            raise PayloadTooLargeException(f"Corpo acima de {max_bytes} bytes")
+        if b"\n" not in pedaco:
+            resto += pedaco
+            continue
+
+        *completas, ultima = pedaco.split(b"\n")
+        completas[0] = resto + completas[0]
+        resto = ultima
+        linhas.extend(completas)
+        if len(linhas) >= lote:
+            yield linhas
+            linhas = []
+
+    if resto:
+        linhas.append(resto)
+    if linhas:
+        yield linhas
+
+
+@order_router.post(
+    "/importar",
+    response_model=ResultadoImportacao
+)
+async def import_orders(
+    request: Request,
+    lote: int = Query(settings.IMPORT_CHUNK_SIZE, ge=1, le=10_000),
+    db=Depends(get_db),
+    user: UserPrincipal = Depends(get_current_user)
+):
+    """
+    Importa pedidos em lote (admin) a partir de um corpo NDJSON: um pedido
+    por linha, com usuario, itens e, opcionalmente, status e criado_em.
+
+    Linhas inválidas não interrompem a importação: são devolvidas em
+    erros com o número da linha.
+
+    O corpo é lido em streaming, até IMPORT_MAX_BYTES (413 acima disso;
+    sem Content-Length, os lotes gravados antes do limite permanecem).
+    """
+    import_service.check_import_permission(user)
+    importador = import_service.OrderImporter(lote)
+    async for linhas in _read_ndjson(request, lote, settings.IMPORT_MAX_BYTES):
+        await run_write(db, importador.feed, linhas)
+    return await run_write(db, importador.finish)
 
 
 # -------------------------------------------------
@@ -109,16 +441,26 @@ def list_orders(
 # -------------------------------------------------
 @order_router.get(
     "/meus_pedidos",
-    response_model=List[ResponsePedidoSchema]
+    response_model=PaginaPedidosSchema
 )
-def view_my_orders(
-    db: Session = Depends(get_session),
-    user: Usuario = Depends(get_current_user)
+async def view_my_orders(
+    filtros: FiltroPedidos = Depends(),
+    cursor: Optional[int] = None,
+    limite: int = Query(order_service.PAGE_SIZE_DEFAULT, ge=1, le=order_service.PAGE_SIZE_MAX),
+    if_none_match: Optional[str] = Header(None),
+    db=Depends(get_read_db),
+    user: UserPrincipal = Depends(get_current_user)
 ):
     """
-    Lista os pedidos do usuário autenticado.
+    Lista os pedidos do usuário autenticado, paginados por cursor.
+
+    Responde com ETag; envie-a em If-None-Match para receber 304
+    enquanto nenhum pedido da página mudar.
     """
-    return order_service.list_user_orders(db, user)
+    etag, corpo = await run_in_session(
+        db, _list_user_orders, user, filtros, cursor, limite, if_none_match
+    )
+    return _conditional_response(etag, corpo)
 
 
 # -------------------------------------------------
@@ -128,31 +470,82 @@ def view_my_orders(
     "/pedido/{pedido_id}",
     response_model=ResponsePedidoSchema
 )
-def view_order(
+async def view_order(
     pedido_id: int,
-    db: Session = Depends(get_session),
-    user: Usuario = Depends(get_current_user)
+    if_none_match: Optional[str] = Header(None),
+    db=Depends(get_read_db),
+    user: UserPrincipal = Depends(get_current_user)
 ):
     """
     Visualiza um pedido específico.
+
+    Responde com ETag ("<id>-<versão>"); com If-None-Match igual à versão
+    atual retorna 304 sem carregar o pedido.
+    """
+    etag, corpo = await run_in_session(db, _view_order, pedido_id, user, if_none_match)
+    return _conditional_response(etag, corpo)
+
+
+# -------------------------------------------------
+# Resumo dos pedidos por usuário
+# -------------------------------------------------
+@order_router.get(
+    "/resumo",
+    response_model=ResumoPedidosSchema
+)
+async def order_summary(
+    usuario_id: Optional[int] = None,
+    db=Depends(get_read_db),
+    user: UserPrincipal = Depends(get_current_user)
+):
+    """
+    Pedidos por status, total gasto (pedidos finalizados) e último pedido
+    do usuário autenticado; admins podem consultar outro usuario_id.
+
+    Lido da tabela de resumo, sem percorrer os pedidos.
     """
-    return order_service.get_order_by_id(db, pedido_id, user)
+    return await run_in_session(
+        db, summary_service.get_user_summary, user, usuario_id
+    )
+
+
+# -------------------------------------------------
+# Acompanhar pedidos em tempo real
+# -------------------------------------------------
+@order_router.get("/eventos")
+async def order_events(
+    user: UserPrincipal = Depends(get_current_user)
+):
+    """
+    Stream (text/event-stream) com as mudanças de status e preço dos
+    pedidos do usuário autenticado, substituindo o polling.
+
+    Cada evento "pedido" traz tipo, pedido_id, status, preco e versao.
+    """
+    return StreamingResponse(
+        _order_event_stream(user.id, settings.ORDER_EVENTS_KEEPALIVE_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 # -------------------------------------------------
 # Adicionar item
 # -------------------------------------------------
 @order_router.post("/pedido/adicionar_item/{pedido_id}")
-def add_item(
+async def add_item(
     pedido_id: int,
     item: OrderItem,
-    db: Session = Depends(get_session),
-    user: Usuario = Depends(get_current_user)
+    db=Depends(get_db),
+    user: UserPrincipal = Depends(get_current_user)
 ):
     """
     Adiciona um item ao pedido.
     """
-    pedido = order_service.add_item_to_order(db, pedido_id, item, user)
+    pedido = await run_write(
+        db, order_service.add_item_to_order, pedido_id, item, user
+    )
+    read_replicas.mark_write(user.id)
     return {
         "message": "Item adicionado com sucesso",
         "preco_total": pedido.preco
@@ -163,16 +556,42 @@ def add_item(
 # Remover item
 # -------------------------------------------------
 @order_router.delete("/pedido/remover_item/{item_id}")
-def remove_item(
+async def remove_item(
     item_id: int,
-    db: Session = Depends(get_session),
-    user: Usuario = Depends(get_current_user)
+    db=Depends(get_db),
+    user: UserPrincipal = Depends(get_current_user)
 ):
     """
     Remove um item do pedido.
     """
-    pedido = order_service.remove_item_from_order(db, item_id, user)
+    pedido = await run_write(
+        db, order_service.remove_item_from_order, item_id, user
+    )
+    read_replicas.mark_write(user.id)
     return {
         "message": "Item removido com sucesso",
         "preco_total": pedido.preco
     }
+
+
+# -------------------------------------------------
+# Adicionar / remover itens em lote
+# -------------------------------------------------
+@order_router.post(
+    "/pedido/atualizar_itens/{pedido_id}",
+    response_model=ResponsePedidoSchema
+)
+async def update_items(
+    pedido_id: int,
+    itens: OrderItemsBatch,
+    db=Depends(get_db),
+    user: UserPrincipal = Depends(get_current_user)
+):
+    """
+    Adiciona e remove vários itens do pedido em uma única requisição.
+
+    Retorna o pedido atualizado com o preço final.
+    """
+    pedido = await run_write(db, _update_items, pedido_id, itens, user)
+    read_replicas.mark_write(user.id)
+    return pedido
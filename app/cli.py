@@ -0,0 +1,93 @@
+"""
+Comandos de manutenção da API.
+
+Uso:
+    python -m app.cli verificar-totais [--corrigir]
+    python -m app.cli importar-pedidos pedidos.ndjson [--lote 1000]
+    python -m app.cli reconstruir-resumos [--lote 1000]
+"""
+import argparse
+from app.db.session import SessionLocal
+from app.core.config import settings
+from app.services import order_service, import_service, summary_service
+
+
+def verificar_totais(args):
+    db = SessionLocal()
+    try:
+        divergencias = order_service.check_order_totals(
+            db,
+            corrigir=args.corrigir,
+            tolerancia=args.tolerancia
+        )
+    finally:
+        db.close()
+
+    for d in divergencias:
+        print(
+            f"pedido {d['pedido_id']}: preco={d['preco']:.2f} "
+            f"calculado={d['preco_calculado']:.2f}"
+        )
+    acao = "corrigidos" if args.corrigir else "com divergência"
+    print(f"{len(divergencias)} pedido(s) {acao}")
+    return 1 if divergencias and not args.corrigir else 0
+
+
+def importar_pedidos(args):
+    db = SessionLocal()
+    try:
+        with open(args.arquivo, "rb") as arquivo:
+            resultado = import_service.import_orders(db, arquivo, lote=args.lote)
+    finally:
+        db.close()
+
+    for erro in resultado["erros"]:
+        print(f"linha {erro['linha']}: {erro['erro']}")
+    print(f"{resultado['importados']} pedido(s) importado(s), {len(resultado['erros'])} erro(s)")
+    return 1 if resultado["erros"] else 0
+
+
+def reconstruir_resumos(args):
+    db = SessionLocal()
+    try:
+        usuarios = summary_service.rebuild_summaries(db, lote=args.lote)
+    finally:
+        db.close()
+
+    print(f"resumo recalculado para {usuarios} usuário(s)")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    totais = subparsers.add_parser(
+        "verificar-totais",
+        help="Recalcula o preço dos pedidos a partir dos itens e reporta divergências"
+    )
+    totais.add_argument("--corrigir", action="store_true", help="Grava o total recalculado")
+    totais.add_argument("--tolerancia", type=float, default=0.005)
+    totais.set_defaults(func=verificar_totais)
+
+    importar = subparsers.add_parser(
+        "importar-pedidos",
+        help="Importa pedidos com itens de um arquivo NDJSON (um pedido por linha)"
+    )
+    importar.add_argument("arquivo")
+    importar.add_argument("--lote", type=int, default=settings.IMPORT_CHUNK_SIZE)
+    importar.set_defaults(func=importar_pedidos)
+
+    resumos = subparsers.add_parser(
+        "reconstruir-resumos",
+        help="Recalcula do zero o resumo de pedidos de todos os usuários, em lotes"
+    )
+    resumos.add_argument("--lote", type=int, default=1000, help="Usuários por lote")
+    resumos.set_defaults(func=reconstruir_resumos)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,14 +1,81 @@
 from pydantic_settings import BaseSettings
 from pathlib import Path
+from typing import List, Optional
 
 class Settings(BaseSettings):
     # Segurança
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Tokens carregam admin/ativo/versão assinados e dispensam a consulta
+    # ao banco em cada requisição (ver app/core/deps.py)
+    JWT_STATELESS_AUTH: bool = False
+
+    # Pool de processos do bcrypt: workers e quantas operações podem
+    # aguardar na fila antes de responder 429
+    PASSWORD_POOL_WORKERS: int = 2
+    PASSWORD_POOL_MAX_QUEUE: int = 32
 
     # Banco de dados
     DATABASE_URL: str
+    # Camada assíncrona (AsyncSession). False volta ao caminho síncrono
+    # original (threadpool do Starlette) para comparação de throughput.
+    DB_ASYNC: bool = True
+    # Se vazio, é derivada de DATABASE_URL (sqlite -> aiosqlite, postgresql -> asyncpg)
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # Pool de conexões (por worker; ignorado no SQLite em memória)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # Réplicas de leitura (JSON: '["postgresql://...", ...]'). Vazio = só o primário.
+    # Após uma escrita, as leituras do usuário ficam no primário por
+    # REPLICA_STICKY_SECONDS, cobrindo o atraso da replicação.
+    DATABASE_REPLICA_URLS: List[str] = []
+    REPLICA_STICKY_SECONDS: float = 5
+
+    # Modo SQLite de produção: WAL + PRAGMAs e escritor único por processo
+    SQLITE_TUNED: bool = False
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 268_435_456  # 256 MiB
+    SQLITE_CACHE_SIZE: int = -65_536  # KiB (64 MiB)
+
+    # Instrumentação por requisição: tempo de banco/bcrypt no log e no header Server-Timing
+    REQUEST_TIMING_ENABLED: bool = True
+    SERVER_TIMING_HEADER: bool = True
+
+    # Log de queries lentas (logger "app.slow_queries") com o plano da query;
+    # no máximo SLOW_QUERY_LOG_PER_MINUTE registros por minuto. SLOW_QUERY_MS=0 desativa
+    SLOW_QUERY_MS: float = 500
+    SLOW_QUERY_LOG_PER_MINUTE: int = 10
+    SLOW_QUERY_EXPLAIN: bool = True
+
+    # Endpoint /metrics (formato Prometheus); com token, exige "Authorization: Bearer <token>"
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: Optional[str] = None
+
+    # Cache de usuários autenticados (0 desativa)
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAXSIZE: int = 10_000
+
+    # Respostas serializadas de pedidos, por (id, versão)
+    ORDER_CACHE_TTL_SECONDS: int = 300
+    ORDER_CACHE_MAXSIZE: int = 10_000
+
+    # Relatório de pedidos (admin): recalculado no máximo uma vez por intervalo (0 desativa)
+    ANALYTICS_CACHE_TTL_SECONDS: int = 60
+
+    # Importação em lote: pedidos por INSERT/commit e tamanho máximo do corpo em /importar
+    IMPORT_CHUNK_SIZE: int = 1000
+    IMPORT_MAX_BYTES: int = 100 * 1024 * 1024
+
+    # Push de eventos de pedidos (SSE): fila por conexão e intervalo do keep-alive
+    ORDER_EVENTS_QUEUE_SIZE: int = 100
+    ORDER_EVENTS_KEEPALIVE_SECONDS: float = 15
 
     class Config:
         env_file = (
@@ -1,28 +1,92 @@
 from fastapi import Depends
 from jose import jwt, JWTError
 from sqlalchemy.orm import Session
-from app.db.session import get_session
-from app.core.security import oauth2_scheme
+from app.db.session import get_db, run_in_session, release_connection, read_replicas
+from app.core.security import oauth2_scheme, current_token_version, bump_token_version
 from app.core.config import settings
+from app.core.cache import TTLCache
 from app.models.user import Usuario
+from app.schemas.user import UserPrincipal
 from app.core.exceptions import UnauthorizedException
 
-def get_current_user(
-    db: Session = Depends(get_session),
+# Usuários autenticados por id; invalidado pelo auth_service ao criar/alterar usuários
+user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAXSIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+
+def invalidate_user(user_id: int):
+    user_cache.invalidate(user_id)
+    bump_token_version(user_id)
+
+
+def _principal_from_claims(payload: dict, user_id: int):
+    """
+    Modo stateless: confia nas claims assinadas do token, a menos que a
+    versão do usuário tenha sido incrementada depois da emissão.
+    """
+    if "admin" not in payload or "ver" not in payload:
+        return None
+    if payload["ver"] < current_token_version(user_id):
+        return None
+    return UserPrincipal(
+        id=user_id,
+        admin=payload["admin"],
+        ativo=payload.get("ativo", True)
+    )
+
+
+def _load_principal(db: Session, user_id: int):
+    user = db.query(Usuario).filter(Usuario.id == user_id).first()
+    principal = UserPrincipal.model_validate(user) if user else None
+    # o principal não depende da sessão: a conexão volta ao pool enquanto
+    # a requisição aguarda o restante (threadpool, fila de escrita)
+    release_connection(db)
+    return principal
+
+
+async def get_current_user(
+    db=Depends(get_db),
     token: str = Depends(oauth2_scheme)
-):
+) -> UserPrincipal:
     try:
         payload = jwt.decode(
             token,
             settings.SECRET_KEY,
             algorithms=[settings.ALGORITHM]
         )
-        user_id = payload.get("sub")
-    except JWTError:
+        user_id = int(payload.get("sub"))
+    except (JWTError, TypeError, ValueError):
         raise UnauthorizedException()
 
-    user = db.query(Usuario).filter(Usuario.id == int(user_id)).first()
-    if not user:
+    if settings.JWT_STATELESS_AUTH:
+        principal = _principal_from_claims(payload, user_id)
+        if principal is not None:
+            return principal
+
+    principal = user_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    principal = await run_in_session(db, _load_principal, user_id)
+    if principal is None:
         raise UnauthorizedException()
 
-    return user
\ No newline at end of file
+    user_cache.set(user_id, principal)
+    return principal
+
+
+async def get_read_db(
+    db=Depends(get_db),
+    user: UserPrincipal = Depends(get_current_user)
+):
+    """
+    Sessão das rotas de leitura de pedidos: uma réplica, quando configurada,
+    exceto logo após uma escrita do próprio usuário (ver ReadReplicas).
+    """
+    if read_replicas.use_primary(user.id):
+        yield db
+        return
+    async with read_replicas.session() as replica:
+        yield replica
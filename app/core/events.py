@@ -0,0 +1,130 @@
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Optional
+from app.core.config import settings
+
+
+class Subscription:
+    """
+    Fila de eventos de um assinante, ligada ao event loop que a criou.
+
+    push() pode ser chamado de qualquer thread (rotas síncronas publicam
+    do threadpool): a entrega é agendada no loop do assinante. Com a fila
+    cheia, o evento mais antigo é descartado; o último estado do pedido
+    é o que importa para quem acompanha.
+    """
+
+    def __init__(self, usuario_id: int, maxsize: int):
+        self.usuario_id = usuario_id
+        self.dropped = 0
+        self._queue = asyncio.Queue(maxsize=maxsize)
+        self._loop = asyncio.get_running_loop()
+
+    def _put(self, evento: dict):
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(evento)
+
+    def push(self, evento: dict):
+        try:
+            self._loop.call_soon_threadsafe(self._put, evento)
+        except RuntimeError:
+            # loop já encerrado: assinante desconectado
+            pass
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """
+        Próximo evento, ou None se nada chegar em timeout segundos.
+        """
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBroker(ABC):
+    """
+    Interface do pub/sub de eventos de pedidos.
+
+    O order_service publica; as conexões de push (SSE) assinam por usuário.
+    Implementações distribuídas (ex: Redis pub/sub, para vários workers)
+    entregam às Subscription locais via push(). Uma implementação sem
+    algum dos métodos abstratos falha já ao ser instanciada.
+    """
+
+    @abstractmethod
+    def publish(self, usuario_id: int, evento: dict) -> None:
+        ...
+
+    @abstractmethod
+    def subscribe(self, usuario_id: int) -> Subscription:
+        ...
+
+    @abstractmethod
+    def unsubscribe(self, inscricao: Subscription) -> None:
+        ...
+
+    def stats(self) -> dict:
+        return {}
+
+
+class InMemoryBroker(EventBroker):
+    """
+    Broker dentro do processo: só alcança assinantes do mesmo worker.
+    Suficiente para um worker e para os testes.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self.published = 0
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, usuario_id: int, evento: dict) -> None:
+        with self._lock:
+            self.published += 1
+            inscricoes = list(self._subscriptions.get(usuario_id, ()))
+        for inscricao in inscricoes:
+            inscricao.push(evento)
+
+    def subscribe(self, usuario_id: int) -> Subscription:
+        inscricao = Subscription(usuario_id, self.queue_size)
+        with self._lock:
+            self._subscriptions[usuario_id].add(inscricao)
+        return inscricao
+
+    def unsubscribe(self, inscricao: Subscription) -> None:
+        with self._lock:
+            inscricoes = self._subscriptions.get(inscricao.usuario_id)
+            if inscricoes is None:
+                return
+            inscricoes.discard(inscricao)
+            if not inscricoes:
+                del self._subscriptions[inscricao.usuario_id]
+
+    def stats(self) -> dict:
+        with self._lock:
+            inscricoes = [i for grupo in self._subscriptions.values() for i in grupo]
+            return {
+                "subscribers": len(inscricoes),
+                "published": self.published,
+                "dropped": sum(i.dropped for i in inscricoes),
+            }
+
+
+order_events: EventBroker = InMemoryBroker(queue_size=settings.ORDER_EVENTS_QUEUE_SIZE)
+
+
+def set_order_broker(broker: EventBroker):
+    """
+    Troca o broker (ex: um distribuído na inicialização da aplicação).
+    """
+    global order_events
+    order_events = broker
+
+
+def get_order_broker() -> EventBroker:
+    return order_events
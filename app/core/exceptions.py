@@ -44,3 +44,26 @@ class BadRequestException(HTTPException):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=detail
         )
+
+class PayloadTooLargeException(HTTPException):
+    """
+    Exceção para corpos acima do limite (413).
+    Ex: arquivo de importação maior que IMPORT_MAX_BYTES.
+    """
+    def __init__(self, detail: str = "Corpo da requisição muito grande"):
+        super().__init__(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=detail
+        )
+
+class TooManyRequestsException(HTTPException):
+    """
+    Exceção para sobrecarga (429).
+    Ex: fila de verificação de senhas cheia durante um pico de logins.
+    """
+    def __init__(self, detail: str = "Muitas requisições, tente novamente", retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)}
+        )
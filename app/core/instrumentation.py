@@ -0,0 +1,105 @@
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+from weakref import WeakKeyDictionary
+from sqlalchemy import Engine, event
+
+
+class RequestTiming:
+    """
+    Tempos acumulados de uma requisição: banco (tempo e quantidade de
+    statements) e bcrypt.
+
+    O objeto fica em uma ContextVar e é alterado no lugar: o threadpool,
+    as sessões assíncronas (greenlet) e os callbacks do pool de senhas
+    recebem a mesma instância. O lock cobre as threads do threadpool.
+    """
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.db_seconds = 0.0
+        self.statements = 0
+        self.bcrypt_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add_query(self, seconds: float):
+        with self._lock:
+            self.db_seconds += seconds
+            self.statements += 1
+
+    def add_bcrypt(self, seconds: float):
+        with self._lock:
+            self.bcrypt_seconds += seconds
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.inicio
+
+
+_request_timing: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+
+def start_request_timing() -> RequestTiming:
+    timing = RequestTiming()
+    _request_timing.set(timing)
+    return timing
+
+
+def current_timing() -> Optional[RequestTiming]:
+    """
+    Medição da requisição corrente, ou None fora de uma requisição
+    (scripts, CLI, testes de service).
+    """
+    return _request_timing.get()
+
+
+# -------------------------------
+# Tempo de banco por statement
+# -------------------------------
+# Observadores por engine: um único par de eventos mede cada statement
+# uma vez e entrega a duração a todos (tempo da requisição, log de
+# queries lentas)
+_observers: "WeakKeyDictionary[Engine, list]" = WeakKeyDictionary()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._timing_inicio = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    segundos = time.perf_counter() - context._timing_inicio
+    for observer in _observers.get(conn.engine, ()):
+        observer(conn, cursor, statement, parameters, executemany, segundos)
+
+
+def observe_queries(engine, observer):
+    """
+    Registra observer(conn, cursor, statement, parameters, executemany,
+    segundos), chamado após cada statement do engine (síncrono ou o
+    sync_engine de um AsyncEngine) com a duração medida.
+
+    O início fica no contexto de execução: um statement que falha não
+    deixa estado para trás na conexão. Os eventos são instalados no
+    primeiro observador; chamadas repetidas não duplicam.
+    """
+    observers = _observers.get(engine)
+    if observers is None:
+        observers = _observers[engine] = []
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    if observer not in observers:
+        observers.append(observer)
+
+
+def _add_to_request(conn, cursor, statement, parameters, executemany, segundos):
+    timing = _request_timing.get()
+    if timing is not None:
+        timing.add_query(segundos)
+
+
+def instrument_engine(engine):
+    """
+    Soma o tempo e a quantidade de statements do engine na medição da
+    requisição corrente.
+    """
+    observe_queries(engine, _add_to_request)
@@ -0,0 +1,181 @@
+import bisect
+import threading
+from typing import Dict, List, Sequence, Tuple
+
+# Limites (segundos) do histograma de latência
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _escape(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(nomes: Sequence[str], valores: Sequence, extra: str = "") -> str:
+    pares = [f'{nome}="{_escape(valor)}"' for nome, valor in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+def _number(valor: float) -> str:
+    if valor == float("inf"):
+        return "+Inf"
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class _Metric:
+    """
+    Base das métricas: nome, ajuda, nomes dos labels e os valores por
+    combinação de labels, protegidos por lock (rotas rodam no threadpool).
+    """
+    tipo = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple, object] = {}
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def _header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.tipo}",
+        ]
+
+    def render(self) -> List[str]:
+        with self._lock:
+            valores = sorted(self._values.items())
+        if not valores and not self.labelnames:
+            valores = [((), 0)]
+        return self._header() + [
+            f"{self.name}{_labels(self.labelnames, labels)} {_number(valor)}"
+            for labels, valor in valores
+        ]
+
+
+class Counter(_Metric):
+    tipo = "counter"
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def set(self, valor: float, *labels):
+        """
+        Espelha um total já contado em outro lugar (ex: acertos do cache),
+        lido na hora da coleta.
+        """
+        with self._lock:
+            self._values[labels] = valor
+
+
+class Gauge(_Metric):
+    tipo = "gauge"
+
+    def set(self, valor: float, *labels):
+        with self._lock:
+            self._values[labels] = valor
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    """
+    Histograma cumulativo no formato do Prometheus (_bucket, _sum, _count).
+    Por combinação de labels guarda só as contagens por faixa e a soma.
+    """
+    tipo = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, valor: float, *labels):
+        indice = bisect.bisect_left(self.buckets, valor)
+        with self._lock:
+            serie = self._values.get(labels)
+            if serie is None:
+                serie = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            serie[0][indice] += 1
+            serie[1] += valor
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = sorted(
+                (labels, (list(contagens), soma))
+                for labels, (contagens, soma) in self._values.items()
+            )
+        linhas = self._header()
+        for labels, (contagens, soma) in series:
+            acumulado = 0
+            for limite, contagem in zip((*self.buckets, float("inf")), contagens):
+                acumulado += contagem
+                le = f'le="{_number(float(limite))}"'
+                linhas.append(
+                    f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {acumulado}"
+                )
+            linhas.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(soma)}")
+            linhas.append(f"{self.name}_count{_labels(self.labelnames, labels)} {acumulado}")
+        return linhas
+
+
+class MetricsRegistry:
+    """
+    Métricas do processo, renderizadas no formato texto do Prometheus.
+
+    Cada worker (processo) tem o seu registro: o Prometheus coleta cada
+    instância separadamente.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        linhas = []
+        for metric in self._metrics.values():
+            linhas.extend(metric.render())
+        return "\n".join(linhas) + "\n"
+
+
+metrics = MetricsRegistry()
+
+# -------------------------------
+# Requisições HTTP (MetricsMiddleware)
+# -------------------------------
+http_request_duration = metrics.histogram(
+    "delivery_http_request_duration_seconds",
+    "Duração das requisições HTTP por rota.",
+    ("method", "route", "status")
+)
+http_requests_in_flight = metrics.gauge(
+    "delivery_http_requests_in_flight",
+    "Requisições HTTP em andamento."
+)
+auth_failures = metrics.counter(
+    "delivery_auth_failures_total",
+    "Falhas de autenticação (UnauthorizedException) por rota.",
+    ("route",)
+)
@@ -1,5 +1,15 @@
-from fastapi import FastAPI
+import logging
+import time
+import orjson
+from fastapi import FastAPI, Request
+from fastapi.exception_handlers import http_exception_handler
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.config import settings
+from app.core.exceptions import UnauthorizedException
+from app.core.instrumentation import start_request_timing
+from app.core.metrics import auth_failures, http_request_duration, http_requests_in_flight
+
+request_logger = logging.getLogger("app.requests")
 
 
 def setup_cors(app: FastAPI):
@@ -14,3 +24,145 @@ def setup_cors(app: FastAPI):
         allow_methods=["*"],
         allow_headers=["*"],
     )
+
+
+def route_template(scope) -> str:
+    """
+    Caminho da rota com os parâmetros ("/orders/pedido/{pedido_id}"),
+    para agrupar requisições; o caminho cru quando nenhuma rota casou.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", None) or scope.get("path", "")
+
+
+class InstrumentationMiddleware:
+    """
+    Mede cada requisição HTTP: tempo total, tempo e quantidade de
+    statements no banco e tempo de bcrypt.
+
+    Middleware ASGI puro (sem BaseHTTPMiddleware): não bufferiza o corpo,
+    então respostas em stream (exportação, SSE) passam direto. Os tempos
+    até o início da resposta vão no header Server-Timing; os totais,
+    incluindo o stream, em uma linha de log JSON ao final.
+    """
+
+    def __init__(self, app, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timing = start_request_timing()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"server-timing", self._server_timing(timing).encode("latin-1")),
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_logger.info(orjson.dumps({
+                "method": scope["method"],
+                "route": route_template(scope),
+                "status": status_code,
+                "duration_ms": round(timing.elapsed() * 1000, 2),
+                "db_ms": round(timing.db_seconds * 1000, 2),
+                "db_statements": timing.statements,
+                "bcrypt_ms": round(timing.bcrypt_seconds * 1000, 2),
+            }).decode())
+
+    @staticmethod
+    def _server_timing(timing) -> str:
+        return ", ".join([
+            f"app;dur={timing.elapsed() * 1000:.1f}",
+            f'db;dur={timing.db_seconds * 1000:.1f};desc="{timing.statements} statements"',
+            f"bcrypt;dur={timing.bcrypt_seconds * 1000:.1f}",
+        ])
+
+
+class MetricsMiddleware:
+    """
+    Histograma de latência por método, rota e status e o gauge de
+    requisições em andamento (ver app/core/metrics.py).
+
+    O label de rota é o template, nunca o caminho cru: requisições que
+    não casaram com nenhuma rota (404) entram como "unmatched".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        inicio = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            route = scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - inicio,
+                scope["method"],
+                getattr(route, "path", None) or "unmatched",
+                str(status_code)
+            )
+
+
+async def _count_auth_failure(request: Request, exc: UnauthorizedException):
+    auth_failures.inc(route_template(request.scope))
+    return await http_exception_handler(request, exc)
+
+
+def setup_metrics(app: FastAPI):
+    """
+    Coleta das métricas expostas em /metrics: latência e requisições
+    em andamento (middleware) e falhas de autenticação (handler de
+    UnauthorizedException, que mantém a resposta 401 padrão).
+    """
+    if not settings.METRICS_ENABLED:
+        return
+
+    app.add_middleware(MetricsMiddleware)
+    app.add_exception_handler(UnauthorizedException, _count_auth_failure)
+
+
+def setup_instrumentation(app: FastAPI):
+    """
+    Instala a medição por requisição (ver InstrumentationMiddleware).
+
+    As linhas do logger "app.requests" (nível INFO, uma por requisição)
+    propagam para a configuração de logging da aplicação, que decide o
+    destino.
+    """
+    if not settings.REQUEST_TIMING_ENABLED:
+        return
+
+    request_logger.setLevel(logging.INFO)
+
+    app.add_middleware(
+        InstrumentationMiddleware,
+        server_timing=settings.SERVER_TIMING_HEADER
+    )
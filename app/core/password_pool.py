@@ -0,0 +1,127 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from app.core.config import settings
+from app.core.exceptions import TooManyRequestsException
+from app.core.instrumentation import current_timing
+from app.core.security import hash_password, verify_password
+
+
+class PasswordPool:
+    """
+    Pool de processos dedicado ao bcrypt.
+
+    O hash/verificação roda fora do processo da API (escapa do GIL e não
+    ocupa o threadpool nem o event loop). No máximo workers + max_queue
+    operações ficam pendentes; acima disso a chamada falha na hora com
+    TooManyRequestsException, sem enfileirar.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = max(workers, 1)
+        self.max_queue = max(max_queue, 0)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn: não herda threads/conexões abertas do processo da API
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise TooManyRequestsException(
+                "Muitas tentativas de login simultâneas, tente novamente"
+            )
+
+        inicio = time.perf_counter()
+        timing = current_timing()
+        with self._lock:
+            self.in_flight += 1
+
+        def _done(_future):
+            elapsed = time.perf_counter() - inicio
+            if timing is not None:
+                timing.add_bcrypt(elapsed)
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+                self.total_seconds += elapsed
+                self.max_seconds = max(self.max_seconds, elapsed)
+            self._slots.release()
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+            raise
+        future.add_done_callback(_done)
+        return future
+
+    # Uso a partir de código síncrono (threadpool / scripts)
+    def hash(self, password: str) -> str:
+        return self._submit(hash_password, password).result()
+
+    def verify(self, password: str, hashed: str) -> bool:
+        return self._submit(verify_password, password, hashed).result()
+
+    # Uso a partir do event loop
+    async def ahash(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(hash_password, password))
+
+    async def averify(self, password: str, hashed: str) -> bool:
+        return await asyncio.wrap_future(
+            self._submit(verify_password, password, hashed)
+        )
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": self.in_flight,
+                "queued": max(self.in_flight - self.workers, 0),
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_ms": (
+                    self.total_seconds / self.completed * 1000
+                    if self.completed else 0.0
+                ),
+                "max_ms": self.max_seconds * 1000,
+            }
+
+    def shutdown(self):
+        """
+        Encerra os processos, esperando as operações em andamento.
+
+        O executor é retirado sob o lock e encerrado fora dele: o shutdown
+        espera a thread do executor, que roda os callbacks (_done) que
+        também pegam o lock.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+password_pool = PasswordPool(
+    workers=settings.PASSWORD_POOL_WORKERS,
+    max_queue=settings.PASSWORD_POOL_MAX_QUEUE
+)
@@ -25,11 +25,34 @@ def verify_password(password: str, hashed: str) -> bool:
     return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
 
 
-def create_access_token(user_id: int):
+# Versão atual dos tokens por usuário (modo stateless).
+# Só usuários alterados desde que o processo subiu aparecem aqui;
+# tokens emitidos com versão menor voltam a ser validados no banco.
+_token_versions: dict[int, int] = {}
+
+
+def current_token_version(user_id: int) -> int:
+    return _token_versions.get(user_id, 0)
+
+
+def bump_token_version(user_id: int):
+    """
+    Invalida as claims dos tokens já emitidos para o usuário.
+    """
+    _token_versions[user_id] = current_token_version(user_id) + 1
+
+
+def create_access_token(user_id: int, admin: bool = False, ativo: bool = True):
     payload = {
         "sub": str(user_id),
         "exp": datetime.now(timezone.utc) + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     }
+    if settings.JWT_STATELESS_AUTH:
+        payload.update({
+            "admin": bool(admin),
+            "ativo": bool(ativo),
+            "ver": current_token_version(user_id),
+        })
     return jwt.encode(payload, settings.SECRET_KEY, settings.ALGORITHM)
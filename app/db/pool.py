@@ -0,0 +1,94 @@
+import threading
+import time
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+
+class PoolMetrics:
+    """
+    Tempo de espera no checkout de conexões do pool.
+
+    Um checkout lento significa requisições paradas aguardando conexão:
+    o pool está pequeno para a concorrência do worker.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+            self.timeouts = 0
+
+    def record(self, wait: float, timeout: bool = False):
+        with self._lock:
+            if timeout:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": (
+                    self.total_wait / self.checkouts * 1000
+                    if self.checkouts else 0.0
+                ),
+                "max_wait_ms": self.max_wait * 1000,
+            }
+
+
+class _TimedPoolMixin:
+    metrics: PoolMetrics
+
+    def connect(self):
+        inicio = time.perf_counter()
+        try:
+            conn = super().connect()
+        except PoolTimeoutError:
+            self.metrics.record(time.perf_counter() - inicio, timeout=True)
+            raise
+        self.metrics.record(time.perf_counter() - inicio)
+        return conn
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+
+def pool_stats(pool) -> dict:
+    """
+    Estado atual do pool + métricas de espera (quando disponíveis).
+    """
+    stats = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "idle": pool.checkedin(),
+        })
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(metrics.snapshot())
+    return stats
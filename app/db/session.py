@@ -1,15 +1,80 @@
+import itertools
+from contextlib import asynccontextmanager
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
+from app.core.cache import TTLCache
+from app.core.instrumentation import instrument_engine
+from app.db.slow_queries import setup_slow_query_log
+from app.db.pool import TimedQueuePool, TimedAsyncAdaptedQueuePool
+from app.db.sqlite import install_sqlite_pragmas, write_serializer
+
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """
+    Opções do engine conforme o dialeto.
+
+    - SQLite em memória: mantém o pool padrão do SQLAlchemy (uma conexão)
+    - Demais bancos (e SQLite em arquivo): QueuePool configurado pelo Settings
+    """
+    parsed = make_url(url)
+    options = {}
+
+    if parsed.get_backend_name() == "sqlite":
+        if not is_async:
+            options["connect_args"] = {"check_same_thread": False}
+        if parsed.database in (None, "", ":memory:"):
+            return options
+
+    options.update({
+        "poolclass": TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    })
+    return options
+
+
+def create_db_engine(url: str):
+    engine = create_engine(url, **engine_options(url))
+    if settings.REQUEST_TIMING_ENABLED:
+        instrument_engine(engine)
+    setup_slow_query_log(engine)
+    return engine
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False}
-)
 
+def create_async_db_engine(url: str):
+    engine = create_async_engine(url, **engine_options(url, is_async=True))
+    if settings.REQUEST_TIMING_ENABLED:
+        instrument_engine(engine.sync_engine)
+    setup_slow_query_log(engine.sync_engine)
+    return engine
+
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+engine = create_db_engine(settings.DATABASE_URL)
+
+# Modo SQLite de produção: PRAGMAs (WAL etc.) em cada conexão
+# e escritas serializadas (ver run_write)
+SERIALIZE_WRITES = settings.SQLITE_TUNED and is_sqlite(settings.DATABASE_URL)
+if SERIALIZE_WRITES:
+    install_sqlite_pragmas(engine)
+
+# expire_on_commit=False: como no modo assíncrono, o que o service devolve
+# depois do commit continua legível na rota sem um SELECT de refresh, que
+# rodaria fora do threadpool (bloqueando o event loop)
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
+    expire_on_commit=False,
     bind=engine
 )
 
@@ -19,3 +84,209 @@ def get_session():
         yield db
     finally:
         db.close()
+
+
+# -------------------------------------------------
+# Camada assíncrona
+# -------------------------------------------------
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+
+def build_async_url(url: str) -> str:
+    """
+    Converte a URL síncrona para o driver assíncrono equivalente.
+    Ex: sqlite:///banco.db -> sqlite+aiosqlite:///banco.db
+    """
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+")[0]
+    if dialect not in ASYNC_DRIVERS:
+        raise ValueError(f"Sem driver assíncrono conhecido para '{scheme}'")
+    return f"{ASYNC_DRIVERS[dialect]}{sep}{rest}"
+
+
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.DB_ASYNC:
+    async_engine = create_async_db_engine(
+        settings.ASYNC_DATABASE_URL or build_async_url(settings.DATABASE_URL)
+    )
+    if SERIALIZE_WRITES:
+        install_sqlite_pragmas(async_engine.sync_engine)
+
+    # expire_on_commit=False: objetos continuam legíveis após o commit
+    # sem disparar IO fora do greenlet
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine,
+        autoflush=False,
+        expire_on_commit=False
+    )
+
+
+async def get_async_session():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Dependência usada pelas rotas; escolhida uma vez conforme DB_ASYNC
+get_db = get_async_session if settings.DB_ASYNC else get_session
+
+
+# -------------------------------------------------
+# Réplicas de leitura
+# -------------------------------------------------
+class ReadReplicas:
+    """
+    Engines das réplicas de leitura, escolhidas em rodízio.
+
+    Depois de uma escrita, o usuário volta a ler do primário por
+    sticky_seconds (read-your-writes), tempo para a réplica alcançar.
+    O registro das escritas é por processo, como o cache de usuários.
+    """
+
+    def __init__(self, urls, sticky_seconds: float, maxsize: int = 100_000):
+        self.engines = [
+            create_async_db_engine(build_async_url(url))
+            if settings.DB_ASYNC else create_db_engine(url)
+            for url in urls
+        ]
+        self._next = itertools.count()
+        self._recent_writes = TTLCache(maxsize=maxsize, ttl=sticky_seconds)
+
+    def mark_write(self, user_id: int):
+        self._recent_writes.set(user_id, True)
+
+    def use_primary(self, user_id: int) -> bool:
+        return not self.engines or self._recent_writes.get(user_id) is not None
+
+    @asynccontextmanager
+    async def session(self):
+        engine = self.engines[next(self._next) % len(self.engines)]
+        if settings.DB_ASYNC:
+            async with AsyncSessionLocal(bind=engine) as db:
+                yield db
+            return
+        db = SessionLocal(bind=engine)
+        try:
+            yield db
+        finally:
+            await run_in_threadpool(db.close)
+
+    async def dispose(self):
+        for replica in self.engines:
+            if settings.DB_ASYNC:
+                await replica.dispose()
+            else:
+                replica.dispose()
+
+
+read_replicas = ReadReplicas(
+    settings.DATABASE_REPLICA_URLS,
+    sticky_seconds=settings.REPLICA_STICKY_SECONDS
+)
+
+
+async def dispose_engines():
+    """
+    Fecha as conexões dos pools (chamado no shutdown da aplicação).
+    """
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
+    await read_replicas.dispose()
+
+
+def active_engine():
+    """
+    Engine (síncrono) usado pelas rotas no modo atual.
+    No modo assíncrono, é o sync_engine por trás do AsyncEngine.
+    """
+    return async_engine.sync_engine if settings.DB_ASYNC else engine
+
+
+def release_connection(session: Session):
+    """
+    Encerra a transação de leitura em aberto, devolvendo a conexão ao pool.
+
+    A sessão continua utilizável: a próxima consulta pega outra conexão.
+    """
+    if session.in_transaction():
+        session.commit()
+
+
+async def run_in_session(db, fn, *args, **kwargs):
+    """
+    Executa fn(session, *args, **kwargs) sem bloquear o event loop.
+
+    - AsyncSession: roda via run_sync, com IO feito pelo driver assíncrono
+    - Session: roda no threadpool, como as rotas síncronas faziam
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+async def run_write(db, fn, *args, **kwargs):
+    """
+    Igual a run_in_session, para operações que escrevem no banco.
+
+    No modo SQLite de produção (SQLITE_TUNED) com AsyncSession, as escritas
+    do processo passam uma por vez (asyncio.Lock, sem ocupar threads);
+    leituras continuam em paralelo via run_in_session. Antes de entrar na
+    fila, a sessão devolve ao pool a conexão da leitura anterior: escritores
+    parados na fila não podem segurar conexões de que o escritor da vez
+    precisa.
+
+    No modo síncrono não há fila: um escritor esperando seguraria uma
+    thread do threadpool, e o busy_timeout do SQLite já ordena as escritas
+    sem erros de "database is locked" (ver bench_sqlite_concurrency).
+    """
+    if SERIALIZE_WRITES and isinstance(db, AsyncSession):
+        if db.in_transaction():
+            await db.commit()
+        async with write_serializer.async_lock():
+            return await db.run_sync(fn, *args, **kwargs)
+
+    return await run_in_session(db, fn, *args, **kwargs)
+
+
+# -------------------------------------------------
+# Leitura em lotes (streaming)
+# -------------------------------------------------
+def session_bind(db):
+    """
+    Engine por trás da sessão da requisição (primário ou réplica).
+    """
+    return db.bind if isinstance(db, AsyncSession) else db.get_bind()
+
+
+async def stream_partitions(bind, statement, tamanho: int):
+    """
+    Executa statement em uma conexão própria e entrega as linhas em lotes
+    de `tamanho` (yield_per: cursor no servidor quando o driver suporta),
+    sem materializar o resultado inteiro.
+
+    A conexão é própria porque a sessão da dependência é fechada antes de
+    uma StreamingResponse começar a enviar o corpo.
+    """
+    statement = statement.execution_options(yield_per=tamanho)
+
+    if isinstance(bind, AsyncEngine):
+        async with bind.connect() as conn:
+            result = await conn.stream(statement)
+            async for lote in result.partitions():
+                yield lote
+        return
+
+    conn = await run_in_threadpool(bind.connect)
+    try:
+        result = await run_in_threadpool(conn.execute, statement)
+        lotes = result.partitions()
+        while (lote := await run_in_threadpool(next, lotes, None)) is not None:
+            yield lote
+    finally:
+        await run_in_threadpool(conn.close)
@@ -0,0 +1,204 @@
+import logging
+import sys
+import threading
+import time
+from typing import Optional
+import orjson
+from app.core.config import settings
+from app.core.instrumentation import observe_queries
+
+slow_query_logger = logging.getLogger("app.slow_queries")
+
+# Statements cujo EXPLAIN (sem ANALYZE) só planeja, sem executar
+EXPLAIN_PREFIXES = ("SELECT", "WITH", "UPDATE", "DELETE")
+
+
+# -------------------------------------------------
+# Parâmetros sem dados sensíveis
+# -------------------------------------------------
+def redact_value(valor):
+    """
+    Mantém números, booleanos e None (ids, limites, preços: úteis para
+    reproduzir o plano); textos e bytes viram tipo e tamanho, o resto
+    (datas etc.) só o tipo.
+    """
+    if valor is None or isinstance(valor, (bool, int, float)):
+        return valor
+    if isinstance(valor, (str, bytes)):
+        return f"<{type(valor).__name__} len={len(valor)}>"
+    return f"<{type(valor).__name__}>"
+
+
+def redact_parameters(parameters, executemany: bool = False):
+    """
+    Versão redigida dos parâmetros do cursor (tupla, lista ou dict).
+    No executemany, registra só o primeiro conjunto e a quantidade.
+    """
+    if executemany:
+        conjuntos = list(parameters or [])
+        return {
+            "conjuntos": len(conjuntos),
+            "primeiro": redact_parameters(conjuntos[0]) if conjuntos else None,
+        }
+    if isinstance(parameters, dict):
+        return {chave: redact_value(valor) for chave, valor in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_value(valor) for valor in parameters]
+    return redact_value(parameters)
+
+
+# -------------------------------------------------
+# Quem chamou
+# -------------------------------------------------
+def calling_function(frame=None) -> Optional[str]:
+    """
+    Primeira função de app.services na pilha ("modulo.funcao:linha");
+    sem service na pilha, a primeira função da aplicação fora de app.db.
+
+    No modo assíncrono o evento roda no greenlet do run_sync, cuja pilha
+    inclui a função do service.
+    """
+    frame = frame or sys._getframe(1)
+    fallback = None
+    while frame is not None:
+        modulo = frame.f_globals.get("__name__", "")
+        if modulo.startswith("app.services."):
+            return f"{modulo}.{frame.f_code.co_name}:{frame.f_lineno}"
+        if fallback is None and modulo.startswith("app.") and not modulo.startswith("app.db."):
+            fallback = f"{modulo}.{frame.f_code.co_name}:{frame.f_lineno}"
+        frame = frame.f_back
+    return fallback
+
+
+# -------------------------------------------------
+# Limite de registros
+# -------------------------------------------------
+class RateLimiter:
+    """
+    No máximo `por_minuto` registros por janela de 60 s. Conta os
+    descartados para informá-los no próximo registro.
+    """
+
+    def __init__(self, por_minuto: int, janela: float = 60):
+        self.por_minuto = por_minuto
+        self.janela = janela
+        self._lock = threading.Lock()
+        self._inicio = time.monotonic()
+        self._usados = 0
+        self._descartados = 0
+
+    def acquire(self) -> Optional[int]:
+        """
+        None se o limite da janela já foi atingido; senão, quantos
+        registros foram descartados desde o último aceito.
+        """
+        agora = time.monotonic()
+        with self._lock:
+            if agora - self._inicio >= self.janela:
+                self._inicio = agora
+                self._usados = 0
+            if self._usados >= self.por_minuto:
+                self._descartados += 1
+                return None
+            self._usados += 1
+            descartados, self._descartados = self._descartados, 0
+            return descartados
+
+
+# -------------------------------------------------
+# Log de queries lentas
+# -------------------------------------------------
+class SlowQueryLog:
+    """
+    Registra no logger "app.slow_queries" os statements acima do limite:
+    SQL, parâmetros redigidos, função do service que chamou e o plano
+    (EXPLAIN QUERY PLAN no SQLite, EXPLAIN nos demais).
+
+    Abaixo do limite o custo é uma subtração e uma comparação. Acima
+    dele, o limitador corta os registros (e os EXPLAINs) excedentes antes
+    de qualquer trabalho extra.
+    """
+
+    def __init__(self, threshold_ms: float, por_minuto: int, explain: bool = True):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.limiter = RateLimiter(por_minuto)
+
+    def install(self, engine):
+        """
+        Passa a observar os statements do engine (síncrono ou o sync_engine
+        de um AsyncEngine), com a mesma medição do tempo da requisição.
+        Chamadas repetidas não duplicam.
+        """
+        observe_queries(engine, self.observe)
+
+    def observe(self, conn, cursor, statement, parameters, executemany, segundos: float):
+        if segundos * 1000 < self.threshold_ms:
+            return
+        descartados = self.limiter.acquire()
+        if descartados is None:
+            return
+
+        plano = None
+        if self.explain and not executemany:
+            plano = self._explain(conn, statement, parameters)
+
+        slow_query_logger.warning(orjson.dumps({
+            "duration_ms": round(segundos * 1000, 2),
+            "caller": calling_function(),
+            "statement": statement,
+            "parameters": redact_parameters(parameters, executemany),
+            "explain": plano,
+            "suppressed": descartados,
+        }).decode())
+
+    def _explain(self, conn, statement: str, parameters) -> Optional[list]:
+        """
+        Plano do statement na mesma conexão (mesma transação), por um
+        cursor cru: não passa pelos eventos do engine. Fora do SQLite roda
+        dentro de um SAVEPOINT, para que uma falha no EXPLAIN não aborte a
+        transação do chamador.
+        """
+        if not statement.lstrip().upper().startswith(EXPLAIN_PREFIXES):
+            return None
+
+        sqlite = conn.dialect.name == "sqlite"
+        prefixo = "EXPLAIN QUERY PLAN " if sqlite else "EXPLAIN "
+        cursor = conn.connection.cursor()
+        try:
+            if not sqlite:
+                cursor.execute("SAVEPOINT slow_query_explain")
+            try:
+                cursor.execute(prefixo + statement, parameters)
+                # SQLite: (id, parent, notused, detail); Postgres/MySQL: texto do plano na última coluna
+                plano = [str(linha[-1]) for linha in cursor.fetchall()]
+            except Exception as erro:
+                if not sqlite:
+                    cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                return [f"EXPLAIN falhou: {erro!r}"]
+            if not sqlite:
+                cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+            return plano
+        finally:
+            cursor.close()
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_MS,
+    por_minuto=settings.SLOW_QUERY_LOG_PER_MINUTE,
+    explain=settings.SLOW_QUERY_EXPLAIN
+)
+
+
+def setup_slow_query_log(engine):
+    """
+    Instala o log de queries lentas no engine se SLOW_QUERY_MS > 0.
+
+    Os registros (uma linha JSON por query, nível WARNING) propagam para
+    a configuração de logging da aplicação, que decide o destino.
+    """
+    if settings.SLOW_QUERY_MS <= 0:
+        return
+
+    slow_query_logger.setLevel(logging.WARNING)
+    slow_query_log.install(engine)
@@ -0,0 +1,66 @@
+import asyncio
+import weakref
+from sqlalchemy import event
+from app.core.config import settings
+
+
+# -------------------------------------------------
+# PRAGMAs do modo SQLite de produção
+# -------------------------------------------------
+def sqlite_pragmas() -> dict:
+    return {
+        # WAL: leitores não bloqueiam o escritor (e vice-versa)
+        "journal_mode": "WAL",
+        # NORMAL é seguro com WAL (só perde a última transação em queda de energia)
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        # espera pelo lock em vez de falhar com "database is locked"
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        # negativo = KiB
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "temp_store": "MEMORY",
+    }
+
+
+def install_sqlite_pragmas(engine):
+    """
+    Aplica os PRAGMAs em cada nova conexão do engine (sync_engine no caso
+    do AsyncEngine).
+    """
+    pragmas = sqlite_pragmas()
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for nome, valor in pragmas.items():
+                cursor.execute(f"PRAGMA {nome}={valor}")
+        finally:
+            cursor.close()
+
+
+# -------------------------------------------------
+# Fila única de escrita
+# -------------------------------------------------
+class WriteSerializer:
+    """
+    Garante um único escritor por processo no modo assíncrono; leituras
+    seguem em paralelo.
+
+    O SQLite aceita um escritor por vez: em vez de várias transações
+    disputando o lock do arquivo, as escritas aguardam a vez aqui, em um
+    asyncio.Lock por event loop (não bloqueia o loop).
+    """
+
+    def __init__(self):
+        self._async_locks = weakref.WeakKeyDictionary()
+
+    def async_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        lock = self._async_locks.get(loop)
+        if lock is None:
+            lock = self._async_locks[loop] = asyncio.Lock()
+        return lock
+
+
+write_serializer = WriteSerializer()
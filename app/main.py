@@ -1,18 +1,36 @@
 ## V2 ##
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.api.routes import auth_routes, order_routes, root_routes
+from app.api.routes import auth_routes, metrics_routes, order_routes, root_routes
 from app.core.config import settings
-from app.core.middlewares import setup_cors
+from app.core.middlewares import setup_cors, setup_instrumentation, setup_metrics
+from app.core.password_pool import password_pool
+from app.db.session import dispose_engines
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
 
-app = FastAPI(title="Delivery API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Shutdown: fecha as conexões do banco e encerra os processos do bcrypt
+    # (shutdown espera os workers terminarem, então sai do event loop)
+    await dispose_engines()
+    await run_in_threadpool(password_pool.shutdown)
+
+
+app = FastAPI(title="Delivery API", lifespan=lifespan)
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 setup_cors(app)
+setup_instrumentation(app)
+setup_metrics(app)
 
 app.include_router(root_routes.root_routes)
 app.include_router(auth_routes.auth_router)
 app.include_router(order_routes.order_router)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_routes.metrics_router)
 
 # para rodar: uvicorn app.main:app --reload (Cria um servidor local para o arquivo main.py)
 
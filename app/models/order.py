@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, ForeignKey, Enum, String
+from sqlalchemy import Column, Integer, Float, ForeignKey, Enum, String, Index, DateTime, func
 from sqlalchemy.orm import relationship
 from enum import Enum as PyEnum
 from app.models.base import Base
@@ -6,6 +6,12 @@ from app.models.base import Base
 # Pedido   
 class Pedido(Base):
     __tablename__ = 'pedidos'
+    __table_args__ = (
+        # Listagem paginada por usuário (usuario_id = ? AND id > ?)
+        Index("ix_pedidos_usuario_id_id", "usuario_id", "id"),
+        # Fila do admin filtrada por status (status = ? AND id > ?)
+        Index("ix_pedidos_status_id", "status", "id"),
+    )
 
     # STATUS_PEDIDO = (
     #     ('PENDENTE', 'PENDENTE'),
@@ -17,6 +23,10 @@ class Pedido(Base):
     status = Column("status", String) # Pendente / Cancelado / Finalizado 
     usuario = Column("usuario_id", ForeignKey("usuarios.id"), nullable=False)
     preco = Column("preco", Float, nullable=False)
+    # Incrementada a cada alteração do pedido ou dos seus itens (ETag das consultas)
+    versao = Column("versao", Integer, nullable=False, default=1, server_default="1")
+    # Preenchida na inserção; pedidos anteriores à coluna ficam nulos
+    criado_em = Column("criado_em", DateTime, default=func.now())
     # Relacionamento com ItensPedido
     itens = relationship("ItemPedido", cascade="all, delete")
 
@@ -33,6 +43,10 @@ class Pedido(Base):
 # ItensPedido
 class ItemPedido(Base):
     __tablename__ = 'itens_pedidos'
+    __table_args__ = (
+        # Carregamento de Pedido.itens e remoção de itens
+        Index("ix_itens_pedidos_pedido", "pedido"),
+    )
 
     # SABORES_PIZZA = (
     #     ('CALABRESA', 'CALABRESA'),
@@ -62,6 +76,22 @@ class ItemPedido(Base):
         self.sabor = sabor
         self.tamanho = tamanho
 
+# Resumo dos pedidos por usuário
+class ResumoPedidos(Base):
+    """
+    Contagem por status, total gasto (soma dos pedidos finalizados) e
+    último pedido de cada usuário, mantidos pelo order_service na mesma
+    transação das alterações. Recalculável com: python -m app.cli reconstruir-resumos
+    """
+    __tablename__ = 'resumo_pedidos'
+
+    usuario = Column("usuario_id", ForeignKey("usuarios.id"), primary_key=True)
+    pendentes = Column("pendentes", Integer, nullable=False, default=0, server_default="0")
+    cancelados = Column("cancelados", Integer, nullable=False, default=0, server_default="0")
+    finalizados = Column("finalizados", Integer, nullable=False, default=0, server_default="0")
+    total_gasto = Column("total_gasto", Float, nullable=False, default=0, server_default="0")
+    ultimo_pedido_id = Column("ultimo_pedido_id", Integer, nullable=True)
+
 # alembic init alembic criar pasta de migrações e o arqquivo alembic.ini
 # alembic revision --autogenerate -m "initial migration" criar a migração inicial
 # alembic upgrade head aplicar as migrações no banco de dados (No momento da erro por falta da dependência sqlalchemy-utils)
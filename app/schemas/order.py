@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from datetime import datetime
+from pydantic import BaseModel, Field
 from typing import List, Optional, Literal
 
 class Order(BaseModel):
@@ -16,6 +17,13 @@ class OrderItem(BaseModel):
     class Config:
         from_attributes = True
 
+class OrderCreate(BaseModel):
+    itens: List[OrderItem] = Field(default_factory=list, max_length=500)
+
+class OrderItemsBatch(BaseModel):
+    adicionar: List[OrderItem] = Field(default_factory=list, max_length=500)
+    remover: List[int] = Field(default_factory=list, max_length=500)
+
 class ResponsePedidoSchema(BaseModel):
     id: int
     status: str
@@ -23,4 +31,78 @@ class ResponsePedidoSchema(BaseModel):
     itens: List[OrderItem]
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class FiltroPedidos(BaseModel):
+    status: Optional[Literal["PENDENTE", "CANCELADO", "FINALIZADO"]] = None
+    preco_min: Optional[float] = Field(None, ge=0)
+    preco_max: Optional[float] = Field(None, ge=0)
+
+class PaginaPedidosSchema(BaseModel):
+    pedidos: List[ResponsePedidoSchema]
+    next_cursor: Optional[int] = None
+
+# Listagem do admin: inclui o dono do pedido e os ids dos itens
+class ItemPedidoAdminSchema(OrderItem):
+    id: int
+
+class PedidoAdminSchema(BaseModel):
+    id: int
+    usuario: int
+    status: str
+    preco: float
+    itens: List[ItemPedidoAdminSchema]
+
+class PaginaPedidosAdminSchema(BaseModel):
+    pedidos: List[PedidoAdminSchema]
+    next_cursor: Optional[int] = None
+
+class FiltroExportacao(BaseModel):
+    status: Optional[Literal["PENDENTE", "CANCELADO", "FINALIZADO"]] = None
+    id_min: Optional[int] = Field(None, ge=1)
+    id_max: Optional[int] = Field(None, ge=1)
+    criado_de: Optional[datetime] = None
+    criado_ate: Optional[datetime] = None
+
+class ResumoPedidosSchema(BaseModel):
+    usuario_id: int
+    pendentes: int
+    cancelados: int
+    finalizados: int
+    total_gasto: float
+    ultimo_pedido_id: Optional[int] = None
+
+class FiltroRelatorio(BaseModel):
+    top: int = Field(5, ge=1, le=50)
+    criado_de: Optional[datetime] = None
+    criado_ate: Optional[datetime] = None
+
+class CombinacaoSchema(BaseModel):
+    sabor: str
+    tamanho: str
+    quantidade: int
+    receita: float
+
+class RelatorioStatusSchema(BaseModel):
+    status: Optional[str]
+    pedidos: int
+    receita: float
+    ticket_medio: float
+    combinacoes: List[CombinacaoSchema]
+
+class RelatorioPedidosSchema(BaseModel):
+    gerado_em: datetime
+    pedidos: int
+    receita: float
+    por_status: List[RelatorioStatusSchema]
+
+# Linha do arquivo de importação (NDJSON); o preço é calculado a partir dos itens
+class PedidoImportacao(BaseModel):
+    usuario: int
+    status: Literal["PENDENTE", "CANCELADO", "FINALIZADO"] = "PENDENTE"
+    criado_em: Optional[datetime] = None
+    itens: List[OrderItem] = Field(default_factory=list, max_length=500)
+
+class ResultadoImportacao(BaseModel):
+    importados: int
+    erros: List[dict]
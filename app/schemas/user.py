@@ -12,3 +12,14 @@ class UserCreate(BaseModel):
     # Configuração para permitir a criação do modelo a partir de objetos ORM (como os modelos do SQLAlchemy)
     class Config:
         from_attributes = True
+
+
+# Dados mínimos do usuário autenticado, mantidos no cache de sessão
+class UserPrincipal(BaseModel):
+    id: int
+    admin: Optional[bool] = False
+    ativo: Optional[bool] = True
+
+    class Config:
+        from_attributes = True
+        frozen = True
@@ -0,0 +1,143 @@
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Optional
+from weakref import WeakValueDictionary
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.models.order import Pedido, ItemPedido
+from app.models.user import Usuario
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.exceptions import ForbiddenException
+from app.db.session import run_in_session
+
+TOP_COMBINACOES_DEFAULT = 5
+
+
+def check_analytics_permission(user: Usuario) -> None:
+    if not user.admin:
+        raise ForbiddenException("Apenas administradores podem acessar o relatório de pedidos")
+
+
+def _periodo(statement, criado_de: Optional[datetime], criado_ate: Optional[datetime]):
+    if criado_de is not None:
+        statement = statement.where(Pedido.criado_em >= criado_de)
+    if criado_ate is not None:
+        statement = statement.where(Pedido.criado_em <= criado_ate)
+    return statement
+
+
+# -------------------------------
+# Relatório de pedidos (admin)
+# -------------------------------
+def order_analytics(
+    db: Session,
+    top: int = TOP_COMBINACOES_DEFAULT,
+    criado_de: Optional[datetime] = None,
+    criado_ate: Optional[datetime] = None
+) -> dict:
+    """
+    Pedidos e receita por status e as combinações sabor/tamanho mais
+    vendidas em cada status.
+
+    Tudo é agregado no banco com GROUP BY: duas consultas, cujo resultado
+    tem no máximo status x sabores x tamanhos linhas, independente da
+    quantidade de pedidos. Nenhum objeto ORM é carregado.
+    """
+    por_status = _periodo(
+        select(
+            Pedido.status,
+            func.count(Pedido.id),
+            func.coalesce(func.sum(Pedido.preco), 0),
+        ).group_by(Pedido.status),
+        criado_de,
+        criado_ate
+    )
+    quantidade = func.sum(ItemPedido.quantidade)
+    combinacoes = _periodo(
+        select(
+            Pedido.status,
+            ItemPedido.sabor,
+            ItemPedido.tamanho,
+            quantidade,
+            func.sum(ItemPedido.quantidade * ItemPedido.preco_unitario),
+        )
+        .join(Pedido, Pedido.id == ItemPedido.pedido)
+        .group_by(Pedido.status, ItemPedido.sabor, ItemPedido.tamanho)
+        .order_by(Pedido.status, quantidade.desc(), ItemPedido.sabor, ItemPedido.tamanho),
+        criado_de,
+        criado_ate
+    )
+
+    mais_vendidas = defaultdict(list)
+    for status_pedido, sabor, tamanho, itens, receita in db.execute(combinacoes):
+        if len(mais_vendidas[status_pedido]) < top:
+            mais_vendidas[status_pedido].append({
+                "sabor": sabor,
+                "tamanho": tamanho,
+                "quantidade": itens,
+                "receita": receita,
+            })
+
+    grupos = []
+    total_pedidos, total_receita = 0, 0.0
+    for status_pedido, pedidos, receita in db.execute(por_status):
+        grupos.append({
+            "status": status_pedido,
+            "pedidos": pedidos,
+            "receita": receita,
+            "ticket_medio": receita / pedidos if pedidos else 0.0,
+            "combinacoes": mais_vendidas.get(status_pedido, []),
+        })
+        total_pedidos += pedidos
+        total_receita += receita
+
+    return {
+        "gerado_em": datetime.now(timezone.utc),
+        "pedidos": total_pedidos,
+        "receita": total_receita,
+        "por_status": grupos,
+    }
+
+
+# -------------------------------
+# Relatório em cache
+# -------------------------------
+# Resultado por filtro, recalculado no máximo uma vez por intervalo:
+# recarregar o dashboard não consulta o banco
+analytics_cache = TTLCache(
+    maxsize=128,
+    ttl=settings.ANALYTICS_CACHE_TTL_SECONDS
+)
+
+# Um lock por filtro, enquanto alguma requisição o usa
+_analytics_locks: "WeakValueDictionary[tuple, asyncio.Lock]" = WeakValueDictionary()
+
+
+async def order_analytics_async(
+    db,
+    top: int = TOP_COMBINACOES_DEFAULT,
+    criado_de: Optional[datetime] = None,
+    criado_ate: Optional[datetime] = None,
+    atualizar: bool = False
+) -> dict:
+    """
+    Versão para o event loop, com cache por filtro (veja analytics_cache).
+
+    Quando o resultado expira, só uma requisição por filtro recalcula; as
+    demais esperam no lock e recebem o mesmo resultado. atualizar=True
+    recalcula mesmo com o resultado em cache.
+    """
+    chave = (top, criado_de, criado_ate)
+    relatorio = None if atualizar else analytics_cache.get(chave)
+    if relatorio is not None:
+        return relatorio
+
+    lock = _analytics_locks.setdefault(chave, asyncio.Lock())
+    async with lock:
+        relatorio = None if atualizar else analytics_cache.get(chave)
+        if relatorio is None:
+            relatorio = await run_in_session(db, order_analytics, top, criado_de, criado_ate)
+            analytics_cache.set(chave, relatorio)
+    return relatorio
@@ -1,22 +1,39 @@
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 from app.models.user import Usuario
 from app.schemas.user import UserCreate
 from app.schemas.auth import UserLogin, TokenResponse
-from app.core.security import (
-    hash_password,
-    verify_password,
-    create_access_token,
-)
+from typing import Optional
+from app.core.security import create_access_token
+from app.core.password_pool import password_pool
 from app.core.exceptions import UnauthorizedException, ForbiddenException
+from app.core.deps import user_cache, invalidate_user
+from app.db.session import run_in_session, run_write
 
 
 # -------------------------------
 # Cria novo usuário
 # -------------------------------
+def _check_admin_permission(user_data: UserCreate, current_user: Usuario):
+    if user_data.admin and not current_user.admin:
+        raise ForbiddenException(
+            "Apenas administradores podem criar usuários administradores"
+        )
+
+
+def _get_user_by_email(db: Session, email: str):
+    return (
+        db.query(Usuario)
+        .filter(Usuario.email == email)
+        .first()
+    )
+
+
 def create_user(
     user_data: UserCreate,
     db: Session,
-    current_user: Usuario
+    current_user: Usuario,
+    hashed_password: Optional[str] = None
 ):
     """
     Cria um novo usuário no sistema.
@@ -24,23 +41,18 @@ def create_user(
     Regras:
     - Apenas administradores podem criar usuários admin
     - Email deve ser único
-    """
 
-    if user_data.admin and not current_user.admin:
-        raise ForbiddenException(
-            "Apenas administradores podem criar usuários administradores"
-        )
+    hashed_password permite receber o hash já calculado fora da sessão
+    (ver create_user_async).
+    """
 
-    user_exists = (
-        db.query(Usuario)
-        .filter(Usuario.email == user_data.email)
-        .first()
-    )
+    _check_admin_permission(user_data, current_user)
 
-    if user_exists:
+    if _get_user_by_email(db, user_data.email):
         raise ForbiddenException("Email já cadastrado")
 
-    hashed_password = hash_password(user_data.senha)
+    if hashed_password is None:
+        hashed_password = password_pool.hash(user_data.senha)
 
     user = Usuario(
         nome=user_data.nome,
@@ -53,12 +65,60 @@ def create_user(
     db.add(user)
     db.commit()
     db.refresh(user)
+    user_cache.invalidate(user.id)
 
     return user
 
+
+async def create_user_async(
+    user_data: UserCreate,
+    db,
+    current_user: Usuario
+):
+    """
+    Versão para o event loop: o bcrypt roda no pool de processos
+    antes de abrir a escrita no banco.
+    """
+    _check_admin_permission(user_data, current_user)
+    hashed_password = await password_pool.ahash(user_data.senha)
+
+    return await run_write(
+        db,
+        lambda session: create_user(
+            user_data=user_data,
+            db=session,
+            current_user=current_user,
+            hashed_password=hashed_password
+        )
+    )
+
+
+# -------------------------------
+# Invalida o cache de autenticação e as claims dos
+# tokens emitidos quando um usuário é alterado ou removido
+# -------------------------------
+@event.listens_for(Usuario, "after_update")
+@event.listens_for(Usuario, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    invalidate_user(target.id)
+
+
 # -------------------------------
 # Autentica usuário
 # -------------------------------
+def _token_response(user: Usuario):
+    access_token = create_access_token(
+        user_id=user.id,
+        admin=user.admin,
+        ativo=user.ativo
+    )
+
+    return {
+        "access_token": access_token,
+        "token_type": "bearer"
+    }
+
+
 def authenticate_user(
     login_data: UserLogin,
     db: Session
@@ -67,23 +127,34 @@ def authenticate_user(
     Autentica um usuário e gera token JWT.
     """
 
-    user = (
-        db.query(Usuario)
-        .filter(Usuario.email == login_data.email)
-        .first()
-    )
+    user = _get_user_by_email(db, login_data.email)
 
-    if not user or not verify_password(
+    if not user or not password_pool.verify(
         login_data.senha, user.senha
     ):
         raise UnauthorizedException("Credenciais inválidas")
 
-    access_token = create_access_token(user_id=user.id)
+    return _token_response(user)
 
-    return {
-        "access_token": access_token,
-        "token_type": "bearer"
-    }
+
+async def authenticate_user_async(
+    login_data: UserLogin,
+    db
+):
+    """
+    Versão para o event loop: busca o usuário na sessão e verifica a
+    senha no pool de processos, sem bloquear as demais requisições.
+    Responde 429 quando a fila de verificação está cheia.
+    """
+
+    user = await run_in_session(db, _get_user_by_email, login_data.email)
+
+    if not user or not await password_pool.averify(
+        login_data.senha, user.senha
+    ):
+        raise UnauthorizedException("Credenciais inválidas")
+
+    return _token_response(user)
 
 # -------------------------------
 # Renova token de acesso
@@ -93,9 +164,4 @@ def refresh_access_token(user: Usuario):
     Gera um novo token de acesso para o usuário autenticado.
     """
 
-    access_token = create_access_token(user_id=user.id)
-
-    return {
-        "access_token": access_token,
-        "token_type": "bearer"
-    }
+    return _token_response(user)
@@ -0,0 +1,142 @@
+import csv
+import io
+import orjson
+from sqlalchemy import select
+from app.models.order import Pedido, ItemPedido
+from app.models.user import Usuario
+from app.schemas.order import FiltroExportacao
+from app.core.exceptions import ForbiddenException
+
+# Linhas por lote lido do banco (yield_per) e por bloco enviado ao cliente
+EXPORT_BATCH_SIZE = 1000
+
+
+# -------------------------------
+# Consulta da exportação
+# -------------------------------
+def export_statement(user: Usuario, filtros: FiltroExportacao):
+    """
+    Pedidos x itens (LEFT JOIN) ordenados por pedido, para serem lidos
+    em uma única passada: as linhas de um pedido chegam juntas.
+    """
+    if not user.admin:
+        raise ForbiddenException("Apenas administradores podem exportar pedidos")
+
+    statement = (
+        select(
+            Pedido.id,
+            Pedido.usuario,
+            Pedido.status,
+            Pedido.preco,
+            Pedido.criado_em,
+            ItemPedido.id,
+            ItemPedido.quantidade,
+            ItemPedido.preco_unitario,
+            ItemPedido.sabor,
+            ItemPedido.tamanho,
+        )
+        .outerjoin(ItemPedido, ItemPedido.pedido == Pedido.id)
+    )
+    if filtros.status:
+        statement = statement.where(Pedido.status == filtros.status)
+    if filtros.id_min is not None:
+        statement = statement.where(Pedido.id >= filtros.id_min)
+    if filtros.id_max is not None:
+        statement = statement.where(Pedido.id <= filtros.id_max)
+    if filtros.criado_de is not None:
+        statement = statement.where(Pedido.criado_em >= filtros.criado_de)
+    if filtros.criado_ate is not None:
+        statement = statement.where(Pedido.criado_em <= filtros.criado_ate)
+
+    return statement.order_by(Pedido.id, ItemPedido.id)
+
+
+# -------------------------------
+# Formatos
+# -------------------------------
+class NdjsonExport:
+    """
+    Um pedido por linha, com os itens aninhados.
+
+    Mantém só o pedido corrente entre lotes: um pedido pode começar
+    em um lote e terminar no seguinte.
+    """
+    media_type = "application/x-ndjson"
+    extensao = "ndjson"
+
+    def __init__(self):
+        self._pedido = None
+
+    def header(self) -> bytes:
+        return b""
+
+    def encode(self, linhas) -> bytes:
+        saida = []
+        for (pedido_id, usuario, status, preco, criado_em,
+             item_id, quantidade, preco_unitario, sabor, tamanho) in linhas:
+            if self._pedido is None or self._pedido["id"] != pedido_id:
+                if self._pedido is not None:
+                    saida.append(orjson.dumps(self._pedido))
+                self._pedido = {
+                    "id": pedido_id,
+                    "usuario": usuario,
+                    "status": status,
+                    "preco": preco,
+                    "criado_em": criado_em,
+                    "itens": [],
+                }
+            if item_id is not None:
+                self._pedido["itens"].append({
+                    "id": item_id,
+                    "quantidade": quantidade,
+                    "preco_unitario": preco_unitario,
+                    "sabor": sabor,
+                    "tamanho": tamanho,
+                })
+        return b"".join(linha + b"\n" for linha in saida)
+
+    def finish(self) -> bytes:
+        if self._pedido is None:
+            return b""
+        linha, self._pedido = orjson.dumps(self._pedido) + b"\n", None
+        return linha
+
+
+class CsvExport:
+    """
+    Uma linha por item, repetindo os dados do pedido; pedidos sem itens
+    saem em uma linha com as colunas do item vazias.
+    """
+    media_type = "text/csv"
+    extensao = "csv"
+    colunas = [
+        "pedido_id", "usuario_id", "status", "preco", "criado_em",
+        "item_id", "quantidade", "preco_unitario", "sabor", "tamanho",
+    ]
+
+    def _write(self, linhas) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(linhas)
+        return buffer.getvalue().encode()
+
+    def header(self) -> bytes:
+        return self._write([self.colunas])
+
+    def encode(self, linhas) -> bytes:
+        return self._write(
+            [
+                *linha[:4],
+                linha[4].isoformat() if linha[4] else "",
+                *linha[5:],
+            ]
+            for linha in linhas
+        )
+
+    def finish(self) -> bytes:
+        return b""
+
+
+EXPORTADORES = {
+    "ndjson": NdjsonExport,
+    "csv": CsvExport,
+}
@@ -0,0 +1,176 @@
+from collections import Counter, defaultdict
+from typing import Iterable, List, Tuple
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.exceptions import ForbiddenException
+from app.models.order import Pedido, ItemPedido
+from app.models.user import Usuario
+from app.schemas.order import PedidoImportacao
+from app.services.summary_service import STATUS_GASTO, apply_summary_delta
+
+
+def check_import_permission(user) -> None:
+    if not user.admin:
+        raise ForbiddenException("Apenas administradores podem importar pedidos")
+
+
+def _describe(erro: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, detalhe['loc'])) or 'linha'}: {detalhe['msg']}"
+        for detalhe in erro.errors()
+    )
+
+
+# -------------------------------
+# Gravação de um lote
+# -------------------------------
+def _insert_chunk(db: Session, pedidos: List[Tuple[int, PedidoImportacao]]) -> None:
+    """
+    Um INSERT em lote para os pedidos (com RETURNING dos ids, na ordem
+    enviada), outro para todos os itens e uma atualização do resumo por
+    usuário do lote. Não faz commit.
+    """
+    precos = [
+        sum(item.preco_unitario * item.quantidade for item in pedido.itens)
+        for _, pedido in pedidos
+    ]
+    ids = db.execute(
+        insert(Pedido).returning(Pedido.id, sort_by_parameter_order=True),
+        [
+            {
+                "usuario": pedido.usuario,
+                "status": pedido.status,
+                "preco": preco,
+                **({"criado_em": pedido.criado_em} if pedido.criado_em else {}),
+            }
+            for preco, (_, pedido) in zip(precos, pedidos)
+        ]
+    ).scalars().all()
+
+    itens = [
+        {
+            "pedido": pedido_id,
+            "quantidade": item.quantidade,
+            "preco_unitario": item.preco_unitario,
+            "sabor": item.sabor,
+            "tamanho": item.tamanho,
+        }
+        for pedido_id, (_, pedido) in zip(ids, pedidos)
+        for item in pedido.itens
+    ]
+    if itens:
+        db.execute(insert(ItemPedido), itens)
+
+    contagens = defaultdict(Counter)
+    gastos = defaultdict(float)
+    ultimos = {}
+    for pedido_id, preco, (_, pedido) in zip(ids, precos, pedidos):
+        contagens[pedido.usuario][pedido.status] += 1
+        if pedido.status == STATUS_GASTO:
+            gastos[pedido.usuario] += preco
+        ultimos[pedido.usuario] = max(pedido_id, ultimos.get(pedido.usuario, 0))
+    for usuario_id, ultimo in ultimos.items():
+        apply_summary_delta(
+            db,
+            usuario_id,
+            contagens=contagens[usuario_id],
+            gasto=gastos[usuario_id],
+            ultimo_pedido_id=ultimo
+        )
+
+
+def _import_chunk(db: Session, pedidos: List[Tuple[int, PedidoImportacao]], erros: list) -> int:
+    """
+    Grava o lote em uma transação. Se o banco recusar o lote, refaz
+    linha a linha para apontar só as linhas com problema.
+    """
+    usuarios = {pedido.usuario for _, pedido in pedidos}
+    existentes = set(db.scalars(select(Usuario.id).where(Usuario.id.in_(usuarios))))
+
+    validos = []
+    for numero, pedido in pedidos:
+        if pedido.usuario in existentes:
+            validos.append((numero, pedido))
+        else:
+            erros.append({"linha": numero, "erro": f"usuário {pedido.usuario} não encontrado"})
+    if not validos:
+        return 0
+
+    try:
+        _insert_chunk(db, validos)
+        db.commit()
+        return len(validos)
+    except SQLAlchemyError:
+        db.rollback()
+
+    importados = 0
+    for numero, pedido in validos:
+        try:
+            _insert_chunk(db, [(numero, pedido)])
+            db.commit()
+            importados += 1
+        except SQLAlchemyError as erro:
+            db.rollback()
+            erros.append({"linha": numero, "erro": str(erro.orig or erro).splitlines()[0]})
+    return importados
+
+
+# -------------------------------
+# Importação de pedidos (NDJSON)
+# -------------------------------
+class OrderImporter:
+    """
+    Importação incremental: feed recebe as linhas aos poucos (um arquivo,
+    um corpo de requisição em pedaços) e grava cada lote completo; finish
+    grava o lote restante e devolve o relatório. A numeração das linhas
+    continua entre as chamadas.
+    """
+
+    def __init__(self, lote: int = settings.IMPORT_CHUNK_SIZE):
+        self.lote = lote
+        self.importados = 0
+        self.erros = []
+        self._pendentes = []
+        self._numero = 0
+
+    def feed(self, db: Session, linhas: Iterable) -> None:
+        for linha in linhas:
+            self._numero += 1
+            if not linha.strip():
+                continue
+            try:
+                self._pendentes.append((self._numero, PedidoImportacao.model_validate_json(linha)))
+            except ValidationError as erro:
+                self.erros.append({"linha": self._numero, "erro": _describe(erro)})
+                continue
+
+            if len(self._pendentes) >= self.lote:
+                self.importados += _import_chunk(db, self._pendentes, self.erros)
+                self._pendentes = []
+
+    def finish(self, db: Session) -> dict:
+        if self._pendentes:
+            self.importados += _import_chunk(db, self._pendentes, self.erros)
+            self._pendentes = []
+        return {"importados": self.importados, "erros": self.erros}
+
+
+def import_orders(
+    db: Session,
+    linhas: Iterable,
+    lote: int = settings.IMPORT_CHUNK_SIZE
+) -> dict:
+    """
+    Importa pedidos com itens a partir de linhas NDJSON (str ou bytes).
+
+    Cada linha é validada com PedidoImportacao/OrderItem; linhas inválidas
+    entram no relatório de erros (com o número da linha) sem interromper a
+    importação. As válidas são gravadas em lotes de `lote` pedidos, um
+    commit por lote. O preço de cada pedido vem da soma dos itens.
+    """
+    importador = OrderImporter(lote)
+    importador.feed(db, linhas)
+    return importador.finish(db)
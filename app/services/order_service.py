@@ -1,8 +1,60 @@
-from sqlalchemy.orm import Session
+from collections import defaultdict
+from typing import List, Optional
+from sqlalchemy import update, delete, insert, select, func
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 from app.models.order import Pedido, ItemPedido
 from app.models.user import Usuario
-from app.schemas.order import OrderItem
-from app.core.exceptions import ForbiddenException, NotFoundException
+from app.schemas.order import OrderItem, OrderItemsBatch, FiltroPedidos
+from app.core.exceptions import ForbiddenException, NotFoundException, BadRequestException
+from app.core.events import get_order_broker
+from app.services.summary_service import apply_summary_delta, record_status_change
+
+
+# -------------------------------
+# Eventos de pedidos (push)
+# -------------------------------
+def _publish(pedido: Pedido, tipo: str, versao: int) -> None:
+    """
+    Publica a alteração para o dono do pedido. Chamar depois do commit:
+    assinantes só recebem o que já está gravado. A versão vem de quem
+    gravou (RETURNING), sem reler o pedido.
+    """
+    get_order_broker().publish(pedido.usuario, {
+        "tipo": tipo,
+        "pedido_id": pedido.id,
+        "status": pedido.status,
+        "preco": pedido.preco,
+        "versao": versao,
+    })
+
+
+# -------------------------------
+# Inserir itens em lote
+# -------------------------------
+def _insert_items(
+    db: Session,
+    pedido_id: int,
+    itens: List[OrderItem]
+) -> float:
+    """
+    Insere os itens com um único INSERT (executemany) e retorna a soma
+    dos seus preços, para o chamador aplicar ao total do pedido.
+    """
+    db.execute(
+        insert(ItemPedido),
+        [
+            {
+                "pedido": pedido_id,
+                "quantidade": item.quantidade,
+                "preco_unitario": item.preco_unitario,
+                "sabor": item.sabor,
+                "tamanho": item.tamanho,
+            }
+            for item in itens
+        ]
+    )
+    return sum(item.preco_unitario * item.quantidade for item in itens)
 
 
 # -------------------------------
@@ -10,32 +62,107 @@ from app.core.exceptions import ForbiddenException, NotFoundException
 # -------------------------------
 def create_order(
     db: Session,
-    user: Usuario
+    user: Usuario,
+    itens: Optional[List[OrderItem]] = None
 ) -> Pedido:
-    pedido = Pedido(usuario=user.id)
+    """
+    Cria o pedido, opcionalmente já com os itens iniciais.
+
+    O preço é calculado uma vez a partir dos itens recebidos e tudo
+    é gravado em um único commit.
+    """
+    itens = itens or []
+    pedido = Pedido(
+        usuario=user.id,
+        preco=sum(item.preco_unitario * item.quantidade for item in itens)
+    )
     db.add(pedido)
+    db.flush()  # gera o id do pedido para os itens e o resumo
+
+    if itens:
+        _insert_items(db, pedido.id, itens)
+
+    apply_summary_delta(
+        db, user.id, contagens={pedido.status: 1}, ultimo_pedido_id=pedido.id
+    )
     db.commit()
     db.refresh(pedido)
+    _publish(pedido, "criado", pedido.versao)
     return pedido
 
 
 # -------------------------------
-# Cancelar pedido
+# Pedido bloqueado para alteração
 # -------------------------------
-def cancel_order(
+def _lock_order(
     db: Session,
     pedido_id: int,
-    user: Usuario
+    user: Usuario,
+    acao: str
 ) -> Pedido:
-    pedido = db.query(Pedido).filter(Pedido.id == pedido_id).first()
+    """
+    Carrega o pedido com a linha bloqueada até o commit (onde o banco
+    suporta) e verifica a permissão.
+
+    Toda alteração passa por aqui: o status lido é o que decide o efeito
+    no resumo do usuário (contagens e total gasto), e nenhuma outra
+    transação o muda antes do commit.
+    """
+    pedido = (
+        db.query(Pedido)
+        .filter(Pedido.id == pedido_id)
+        .with_for_update()
+        .populate_existing()
+        .first()
+    )
     if not pedido:
         raise NotFoundException("Pedido não encontrado")
 
     if not user.admin and pedido.usuario != user.id:
-        raise ForbiddenException("Você não tem permissão para cancelar este pedido")
+        raise ForbiddenException(f"Você não tem permissão para {acao} este pedido")
+
+    return pedido
+
 
-    pedido.status = "CANCELADO"
+# -------------------------------
+# Versão do pedido
+# -------------------------------
+def _update_order(db: Session, pedido: Pedido, **valores) -> int:
+    """
+    Grava os valores e incrementa a versão no mesmo UPDATE
+    (versao = versao + 1 no banco, sem corrida entre requisições).
+
+    O RETURNING devolve status, preço e versão como ficaram no banco: o
+    objeto é atualizado sem um SELECT depois do commit. Retorna a nova
+    versão.
+    """
+    linha = db.execute(
+        update(Pedido)
+        .where(Pedido.id == pedido.id)
+        .values(versao=Pedido.versao + 1, **valores)
+        .returning(Pedido.status, Pedido.preco, Pedido.versao)
+        .execution_options(synchronize_session=False)
+    ).one()
+    for campo, valor in linha._asdict().items():
+        set_committed_value(pedido, campo, valor)
+    return linha.versao
+
+
+# -------------------------------
+# Cancelar pedido
+# -------------------------------
+def cancel_order(
+    db: Session,
+    pedido_id: int,
+    user: Usuario
+) -> Pedido:
+    pedido = _lock_order(db, pedido_id, user, "cancelar")
+
+    status_anterior = pedido.status
+    versao = _update_order(db, pedido, status="CANCELADO")
+    record_status_change(db, pedido, status_anterior)
     db.commit()
+    _publish(pedido, "status", versao)
     return pedido
 
 
@@ -47,29 +174,157 @@ def finalize_order(
     pedido_id: int,
     user: Usuario
 ) -> Pedido:
-    pedido = db.query(Pedido).filter(Pedido.id == pedido_id).first()
-    if not pedido:
-        raise NotFoundException("Pedido não encontrado")
+    pedido = _lock_order(db, pedido_id, user, "finalizar")
 
-    if not user.admin and pedido.usuario != user.id:
-        raise ForbiddenException("Você não tem permissão para finalizar este pedido")
-
-    pedido.status = "FINALIZADO"
+    status_anterior = pedido.status
+    versao = _update_order(db, pedido, status="FINALIZADO")
+    record_status_change(db, pedido, status_anterior)
     db.commit()
+    _publish(pedido, "status", versao)
     return pedido
 
 
+# -------------------------------
+# Paginação por cursor (keyset em pedidos.id)
+# -------------------------------
+PAGE_SIZE_DEFAULT = 50
+PAGE_SIZE_MAX = 100
+
+
+def _filter_orders(
+    query,
+    filtros: Optional[FiltroPedidos] = None,
+    cursor: Optional[int] = None,
+    limite: Optional[int] = None
+):
+    """
+    Aplica filtros e o cursor à consulta de pedidos.
+
+    O cursor é o último id da página anterior; a próxima página começa
+    em id > cursor, usando o índice da chave primária em vez de OFFSET.
+    Sem limite, retorna todos os pedidos (uso interno).
+    """
+    if filtros:
+        if filtros.status:
+            query = query.filter(Pedido.status == filtros.status)
+        if filtros.preco_min is not None:
+            query = query.filter(Pedido.preco >= filtros.preco_min)
+        if filtros.preco_max is not None:
+            query = query.filter(Pedido.preco <= filtros.preco_max)
+
+    if cursor is not None:
+        query = query.filter(Pedido.id > cursor)
+
+    query = query.order_by(Pedido.id)
+    if limite is not None:
+        query = query.limit(limite)
+    return query
+
+
+def _paginate_orders(
+    query,
+    filtros: Optional[FiltroPedidos] = None,
+    cursor: Optional[int] = None,
+    limite: Optional[int] = None
+):
+    query = _filter_orders(query, filtros, cursor, limite)
+    # Itens carregados no mesmo SELECT (joinedload),
+    # evitando uma consulta por pedido na serialização
+    return query.options(joinedload(Pedido.itens)).all()
+
+
+def next_cursor(pedidos, limite: Optional[int]) -> Optional[int]:
+    """
+    Cursor da próxima página: o último id quando a página veio cheia.
+    """
+    if limite is None or len(pedidos) < limite:
+        return None
+    ultimo = pedidos[-1]
+    return ultimo["id"] if isinstance(ultimo, dict) else ultimo.id
+
+
+# -------------------------------
+# Projeção direta em dicts (sem objetos ORM)
+# -------------------------------
+def project_orders(
+    db: Session,
+    linhas,
+    admin: bool = False
+) -> List[dict]:
+    """
+    Monta os pedidos no formato das respostas direto das linhas
+    (id, status, preco e, para o admin, usuario), sem criar objetos ORM.
+
+    Os itens de todos os pedidos vêm de um único SELECT de colunas;
+    para o admin incluem o id do item.
+    """
+    ids = [linha.id for linha in linhas]
+    itens = defaultdict(list)
+    if ids:
+        consulta = (
+            select(
+                ItemPedido.id,
+                ItemPedido.pedido,
+                ItemPedido.quantidade,
+                ItemPedido.preco_unitario,
+                ItemPedido.sabor,
+                ItemPedido.tamanho,
+            )
+            .where(ItemPedido.pedido.in_(ids))
+            .order_by(ItemPedido.id)
+        )
+        for item_id, pedido_id, quantidade, preco_unitario, sabor, tamanho in db.execute(consulta):
+            item = {
+                "quantidade": quantidade,
+                "preco_unitario": preco_unitario,
+                "sabor": sabor,
+                "tamanho": tamanho,
+            }
+            if admin:
+                item["id"] = item_id
+            itens[pedido_id].append(item)
+
+    pedidos = []
+    for linha in linhas:
+        pedido = {"id": linha.id}
+        if admin:
+            pedido["usuario"] = linha.usuario
+        pedido.update(status=linha.status, preco=linha.preco, itens=itens[linha.id])
+        pedidos.append(pedido)
+    return pedidos
+
+
 # -------------------------------
 # Listar todos pedidos (admin)
 # -------------------------------
 def list_all_orders(
     db: Session,
-    user: Usuario
+    user: Usuario,
+    filtros: Optional[FiltroPedidos] = None,
+    cursor: Optional[int] = None,
+    limite: Optional[int] = None
 ):
     if not user.admin:
         raise ForbiddenException("Apenas administradores podem acessar esta rota")
 
-    return db.query(Pedido).all()
+    return _paginate_orders(db.query(Pedido), filtros, cursor, limite)
+
+
+def list_all_orders_projected(
+    db: Session,
+    user: Usuario,
+    filtros: Optional[FiltroPedidos] = None,
+    cursor: Optional[int] = None,
+    limite: Optional[int] = None
+) -> List[dict]:
+    """
+    Igual a list_all_orders, já como dicts prontos para serializar.
+    """
+    if not user.admin:
+        raise ForbiddenException("Apenas administradores podem acessar esta rota")
+
+    query = db.query(Pedido.id, Pedido.usuario, Pedido.status, Pedido.preco)
+    return project_orders(db, _filter_orders(query, filtros, cursor, limite).all(), admin=True)
 
 
 # -------------------------------
@@ -77,9 +332,42 @@ def list_all_orders(
 # -------------------------------
 def list_user_orders(
     db: Session,
-    user: Usuario
+    user: Usuario,
+    filtros: Optional[FiltroPedidos] = None,
+    cursor: Optional[int] = None,
+    limite: Optional[int] = None
 ):
-    return db.query(Pedido).filter(Pedido.usuario == user.id).all()
+    query = db.query(Pedido).filter(Pedido.usuario == user.id)
+    return _paginate_orders(query, filtros, cursor, limite)
+
+
+def list_user_order_versions(
+    db: Session,
+    user: Usuario,
+    filtros: Optional[FiltroPedidos] = None,
+    cursor: Optional[int] = None,
+    limite: Optional[int] = None
+):
+    """
+    Linhas (id, versao) dos pedidos da página, sem carregar os pedidos nem os itens.
+    """
+    query = db.query(Pedido.id, Pedido.versao).filter(Pedido.usuario == user.id)
+    return _filter_orders(query, filtros, cursor, limite).all()
+
+
+def get_orders_projected(db: Session, ids: List[int]) -> List[tuple]:
+    """
+    Pares (versao, pedido como dict) dos ids informados. Não verifica
+    permissão: os ids devem vir de uma consulta já filtrada pelo usuário.
+    """
+    if not ids:
+        return []
+    linhas = (
+        db.query(Pedido.id, Pedido.status, Pedido.preco, Pedido.versao)
+        .filter(Pedido.id.in_(ids))
+        .all()
+    )
+    return list(zip([linha.versao for linha in linhas], project_orders(db, linhas)))
 
 
 # -------------------------------
@@ -100,6 +388,66 @@ def get_order_by_id(
     return pedido
 
 
+def get_order_row(
+    db: Session,
+    pedido_id: int,
+    user: Usuario
+):
+    """
+    Linha (id, usuario, status, preco, versao) do pedido, com a mesma
+    verificação de get_order_by_id, sem carregar o pedido nem os itens.
+
+    A versão e o corpo saem da mesma leitura: serve de entrada para
+    project_orders e para a ETag do pedido.
+    """
+    linha = (
+        db.query(Pedido.id, Pedido.usuario, Pedido.status, Pedido.preco, Pedido.versao)
+        .filter(Pedido.id == pedido_id)
+        .first()
+    )
+    if not linha:
+        raise NotFoundException("Pedido não encontrado")
+
+    if not user.admin and linha.usuario != user.id:
+        raise ForbiddenException("Você não tem permissão para acessar este pedido")
+
+    return linha
+
+
+def get_order_version(
+    db: Session,
+    pedido_id: int,
+    user: Usuario
+) -> int:
+    """
+    Versão do pedido, com a mesma verificação de get_order_by_id.
+    """
+    return get_order_row(db, pedido_id, user).versao
+
+
+# -------------------------------
+# Atualização incremental do preço
+# -------------------------------
+def apply_price_delta(
+    db: Session,
+    pedido: Pedido,
+    delta: float
+) -> int:
+    """
+    Soma delta ao preço do pedido direto no banco (preco = preco + delta)
+    e incrementa a versão. Em pedidos finalizados, soma também ao total
+    gasto do resumo do usuário.
+
+    Não carrega os itens do pedido e é atômico mesmo com edições
+    concorrentes. O pedido deve vir de _lock_order: o status que decide o
+    total gasto não pode mudar até o commit. Não faz commit: participa da
+    transação do chamador. Retorna a nova versão.
+    """
+    if delta and pedido.status == "FINALIZADO":
+        apply_summary_delta(db, pedido.usuario, gasto=delta)
+    return _update_order(db, pedido, preco=Pedido.preco + delta)
+
+
 # -------------------------------
 # Adicionar item ao pedido
 # -------------------------------
@@ -109,7 +457,7 @@ def add_item_to_order(
     item_data: OrderItem,
     user: Usuario
 ) -> Pedido:
-    pedido = get_order_by_id(db, pedido_id, user)
+    pedido = _lock_order(db, pedido_id, user, "acessar")
 
     item = ItemPedido(
         pedido=pedido.id,
@@ -120,10 +468,9 @@ def add_item_to_order(
     )
 
     db.add(item)
+    versao = apply_price_delta(db, pedido, item.preco_unitario * item.quantidade)
     db.commit()
-
-    pedido.calcular_preco()
-    db.commit()
+    _publish(pedido, "preco", versao)
 
     return pedido
 
@@ -140,14 +487,125 @@ def remove_item_from_order(
     if not item:
         raise NotFoundException("Item não encontrado")
 
-    pedido = db.query(Pedido).filter(Pedido.id == item.pedido).first()
-    if not user.admin and pedido.usuario != user.id:
-        raise ForbiddenException("Você não tem permissão para alterar este pedido")
+    pedido = _lock_order(db, item.pedido, user, "alterar")
 
     db.delete(item)
+    versao = apply_price_delta(db, pedido, -(item.preco_unitario * item.quantidade))
     db.commit()
+    _publish(pedido, "preco", versao)
 
-    pedido.calcular_preco()
+    return pedido
+
+
+# -------------------------------
+# Adicionar / remover itens em lote
+# -------------------------------
+def update_order_items(
+    db: Session,
+    pedido_id: int,
+    itens: OrderItemsBatch,
+    user: Usuario
+) -> Pedido:
+    """
+    Aplica várias adições e remoções de itens em uma única transação.
+
+    Uma verificação de permissão, um INSERT em lote, um DELETE e uma
+    única atualização do preço, independente da quantidade de linhas.
+    """
+    if not itens.adicionar and not itens.remover:
+        raise BadRequestException("Nenhum item para adicionar ou remover")
+
+    pedido = _lock_order(db, pedido_id, user, "acessar")
+    delta = 0
+
+    if itens.remover:
+        ids = set(itens.remover)
+        removidos = (
+            db.query(ItemPedido.id, ItemPedido.preco_unitario, ItemPedido.quantidade)
+            .filter(ItemPedido.pedido == pedido.id, ItemPedido.id.in_(ids))
+            .all()
+        )
+        if len(removidos) != len(ids):
+            raise NotFoundException("Item não encontrado neste pedido")
+
+        db.execute(
+            delete(ItemPedido)
+            .where(ItemPedido.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        delta -= sum(preco * quantidade for _, preco, quantidade in removidos)
+
+    if itens.adicionar:
+        delta += _insert_items(db, pedido.id, itens.adicionar)
+
+    versao = apply_price_delta(db, pedido, delta)
     db.commit()
+    _publish(pedido, "preco", versao)
 
+    # Itens alterados via SQL em lote: recarrega a coleção no próximo acesso
+    db.expire(pedido, ["itens"])
     return pedido
+
+
+# -------------------------------
+# Verificação de consistência dos preços
+# -------------------------------
+def check_order_totals(
+    db: Session,
+    corrigir: bool = False,
+    tolerancia: float = 0.005,
+    lote: int = 10_000
+) -> list[dict]:
+    """
+    Recalcula o total de cada pedido a partir dos itens e reporta divergências.
+
+    Percorre os pedidos em lotes por id, agregando no banco (sem carregar
+    objetos). Com corrigir=True, grava o total recalculado nos pedidos
+    divergentes.
+    """
+    divergencias = []
+    cursor = 0
+
+    while True:
+        ids = (
+            db.query(Pedido.id)
+            .filter(Pedido.id > cursor)
+            .order_by(Pedido.id)
+            .limit(lote)
+            .subquery()
+        )
+        total_itens = func.coalesce(
+            func.sum(ItemPedido.preco_unitario * ItemPedido.quantidade), 0
+        )
+        linhas = (
+            db.query(Pedido.id, Pedido.preco, total_itens, Pedido.usuario, Pedido.status)
+            .join(ids, ids.c.id == Pedido.id)
+            .outerjoin(ItemPedido, ItemPedido.pedido == Pedido.id)
+            .group_by(Pedido.id, Pedido.preco, Pedido.usuario, Pedido.status)
+            .order_by(Pedido.id)
+            .all()
+        )
+        if not linhas:
+            break
+
+        for pedido_id, preco, preco_calculado, usuario_id, status_pedido in linhas:
+            if abs(preco - preco_calculado) > tolerancia:
+                divergencias.append({
+                    "pedido_id": pedido_id,
+                    "preco": preco,
+                    "preco_calculado": preco_calculado
+                })
+                if corrigir:
+                    db.execute(
+                        update(Pedido)
+                        .where(Pedido.id == pedido_id)
+                        .values(preco=preco_calculado, versao=Pedido.versao + 1)
+                    )
+                    if status_pedido == "FINALIZADO":
+                        apply_summary_delta(db, usuario_id, gasto=preco_calculado - preco)
+
+        if corrigir:
+            db.commit()
+        cursor = linhas[-1][0]
+
+    return divergencias
@@ -0,0 +1,211 @@
+from typing import Dict, Optional
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.order import Pedido, ResumoPedidos
+from app.models.user import Usuario
+from app.core.exceptions import ForbiddenException
+
+# Status do pedido -> coluna de contagem do resumo
+STATUS_COLUNAS = {
+    "PENDENTE": "pendentes",
+    "CANCELADO": "cancelados",
+    "FINALIZADO": "finalizados",
+}
+STATUS_GASTO = "FINALIZADO"
+
+
+# -------------------------------
+# Atualização incremental
+# -------------------------------
+def apply_summary_delta(
+    db: Session,
+    usuario_id: int,
+    contagens: Optional[Dict[str, int]] = None,
+    gasto: float = 0,
+    ultimo_pedido_id: Optional[int] = None
+) -> None:
+    """
+    Soma os deltas ao resumo do usuário direto no banco
+    (pendentes = pendentes + n, ...), criando a linha se ainda não existir.
+
+    contagens mapeia status -> delta. Não faz commit: participa da
+    transação do chamador, junto com a alteração do pedido.
+    """
+    deltas = {
+        STATUS_COLUNAS[status_pedido]: n
+        for status_pedido, n in (contagens or {}).items()
+        if n and status_pedido in STATUS_COLUNAS
+    }
+    if not deltas and not gasto and ultimo_pedido_id is None:
+        return
+
+    valores = {
+        coluna: getattr(ResumoPedidos, coluna) + n for coluna, n in deltas.items()
+    }
+    if gasto:
+        valores["total_gasto"] = ResumoPedidos.total_gasto + gasto
+    if ultimo_pedido_id is not None:
+        valores["ultimo_pedido_id"] = case(
+            (ResumoPedidos.ultimo_pedido_id > ultimo_pedido_id, ResumoPedidos.ultimo_pedido_id),
+            else_=ultimo_pedido_id
+        )
+    atualizar = (
+        update(ResumoPedidos)
+        .where(ResumoPedidos.usuario == usuario_id)
+        .values(valores)
+        .execution_options(synchronize_session=False)
+    )
+    if db.execute(atualizar).rowcount:
+        return
+
+    # Primeira alteração do usuário: cria a linha. Se outra transação
+    # criou no meio tempo, o INSERT falha e o UPDATE é refeito.
+    try:
+        with db.begin_nested():
+            db.execute(insert(ResumoPedidos).values(
+                usuario=usuario_id,
+                pendentes=deltas.get("pendentes", 0),
+                cancelados=deltas.get("cancelados", 0),
+                finalizados=deltas.get("finalizados", 0),
+                total_gasto=gasto,
+                ultimo_pedido_id=ultimo_pedido_id,
+            ))
+    except IntegrityError:
+        db.execute(atualizar)
+
+
+def record_status_change(
+    db: Session,
+    pedido: Pedido,
+    status_anterior: str
+) -> None:
+    """
+    Move o pedido de status no resumo; entrar ou sair de FINALIZADO
+    soma ou subtrai o preço do total gasto.
+    """
+    if status_anterior == pedido.status:
+        return
+
+    gasto = 0
+    if pedido.status == STATUS_GASTO:
+        gasto += pedido.preco
+    if status_anterior == STATUS_GASTO:
+        gasto -= pedido.preco
+
+    apply_summary_delta(
+        db,
+        pedido.usuario,
+        contagens={status_anterior: -1, pedido.status: 1},
+        gasto=gasto
+    )
+
+
+# -------------------------------
+# Consulta
+# -------------------------------
+def get_user_summary(
+    db: Session,
+    user: Usuario,
+    usuario_id: Optional[int] = None
+) -> dict:
+    """
+    Resumo dos pedidos do usuário autenticado, ou de usuario_id (admin).
+    Uma leitura por chave primária; usuário sem pedidos tem tudo zerado.
+    """
+    usuario_id = user.id if usuario_id is None else usuario_id
+    if not user.admin and usuario_id != user.id:
+        raise ForbiddenException("Você não tem permissão para acessar este resumo")
+
+    linha = db.execute(
+        select(
+            ResumoPedidos.pendentes,
+            ResumoPedidos.cancelados,
+            ResumoPedidos.finalizados,
+            ResumoPedidos.total_gasto,
+            ResumoPedidos.ultimo_pedido_id,
+        ).where(ResumoPedidos.usuario == usuario_id)
+    ).first()
+
+    resumo = {
+        "usuario_id": usuario_id,
+        "pendentes": 0,
+        "cancelados": 0,
+        "finalizados": 0,
+        "total_gasto": 0.0,
+        "ultimo_pedido_id": None,
+    }
+    if linha:
+        resumo.update(linha._asdict())
+    return resumo
+
+
+# -------------------------------
+# Reconstrução (backfill)
+# -------------------------------
+def rebuild_summaries(
+    db: Session,
+    lote: int = 1000
+) -> int:
+    """
+    Recalcula o resumo de todos os usuários a partir de pedidos.
+
+    Percorre os usuários em lotes por id; em cada lote apaga os resumos
+    da faixa e os regrava com um INSERT ... SELECT agregado no banco,
+    com um commit por lote. Retorna a quantidade de usuários processados.
+    """
+    def _conta(status_pedido):
+        return func.coalesce(func.sum(case((Pedido.status == status_pedido, 1), else_=0)), 0)
+
+    processados = 0
+    cursor = 0
+
+    while True:
+        ids = db.scalars(
+            select(Usuario.id)
+            .where(Usuario.id > cursor)
+            .order_by(Usuario.id)
+            .limit(lote)
+        ).all()
+        if not ids:
+            break
+        inicio, fim = ids[0], ids[-1]
+
+        db.execute(
+            delete(ResumoPedidos)
+            .where(ResumoPedidos.usuario.between(inicio, fim))
+            .execution_options(synchronize_session=False)
+        )
+        agregado = (
+            select(
+                Pedido.usuario,
+                _conta("PENDENTE"),
+                _conta("CANCELADO"),
+                _conta("FINALIZADO"),
+                func.coalesce(
+                    func.sum(case((Pedido.status == STATUS_GASTO, Pedido.preco), else_=0)), 0
+                ),
+                func.max(Pedido.id),
+            )
+            .where(Pedido.usuario.between(inicio, fim))
+            .group_by(Pedido.usuario)
+        )
+        db.execute(
+            insert(ResumoPedidos).from_select(
+                [
+                    ResumoPedidos.usuario,
+                    ResumoPedidos.pendentes,
+                    ResumoPedidos.cancelados,
+                    ResumoPedidos.finalizados,
+                    ResumoPedidos.total_gasto,
+                    ResumoPedidos.ultimo_pedido_id,
+                ],
+                agregado
+            )
+        )
+        db.commit()
+
+        processados += len(ids)
+        cursor = fim
+
+    return processados
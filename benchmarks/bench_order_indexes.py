@@ -0,0 +1,134 @@
+"""
+Benchmark dos índices de pedidos / itens_pedidos.
+
+Popula um SQLite temporário com N pedidos (1 item cada) e mede as consultas
+quentes das listagens com e sem os índices declarados nos models.
+
+Uso:
+    python -m benchmarks.bench_order_indexes --pedidos 1000000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.schema import CreateIndex
+
+from app.models.base import Base
+from app.models.order import Pedido, ItemPedido
+from app.models.user import Usuario  # noqa: F401 (tabela usuarios para a FK)
+
+# Histórico real: a maioria finalizada, poucos pendentes na fila do admin
+STATUS = ["PENDENTE", "CANCELADO", "FINALIZADO"]
+STATUS_PESOS = [2, 8, 90]
+
+QUERIES = {
+    # list_user_orders paginado
+    "pedidos do usuário (página)": (
+        "SELECT id FROM pedidos WHERE usuario_id = :usuario AND id > :cursor "
+        "ORDER BY id LIMIT 50"
+    ),
+    # list_all_orders filtrado por status
+    "fila do admin por status (página)": (
+        "SELECT id FROM pedidos WHERE status = :status AND id > :cursor "
+        "ORDER BY id LIMIT 50"
+    ),
+    # carregamento de Pedido.itens / remove_item_from_order
+    "itens de um pedido": (
+        "SELECT id FROM itens_pedidos WHERE pedido = :pedido"
+    ),
+}
+
+
+def seed(path: str, pedidos: int, usuarios: int, chunk: int = 50_000):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO usuarios (id, nome, email, senha, ativo, admin) VALUES (?, ?, ?, ?, 1, 0)",
+        ((i, f"u{i}", f"u{i}@bench", "x") for i in range(1, usuarios + 1)),
+    )
+    rnd = random.Random(42)
+    for start in range(1, pedidos + 1, chunk):
+        ids = range(start, min(start + chunk, pedidos + 1))
+        conn.executemany(
+            "INSERT INTO pedidos (id, status, usuario_id, preco) VALUES (?, ?, ?, 10)",
+            (
+                (i, rnd.choices(STATUS, STATUS_PESOS)[0], rnd.randint(1, usuarios))
+                for i in ids
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO itens_pedidos (pedido, quantidade, preco_unitario, sabor, tamanho) "
+            "VALUES (?, 1, 10, 'CALABRESA', 'MEDIA')",
+            ((i,) for i in ids),
+        )
+    conn.commit()
+    conn.execute("ANALYZE")
+    return conn
+
+
+def index_ddl():
+    dialect = create_engine("sqlite://").dialect
+    return [
+        (index.name, str(CreateIndex(index).compile(dialect=dialect)))
+        for table in (Pedido.__table__, ItemPedido.__table__)
+        for index in table.indexes
+    ]
+
+
+def time_queries(conn, pedidos: int, usuarios: int, repeticoes: int):
+    rnd = random.Random(7)
+    resultados = {}
+    for nome, sql in QUERIES.items():
+        amostras = []
+        for _ in range(repeticoes):
+            params = {
+                "usuario": rnd.randint(1, usuarios),
+                "status": "PENDENTE",
+                "cursor": rnd.randint(0, pedidos),
+                "pedido": rnd.randint(1, pedidos),
+            }
+            inicio = time.perf_counter()
+            conn.execute(sql, params).fetchall()
+            amostras.append((time.perf_counter() - inicio) * 1000)
+        resultados[nome] = statistics.median(amostras)
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pedidos", type=int, default=1_000_000)
+    parser.add_argument("--usuarios", type=int, default=10_000)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        print(f"Populando {args.pedidos} pedidos / {args.usuarios} usuários...")
+        conn = seed(path, args.pedidos, args.usuarios)
+
+        ddl = index_ddl()
+        for nome, _ in ddl:
+            conn.execute(f"DROP INDEX IF EXISTS {nome}")
+        antes = time_queries(conn, args.pedidos, args.usuarios, args.repeticoes)
+
+        for _, sql in ddl:
+            conn.execute(sql)
+        conn.execute("ANALYZE")
+        depois = time_queries(conn, args.pedidos, args.usuarios, args.repeticoes)
+        conn.close()
+
+    print(f"\n{'consulta':<38}{'sem índice (ms)':>18}{'com índice (ms)':>18}")
+    for nome in QUERIES:
+        print(f"{nome:<38}{antes[nome]:>18.3f}{depois[nome]:>18.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Teste de carga: latência das requisições x tamanho do pool de conexões.
+
+Para cada tamanho de pool, sobe a aplicação em um subprocesso (DB_POOL_SIZE
+é lido no import), dispara requisições concorrentes em GET /orders/meus_pedidos
+pelo ASGI e reporta p50/p95/p99 e a espera média no checkout do pool.
+
+Por padrão usa um SQLite temporário; defina DATABASE_URL para medir contra
+o banco real (ex: PostgreSQL), que é onde o tamanho do pool mais importa.
+
+Uso:
+    python -m benchmarks.bench_pool_size --pools 1 2 5 10 --concorrencia 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.common import percentil, run_worker
+
+
+async def _carga(requisicoes: int, concorrencia: int):
+    import httpx
+    from app.main import app
+    from app.db.session import SessionLocal, engine, async_engine, active_engine
+    from app.db.pool import pool_stats
+    from app.models.base import Base
+    from app.models.user import Usuario
+    from app.models.order import Pedido
+    from app.core.security import create_access_token
+
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    user = Usuario("bench", f"bench{time.time_ns()}@bench", "x")
+    db.add(user)
+    db.commit()
+    db.add_all([Pedido(usuario=user.id) for _ in range(20)])
+    db.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(user.id)}"}
+    db.close()
+
+    latencias = []
+    semaforo = asyncio.Semaphore(concorrencia)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def _requisicao():
+            async with semaforo:
+                inicio = time.perf_counter()
+                response = await client.get("/orders/meus_pedidos", headers=headers)
+                latencias.append((time.perf_counter() - inicio) * 1000)
+                response.raise_for_status()
+
+        # aquecimento (abre as conexões do pool)
+        await asyncio.gather(*[_requisicao() for _ in range(concorrencia)])
+        latencias.clear()
+        active_engine().pool.metrics.reset()
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*[_requisicao() for _ in range(requisicoes)])
+        duracao = time.perf_counter() - inicio
+
+    pool = pool_stats(active_engine().pool)
+    # fecha as conexões (as do aiosqlite mantêm threads vivas)
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
+    return {
+        "rps": requisicoes / duracao,
+        "p50_ms": statistics.median(latencias),
+        "p95_ms": percentil(latencias, 95),
+        "p99_ms": percentil(latencias, 99),
+        "pool_avg_wait_ms": pool["avg_wait_ms"],
+        "pool_max_wait_ms": pool["max_wait_ms"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pools", type=int, nargs="+", default=[1, 2, 5, 10, 20])
+    parser.add_argument("--requisicoes", type=int, default=2000)
+    parser.add_argument("--concorrencia", type=int, default=50)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(asyncio.run(_carga(args.requisicoes, args.concorrencia))))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = os.environ.get("DATABASE_URL") or f"sqlite:///{tmp}/bench.db"
+        print(f"{args.requisicoes} requisições, concorrência {args.concorrencia}, {database_url}")
+        print(f"\n{'pool':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'espera pool ms':>18}")
+        for pool_size in args.pools:
+            r = run_worker(
+                "benchmarks.bench_pool_size",
+                {
+                    "DATABASE_URL": database_url,
+                    "DB_POOL_SIZE": str(pool_size),
+                    "DB_MAX_OVERFLOW": "0",
+                },
+                "--requisicoes", args.requisicoes,
+                "--concorrencia", args.concorrencia,
+            )
+            print(
+                f"{pool_size:>6}{r['rps']:>10.0f}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}"
+                f"{r['p99_ms']:>10.2f}{r['pool_avg_wait_ms']:>18.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
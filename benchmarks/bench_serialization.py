@@ -0,0 +1,137 @@
+"""
+Benchmark da serialização das respostas de pedidos.
+
+Compara, para 1, 100 e 10.000 pedidos (2 itens cada), o caminho antigo
+(objetos ORM + jsonable_encoder / ResponsePedidoSchema + json da stdlib)
+com a projeção direta em dicts + orjson, com e sem a validação pelo
+response_model (que /listar mantém). Mede separadamente a consulta
+(service) e a geração do corpo JSON.
+
+Uso:
+    python -m benchmarks.bench_serialization --pedidos 1 100 10000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.models.base import Base  # noqa: E402
+from app.models.order import Pedido, ItemPedido  # noqa: E402
+from app.models.user import Usuario  # noqa: E402
+from app.schemas.order import PaginaPedidosAdminSchema, PaginaPedidosSchema, ResponsePedidoSchema  # noqa: E402
+from app.schemas.user import UserPrincipal  # noqa: E402
+from app.services import order_service  # noqa: E402
+
+ADMIN = UserPrincipal(id=1, admin=True)
+
+
+def _orm_jsonable(db):
+    pedidos = order_service.list_all_orders(db, ADMIN)
+    inicio = time.perf_counter()
+    JSONResponse({"pedidos": jsonable_encoder(pedidos), "next_cursor": None}).body
+    return inicio
+
+
+def _orm_schema(db):
+    pedidos = order_service.list_all_orders(db, ADMIN)
+    inicio = time.perf_counter()
+    pagina = PaginaPedidosSchema(
+        pedidos=[ResponsePedidoSchema.model_validate(pedido) for pedido in pedidos]
+    )
+    JSONResponse(jsonable_encoder(pagina)).body
+    return inicio
+
+
+def _projecao_orjson(db):
+    pedidos = order_service.list_all_orders_projected(db, ADMIN)
+    inicio = time.perf_counter()
+    ORJSONResponse({"pedidos": pedidos, "next_cursor": None}).body
+    return inicio
+
+
+def _projecao_schema_orjson(db):
+    pedidos = order_service.list_all_orders_projected(db, ADMIN)
+    inicio = time.perf_counter()
+    pagina = PaginaPedidosAdminSchema.model_validate({"pedidos": pedidos, "next_cursor": None})
+    ORJSONResponse(pagina.model_dump(mode="json")).body
+    return inicio
+
+
+CAMINHOS = {
+    "ORM + jsonable_encoder (/listar antigo)": _orm_jsonable,
+    "ORM + schema + json (/meus_pedidos antigo)": _orm_schema,
+    "projeção + orjson": _projecao_orjson,
+    "projeção + response_model + orjson (/listar)": _projecao_schema_orjson,
+}
+
+
+def _seed(Session, quantidade: int):
+    with Session() as db:
+        db.add(Usuario("bench", "bench@bench", "x"))
+        db.flush()
+        pedidos = db.execute(
+            insert(Pedido).returning(Pedido.id),
+            [{"usuario": 1, "status": "PENDENTE", "preco": 70} for _ in range(quantidade)]
+        ).scalars().all()
+        db.execute(insert(ItemPedido), [
+            {"pedido": pedido_id, "quantidade": item_quantidade, "preco_unitario": preco,
+             "sabor": "CALABRESA", "tamanho": "MEDIA"}
+            for pedido_id in pedidos
+            for item_quantidade, preco in ((2, 25), (1, 20))
+        ])
+        db.commit()
+
+
+def _medir(Session, caminho, repeticoes: int):
+    consultas, serializacoes = [], []
+    for _ in range(repeticoes):
+        db = Session()
+        try:
+            inicio = time.perf_counter()
+            inicio_serializacao = caminho(db)
+            fim = time.perf_counter()
+        finally:
+            db.close()
+        consultas.append((inicio_serializacao - inicio) * 1000)
+        serializacoes.append((fim - inicio_serializacao) * 1000)
+    return statistics.median(consultas), statistics.median(serializacoes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pedidos", type=int, nargs="+", default=[1, 100, 10_000])
+    parser.add_argument("--repeticoes", type=int, default=15)
+    args = parser.parse_args()
+
+    print(f"{'pedidos':>8}  {'caminho':<44}{'consulta ms':>13}{'serialização ms':>17}{'total ms':>10}")
+    for quantidade in args.pedidos:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+            Base.metadata.create_all(engine)
+            Session = sessionmaker(bind=engine)
+            _seed(Session, quantidade)
+
+            base = None
+            for nome, caminho in CAMINHOS.items():
+                _medir(Session, caminho, 1)  # aquecimento
+                consulta, serializacao = _medir(Session, caminho, args.repeticoes)
+                total = consulta + serializacao
+                base = base or total
+                print(
+                    f"{quantidade:>8}  {nome:<44}{consulta:>13.2f}{serializacao:>17.2f}"
+                    f"{total:>10.2f}  ({base / total:.1f}x)"
+                )
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
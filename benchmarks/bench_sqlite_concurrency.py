@@ -0,0 +1,149 @@
+"""
+Benchmark de concorrência no SQLite: modo padrão x modo de produção.
+
+Cada modo roda em um subprocesso com um SQLite novo em arquivo. Vários
+usuários disparam, em paralelo, adições de itens (escrita) e consultas do
+próprio pedido (leitura) pelo ASGI. Reporta throughput, latências e erros
+(ex: "database is locked").
+
+Uso:
+    python -m benchmarks.bench_sqlite_concurrency --requisicoes 3000 --escritas 0.3
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from benchmarks.common import percentil, run_worker
+
+MODOS = {
+    "padrão": {"SQLITE_TUNED": "false"},
+    "produção (WAL)": {"SQLITE_TUNED": "true"},
+}
+
+
+async def _carga(requisicoes: int, concorrencia: int, escritas: float, usuarios: int):
+    import httpx
+    from app.main import app
+    from app.db.session import SessionLocal, engine, async_engine
+    from app.models.base import Base
+    from app.models.user import Usuario
+    from app.models.order import Pedido
+    from app.core.security import create_access_token
+
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    contas = []
+    for i in range(usuarios):
+        user = Usuario(f"u{i}", f"u{i}@bench", "x")
+        db.add(user)
+        db.flush()
+        pedido = Pedido(usuario=user.id)
+        db.add(pedido)
+        db.flush()
+        contas.append((
+            {"Authorization": f"Bearer {create_access_token(user.id)}"},
+            pedido.id,
+        ))
+    db.commit()
+    db.close()
+
+    item = {"quantidade": 1, "preco_unitario": 10, "sabor": "CALABRESA", "tamanho": "MEDIA"}
+    latencias = {"leitura": [], "escrita": []}
+    erros = 0
+    semaforo = asyncio.Semaphore(concorrencia)
+    rnd = random.Random(1)
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        async def _requisicao(escrita: bool):
+            nonlocal erros
+            headers, pedido_id = rnd.choice(contas)
+            async with semaforo:
+                inicio = time.perf_counter()
+                if escrita:
+                    response = await client.post(
+                        f"/orders/pedido/adicionar_item/{pedido_id}", json=item, headers=headers
+                    )
+                else:
+                    response = await client.get(f"/orders/pedido/{pedido_id}", headers=headers)
+                tipo = "escrita" if escrita else "leitura"
+                latencias[tipo].append((time.perf_counter() - inicio) * 1000)
+                if response.status_code != 200:
+                    erros += 1
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*[
+            _requisicao(rnd.random() < escritas) for _ in range(requisicoes)
+        ])
+        duracao = time.perf_counter() - inicio
+
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
+
+    return {
+        "rps": requisicoes / duracao,
+        "erros": erros,
+        **{
+            f"{tipo}_{nome}": valor
+            for tipo, valores in latencias.items() if valores
+            for nome, valor in (
+                ("p50_ms", statistics.median(valores)),
+                ("p95_ms", percentil(valores, 95)),
+            )
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requisicoes", type=int, default=3000)
+    parser.add_argument("--concorrencia", type=int, default=64)
+    parser.add_argument("--escritas", type=float, default=0.3, help="fração de escritas")
+    parser.add_argument("--usuarios", type=int, default=50)
+    parser.add_argument("--sync", action="store_true", help="usa o caminho síncrono (DB_ASYNC=false)")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        import json
+        print(json.dumps(asyncio.run(
+            _carga(args.requisicoes, args.concorrencia, args.escritas, args.usuarios)
+        )))
+        return
+
+    print(
+        f"{args.requisicoes} requisições, concorrência {args.concorrencia}, "
+        f"{args.escritas:.0%} escritas, {'sync' if args.sync else 'async'}"
+    )
+    print(
+        f"\n{'modo':<16}{'req/s':>8}{'erros':>7}{'leitura p50':>13}{'leitura p95':>13}"
+        f"{'escrita p50':>13}{'escrita p95':>13}"
+    )
+    for nome, env in MODOS.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            r = run_worker(
+                "benchmarks.bench_sqlite_concurrency",
+                {
+                    **env,
+                    "DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+                    "DB_ASYNC": "false" if args.sync else "true",
+                },
+                "--requisicoes", args.requisicoes,
+                "--concorrencia", args.concorrencia,
+                "--escritas", args.escritas,
+                "--usuarios", args.usuarios,
+            )
+        print(
+            f"{nome:<16}{r['rps']:>8.0f}{r['erros']:>7}"
+            f"{r.get('leitura_p50_ms', 0):>13.2f}{r.get('leitura_p95_ms', 0):>13.2f}"
+            f"{r.get('escrita_p50_ms', 0):>13.2f}{r.get('escrita_p95_ms', 0):>13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+"""
+Suíte de benchmarks do order_service, auth_service e das rotas HTTP.
+
+Popula um banco com dados sintéticos (benchmarks.seed), mede cada função
+dos services e cada rota (pela aplicação ASGI, via TestClient) e grava um
+relatório JSON com p50/p95/p99 por caso. Com --comparar, compara com um
+relatório anterior (ex: de outro commit) e sai com código 1 se algum caso
+ficou mais lento que a tolerância.
+
+Uso:
+    python -m benchmarks.bench_suite --pedidos 1000000 --saida bench.json
+    python -m benchmarks.bench_suite --url sqlite:///bench.db --sem-seed --comparar bench.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import func, select  # noqa: E402
+
+from app.models.order import Pedido, ItemPedido  # noqa: E402
+from app.models.user import Usuario  # noqa: E402
+from app.schemas.auth import UserLogin  # noqa: E402
+from app.schemas.order import OrderItem, OrderItemsBatch  # noqa: E402
+from app.schemas.user import UserCreate, UserPrincipal  # noqa: E402
+from app.services import auth_service, order_service  # noqa: E402
+from benchmarks.common import percentil, run_worker  # noqa: E402
+from benchmarks.seed import ADMIN_EMAIL, SENHA, seed_database, user_email  # noqa: E402
+
+ADMIN = UserPrincipal(id=1, admin=True)
+ITEM = OrderItem(quantidade=1, preco_unitario=45, sabor="CALABRESA", tamanho="MEDIA")
+
+
+# -------------------------------
+# Escolha de dados (fora da medição)
+# -------------------------------
+def _pedido(db, rnd):
+    """
+    Pedido aleatório existente: (id, dono como UserPrincipal).
+    """
+    maximo = db.scalar(select(func.max(Pedido.id)))
+    linha = db.execute(
+        select(Pedido.id, Pedido.usuario)
+        .where(Pedido.id >= rnd.randint(1, maximo))
+        .order_by(Pedido.id)
+        .limit(1)
+    ).first()
+    return linha.id, UserPrincipal(id=linha.usuario)
+
+
+def _item(db, rnd):
+    pedido_id, dono = _pedido(db, rnd)
+    item_id = db.scalar(select(ItemPedido.id).where(ItemPedido.pedido == pedido_id).limit(1))
+    return pedido_id, item_id, dono
+
+
+def _login(db, rnd):
+    """
+    Login de um usuário populado (ids 1..N do seed). Os criados pelo caso
+    auth_service.create_user ("novo-...") ficam de fora: com --sem-seed,
+    sobrevivem entre execuções.
+    """
+    maximo = db.scalar(select(func.max(Usuario.id)).where(Usuario.email.not_like("novo-%")))
+    return (UserLogin(email=user_email(rnd.randint(1, maximo)), senha=SENHA),)
+
+
+def _cursor(db, rnd):
+    return rnd.randint(0, db.scalar(select(func.max(Pedido.id))))
+
+
+# -------------------------------
+# Casos dos services: nome -> (peso das repetições, preparo, chamada)
+# O preparo recebe (db, rnd) e devolve os argumentos da chamada
+# -------------------------------
+def _remove_case(db, rnd):
+    pedido_id, item_id, dono = _item(db, rnd)
+    while item_id is None:
+        pedido_id, item_id, dono = _item(db, rnd)
+    return item_id, dono
+
+
+def _batch_case(db, rnd):
+    pedido_id, item_id, dono = _item(db, rnd)
+    remover = [item_id] if item_id is not None else []
+    return pedido_id, OrderItemsBatch(adicionar=[ITEM, ITEM], remover=remover), dono
+
+
+def _versions_case(db, rnd):
+    _, dono = _pedido(db, rnd)
+    linhas = order_service.list_user_order_versions(db, dono, limite=50)
+    return ([linha.id for linha in linhas],)
+
+
+SERVICE_CASES = {
+    "order_service.create_order": (
+        1, lambda db, rnd: (_pedido(db, rnd)[1], [ITEM, ITEM]),
+        lambda db, user, itens: order_service.create_order(db, user, itens),
+    ),
+    "order_service.cancel_order": (
+        1, lambda db, rnd: _pedido(db, rnd),
+        lambda db, pedido_id, user: order_service.cancel_order(db, pedido_id, user),
+    ),
+    "order_service.finalize_order": (
+        1, lambda db, rnd: _pedido(db, rnd),
+        lambda db, pedido_id, user: order_service.finalize_order(db, pedido_id, user),
+    ),
+    "order_service.add_item_to_order": (
+        1, lambda db, rnd: _pedido(db, rnd),
+        lambda db, pedido_id, user: order_service.add_item_to_order(db, pedido_id, ITEM, user),
+    ),
+    "order_service.remove_item_from_order": (
+        1, _remove_case,
+        lambda db, item_id, user: order_service.remove_item_from_order(db, item_id, user),
+    ),
+    "order_service.update_order_items": (
+        1, _batch_case,
+        lambda db, pedido_id, itens, user: order_service.update_order_items(db, pedido_id, itens, user),
+    ),
+    "order_service.list_all_orders": (
+        1, lambda db, rnd: (_cursor(db, rnd),),
+        lambda db, cursor: order_service.list_all_orders(db, ADMIN, cursor=cursor, limite=50),
+    ),
+    "order_service.list_all_orders_projected": (
+        1, lambda db, rnd: (_cursor(db, rnd),),
+        lambda db, cursor: order_service.list_all_orders_projected(db, ADMIN, cursor=cursor, limite=50),
+    ),
+    "order_service.list_user_orders": (
+        1, lambda db, rnd: (_pedido(db, rnd)[1],),
+        lambda db, user: order_service.list_user_orders(db, user, limite=50),
+    ),
+    "order_service.list_user_order_versions": (
+        1, lambda db, rnd: (_pedido(db, rnd)[1],),
+        lambda db, user: order_service.list_user_order_versions(db, user, limite=50),
+    ),
+    "order_service.get_orders_projected": (
+        1, _versions_case,
+        lambda db, ids: order_service.get_orders_projected(db, ids),
+    ),
+    "order_service.get_order_by_id": (
+        1, lambda db, rnd: _pedido(db, rnd),
+        lambda db, pedido_id, user: order_service.get_order_by_id(db, pedido_id, user),
+    ),
+    "order_service.get_order_version": (
+        1, lambda db, rnd: _pedido(db, rnd),
+        lambda db, pedido_id, user: order_service.get_order_version(db, pedido_id, user),
+    ),
+    # Varredura completa: poucas repetições
+    "order_service.check_order_totals": (
+        0.1, lambda db, rnd: (),
+        lambda db: order_service.check_order_totals(db),
+    ),
+    # bcrypt (pool de processos): poucas repetições
+    "auth_service.authenticate_user": (
+        0.2, _login,
+        lambda db, login: auth_service.authenticate_user(login, db),
+    ),
+    "auth_service.create_user": (
+        0.2, lambda db, rnd: (UserCreate(
+            nome="Bench", email=f"novo-{time.time_ns()}@bench.dev", senha=SENHA
+        ),),
+        lambda db, dados: auth_service.create_user(dados, db, ADMIN),
+    ),
+    "auth_service.refresh_access_token": (
+        1, lambda db, rnd: (_pedido(db, rnd)[1],),
+        lambda db, user: auth_service.refresh_access_token(user),
+    ),
+}
+
+
+# -------------------------------
+# Rotas HTTP (aplicação ASGI): nome -> (peso, preparo, chamada)
+# O preparo recebe (client, rnd, contexto) e devolve os argumentos
+# -------------------------------
+HTTP_CASES = {
+    "POST /auth/sign-in-form": (
+        0.2, lambda c, rnd, ctx: (),
+        lambda c, ctx: c.post("/auth/sign-in-form", data={"username": ctx["email"], "password": SENHA}),
+    ),
+    "GET /orders/meus_pedidos": (
+        1, lambda c, rnd, ctx: (),
+        lambda c, ctx: c.get("/orders/meus_pedidos", headers=ctx["usuario"]),
+    ),
+    "GET /orders/pedido/{pedido_id}": (
+        1, lambda c, rnd, ctx: (rnd.choice(ctx["pedidos"]),),
+        lambda c, ctx, pedido_id: c.get(f"/orders/pedido/{pedido_id}", headers=ctx["usuario"]),
+    ),
+    "GET /orders/listar": (
+        1, lambda c, rnd, ctx: (rnd.randint(0, ctx["maximo"]),),
+        lambda c, ctx, cursor: c.get("/orders/listar", params={"cursor": cursor}, headers=ctx["admin"]),
+    ),
+    "GET /orders/resumo": (
+        1, lambda c, rnd, ctx: (),
+        lambda c, ctx: c.get("/orders/resumo", headers=ctx["usuario"]),
+    ),
+    "GET /orders/relatorio": (
+        0.1, lambda c, rnd, ctx: (),
+        lambda c, ctx: c.get("/orders/relatorio", params={"atualizar": True}, headers=ctx["admin"]),
+    ),
+    "POST /orders/pedido": (
+        1, lambda c, rnd, ctx: (),
+        lambda c, ctx: c.post("/orders/pedido", json={"itens": [ITEM.model_dump()]}, headers=ctx["usuario"]),
+    ),
+    "POST /orders/pedido/adicionar_item/{pedido_id}": (
+        1, lambda c, rnd, ctx: (rnd.choice(ctx["pedidos"]),),
+        lambda c, ctx, pedido_id: c.post(
+            f"/orders/pedido/adicionar_item/{pedido_id}", json=ITEM.model_dump(), headers=ctx["usuario"]
+        ),
+    ),
+    "POST /orders/pedido/finalizar/{pedido_id}": (
+        1, lambda c, rnd, ctx: (rnd.choice(ctx["pedidos"]),),
+        lambda c, ctx, pedido_id: c.post(f"/orders/pedido/finalizar/{pedido_id}", headers=ctx["usuario"]),
+    ),
+}
+
+
+def _resumir(amostras) -> dict:
+    return {
+        "n": len(amostras),
+        "media_ms": round(statistics.fmean(amostras), 3),
+        "p50_ms": round(percentil(amostras, 50), 3),
+        "p95_ms": round(percentil(amostras, 95), 3),
+        "p99_ms": round(percentil(amostras, 99), 3),
+        "max_ms": round(max(amostras), 3),
+    }
+
+
+def _repeticoes(peso: float, repeticoes: int) -> int:
+    return max(int(repeticoes * peso), 1)
+
+
+def _bench_services(repeticoes: int, rnd, casos) -> dict:
+    from app.db.session import SessionLocal
+
+    resultados = {}
+    for nome in casos:
+        peso, preparo, chamada = SERVICE_CASES[nome]
+        amostras = []
+        for _ in range(_repeticoes(peso, repeticoes) + 1):  # +1 de aquecimento
+            db = SessionLocal()
+            try:
+                args = preparo(db, rnd)
+                inicio = time.perf_counter()
+                chamada(db, *args)
+                amostras.append((time.perf_counter() - inicio) * 1000)
+            finally:
+                db.close()
+        resultados[nome] = _resumir(amostras[1:])
+    return resultados
+
+
+def _bench_http(repeticoes: int, rnd, casos) -> dict:
+    from fastapi.testclient import TestClient
+    from app.db.session import SessionLocal
+    from app.main import app
+
+    with SessionLocal() as db:
+        pedido_id, dono = _pedido(db, rnd)
+        pedidos = db.scalars(select(Pedido.id).where(Pedido.usuario == dono.id).limit(200)).all()
+        maximo = db.scalar(select(func.max(Pedido.id)))
+
+    resultados = {}
+    with TestClient(app) as client:
+        def _token(email):
+            resposta = client.post("/auth/sign-in-form", data={"username": email, "password": SENHA})
+            resposta.raise_for_status()
+            return {"Authorization": f"Bearer {resposta.json()['access_token']}"}
+
+        contexto = {
+            "email": user_email(dono.id),
+            "usuario": _token(user_email(dono.id)),
+            "admin": _token(ADMIN_EMAIL),
+            "pedidos": pedidos,
+            "maximo": maximo,
+        }
+        for nome in casos:
+            peso, preparo, chamada = HTTP_CASES[nome]
+            amostras = []
+            for _ in range(_repeticoes(peso, repeticoes) + 1):
+                args = preparo(client, rnd, contexto)
+                inicio = time.perf_counter()
+                resposta = chamada(client, contexto, *args)
+                amostras.append((time.perf_counter() - inicio) * 1000)
+                if resposta.status_code >= 400:
+                    raise RuntimeError(f"{nome}: {resposta.status_code} {resposta.text}")
+            resultados[nome] = _resumir(amostras[1:])
+    return resultados
+
+
+def _worker(repeticoes: int, filtro: str, http: bool):
+    from app.db.session import dispose_engines
+
+    rnd = random.Random(7)
+    casos = [nome for nome in SERVICE_CASES if filtro in nome]
+    resultados = _bench_services(repeticoes, rnd, casos)
+    if http:
+        casos = [nome for nome in HTTP_CASES if filtro in nome]
+        resultados.update(_bench_http(repeticoes, rnd, casos))
+    asyncio.run(dispose_engines())
+    print(json.dumps(resultados))
+
+
+# -------------------------------
+# Relatório
+# -------------------------------
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(anterior: dict, atual: dict, tolerancia: float) -> list:
+    """
+    Casos cujo p50 piorou mais que a tolerância (ex: 0.2 = 20%).
+    """
+    regressoes = []
+    print(f"\n{'caso':<50}{'antes p50':>12}{'agora p50':>12}{'variação':>11}")
+    for nome, resultado in atual["resultados"].items():
+        antes = anterior["resultados"].get(nome)
+        if antes is None:
+            continue
+        variacao = resultado["p50_ms"] / antes["p50_ms"] - 1 if antes["p50_ms"] else 0.0
+        marca = "  <-- regressão" if variacao > tolerancia else ""
+        print(f"{nome:<50}{antes['p50_ms']:>12.3f}{resultado['p50_ms']:>12.3f}{variacao:>+10.0%}{marca}")
+        if marca:
+            regressoes.append(nome)
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="Banco a usar (padrão: SQLite temporário)")
+    parser.add_argument("--sem-seed", action="store_true", help="Usa os dados já existentes em --url")
+    parser.add_argument("--usuarios", type=int, default=1_000)
+    parser.add_argument("--pedidos", type=int, default=100_000)
+    parser.add_argument("--itens", type=int, default=2)
+    parser.add_argument("--repeticoes", type=int, default=50)
+    parser.add_argument("--filtro", default="", help="Só os casos cujo nome contém o texto")
+    parser.add_argument("--sem-http", action="store_true")
+    parser.add_argument("--saida", default="bench-report.json")
+    parser.add_argument("--comparar", help="Relatório anterior para comparação")
+    parser.add_argument("--tolerancia", type=float, default=0.2)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args.repeticoes, args.filtro, not args.sem_http)
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        dados = None
+        if not args.sem_seed:
+            print(f"Populando {args.pedidos} pedidos / {args.usuarios} usuários...")
+            dados = seed_database(url, args.usuarios, args.pedidos, args.itens)
+
+        extra = ["--sem-http"] if args.sem_http else []
+        resultados = run_worker(
+            "benchmarks.bench_suite",
+            {"DATABASE_URL": url},
+            "--repeticoes", args.repeticoes, "--filtro", args.filtro, *extra
+        )
+
+    relatorio = {
+        "gerado_em": datetime.now(timezone.utc).isoformat(),
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "config": {
+            "banco": url.split(":", 1)[0] if args.url else "sqlite (temporário)",
+            "db_async": os.environ.get("DB_ASYNC", "true"),
+            "repeticoes": args.repeticoes,
+        },
+        "dados": dados,
+        "resultados": resultados,
+    }
+    with open(args.saida, "w") as arquivo:
+        json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+
+    print(f"\n{'caso':<50}{'n':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for nome, resultado in resultados.items():
+        print(
+            f"{nome:<50}{resultado['n']:>5}{resultado['p50_ms']:>10.3f}"
+            f"{resultado['p95_ms']:>10.3f}{resultado['p99_ms']:>10.3f}"
+        )
+    print(f"\nRelatório: {args.saida}")
+
+    if args.comparar:
+        with open(args.comparar) as arquivo:
+            anterior = json.load(arquivo)
+        regressoes = comparar(anterior, relatorio, args.tolerancia)
+        if regressoes:
+            print(f"\n{len(regressoes)} caso(s) acima da tolerância de {args.tolerancia:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+"""
+Utilitários compartilhados pelos benchmarks.
+"""
+import json
+import os
+import subprocess
+import sys
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    indice = min(int(round(p / 100 * (len(ordenados) - 1))), len(ordenados) - 1)
+    return ordenados[indice]
+
+
+def run_worker(modulo: str, env: dict, *args) -> dict:
+    """
+    Roda `python -m modulo --worker ...` com as variáveis de ambiente dadas
+    (o Settings é lido no import, então cada configuração precisa de um
+    processo novo) e devolve o JSON impresso na última linha.
+    """
+    saida = subprocess.run(
+        [sys.executable, "-m", modulo, "--worker", *map(str, args)],
+        env=dict(os.environ, SECRET_KEY=os.environ.get("SECRET_KEY", "bench"), **env),
+        capture_output=True, text=True,
+    )
+    if saida.returncode != 0:
+        raise RuntimeError(saida.stderr)
+    return json.loads(saida.stdout.strip().splitlines()[-1])
@@ -0,0 +1,410 @@
+"""
+Teste de carga do ciclo de vida dos pedidos.
+
+Usuários virtuais (tarefas asyncio) repetem cenários sorteados por peso
+durante um tempo fixo, com um tempo de "pensar" entre os passos:
+
+    pedido      sign-in -> cria pedido -> adiciona itens -> consulta -> finaliza
+    cancelado   sign-in -> cria pedido com itens -> atualiza itens em lote -> cancela
+    consulta    sign-in -> meus pedidos -> um pedido da página -> resumo
+    admin       sign-in (admin) -> lista pendentes -> relatório
+
+Sem --alvo, roda contra a aplicação ASGI em processo, sobre um banco
+populado por benchmarks.seed (SQLite temporário por padrão). Com --alvo,
+dispara contra um servidor já no ar (ex: uvicorn), cujo banco precisa ter
+sido populado com benchmarks.seed (mesmos e-mails e senha).
+
+Reporta fluxos/s por cenário e, por rota, requisições/s, erros e
+latências p50/p95/p99.
+
+Uso:
+    python -m benchmarks.load_test --vus 20 --duracao 30 --pensar 0.5
+    python -m benchmarks.load_test --alvo http://127.0.0.1:8000 --usuarios 1000 --mix pedido=1
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import httpx  # noqa: E402
+
+from benchmarks.common import percentil, run_worker  # noqa: E402
+from benchmarks.seed import ADMIN_EMAIL, PRECOS, SABORES, SENHA, user_email  # noqa: E402
+
+MIX_PADRAO = "pedido=5,cancelado=1,consulta=3,admin=1"
+
+
+class FluxoInterrompido(Exception):
+    """
+    Um passo do cenário falhou; o restante do fluxo é abandonado.
+    """
+
+
+# -------------------------------
+# Coleta das medições
+# -------------------------------
+class Coleta:
+    """
+    Latências e erros por rota e fluxos concluídos por cenário.
+    Só registra com `medindo` ligado (fora do aquecimento).
+    """
+
+    def __init__(self):
+        self.medindo = False
+        self.latencias = defaultdict(list)
+        self.erros = defaultdict(int)
+        self.fluxos = defaultdict(int)
+        self.falhas = defaultdict(int)
+
+    def requisicao(self, rota: str, segundos: float, ok: bool):
+        if not self.medindo:
+            return
+        self.latencias[rota].append(segundos * 1000)
+        if not ok:
+            self.erros[rota] += 1
+
+    def fluxo(self, cenario: str, ok: bool):
+        if not self.medindo:
+            return
+        if ok:
+            self.fluxos[cenario] += 1
+        else:
+            self.falhas[cenario] += 1
+
+    def resumo(self, duracao: float) -> dict:
+        concluidos = sum(self.fluxos.values())
+        requisicoes = sum(len(v) for v in self.latencias.values())
+        return {
+            "duracao_s": round(duracao, 2),
+            "fluxos": concluidos,
+            "fluxos_por_s": round(concluidos / duracao, 2),
+            "requisicoes": requisicoes,
+            "requisicoes_por_s": round(requisicoes / duracao, 2),
+            "cenarios": {
+                cenario: {
+                    "concluidos": self.fluxos[cenario],
+                    "falhas": self.falhas[cenario],
+                    "por_s": round(self.fluxos[cenario] / duracao, 2),
+                }
+                for cenario in sorted(set(self.fluxos) | set(self.falhas))
+            },
+            "rotas": {
+                rota: {
+                    "n": len(amostras),
+                    "erros": self.erros[rota],
+                    "por_s": round(len(amostras) / duracao, 2),
+                    "media_ms": round(statistics.fmean(amostras), 3),
+                    "p50_ms": round(percentil(amostras, 50), 3),
+                    "p95_ms": round(percentil(amostras, 95), 3),
+                    "p99_ms": round(percentil(amostras, 99), 3),
+                    "max_ms": round(max(amostras), 3),
+                }
+                for rota, amostras in sorted(self.latencias.items())
+            },
+        }
+
+
+# -------------------------------
+# Usuário virtual
+# -------------------------------
+class UsuarioVirtual:
+    def __init__(self, client: httpx.AsyncClient, coleta: Coleta, rnd: random.Random, pensar: float, usuarios: int):
+        self.client = client
+        self.coleta = coleta
+        self.rnd = rnd
+        self._pensar = pensar
+        self._usuarios = usuarios
+        self.headers = {}
+
+    async def pensar(self):
+        """
+        Pausa entre passos, exponencial com média `pensar` segundos.
+        """
+        if self._pensar > 0:
+            await asyncio.sleep(self.rnd.expovariate(1 / self._pensar))
+
+    async def chamar(self, metodo: str, rota: str, path: dict = None, **kwargs):
+        """
+        Faz a requisição e registra a latência sob o template da rota
+        (ex: "POST /orders/pedido/finalizar/{pedido_id}").
+        """
+        nome = f"{metodo} {rota}"
+        inicio = time.perf_counter()
+        try:
+            resposta = await self.client.request(
+                metodo, rota.format(**(path or {})), headers=self.headers, **kwargs
+            )
+        except httpx.HTTPError as erro:
+            self.coleta.requisicao(nome, time.perf_counter() - inicio, ok=False)
+            raise FluxoInterrompido(f"{nome}: {erro!r}")
+        ok = resposta.status_code < 400
+        self.coleta.requisicao(nome, time.perf_counter() - inicio, ok)
+        if not ok:
+            raise FluxoInterrompido(f"{nome}: {resposta.status_code} {resposta.text[:200]}")
+        return resposta.json() if resposta.content else None
+
+    async def entrar(self, email: str = None):
+        # Usuário 1 é o admin (benchmarks.seed); clientes são 2..usuarios
+        email = email or user_email(self.rnd.randint(2, self._usuarios))
+        self.headers = {}
+        token = await self.chamar("POST", "/auth/sign-in", json={"email": email, "senha": SENHA})
+        self.headers = {"Authorization": f"Bearer {token['access_token']}"}
+
+    def item(self) -> dict:
+        tamanho = self.rnd.choice(list(PRECOS))
+        return {
+            "quantidade": self.rnd.randint(1, 3),
+            "preco_unitario": PRECOS[tamanho],
+            "sabor": self.rnd.choice(SABORES),
+            "tamanho": tamanho,
+        }
+
+
+# -------------------------------
+# Cenários
+# -------------------------------
+async def cenario_pedido(vu: UsuarioVirtual):
+    await vu.entrar()
+    await vu.pensar()
+    pedido_id = (await vu.chamar("POST", "/orders/pedido"))["pedido_id"]
+    for _ in range(vu.rnd.randint(1, 3)):
+        await vu.pensar()
+        await vu.chamar(
+            "POST", "/orders/pedido/adicionar_item/{pedido_id}", {"pedido_id": pedido_id}, json=vu.item()
+        )
+    await vu.pensar()
+    await vu.chamar("GET", "/orders/pedido/{pedido_id}", {"pedido_id": pedido_id})
+    await vu.pensar()
+    await vu.chamar("POST", "/orders/pedido/finalizar/{pedido_id}", {"pedido_id": pedido_id})
+
+
+async def cenario_cancelado(vu: UsuarioVirtual):
+    await vu.entrar()
+    await vu.pensar()
+    pedido_id = (await vu.chamar(
+        "POST", "/orders/pedido", json={"itens": [vu.item() for _ in range(vu.rnd.randint(1, 3))]}
+    ))["pedido_id"]
+    await vu.pensar()
+    await vu.chamar(
+        "POST", "/orders/pedido/atualizar_itens/{pedido_id}", {"pedido_id": pedido_id},
+        json={"adicionar": [vu.item(), vu.item()]}
+    )
+    await vu.pensar()
+    await vu.chamar("POST", "/orders/pedido/cancelar/{pedido_id}", {"pedido_id": pedido_id})
+
+
+async def cenario_consulta(vu: UsuarioVirtual):
+    await vu.entrar()
+    await vu.pensar()
+    pagina = await vu.chamar("GET", "/orders/meus_pedidos", params={"limite": 20})
+    if pagina["pedidos"]:
+        await vu.pensar()
+        pedido_id = vu.rnd.choice(pagina["pedidos"])["id"]
+        await vu.chamar("GET", "/orders/pedido/{pedido_id}", {"pedido_id": pedido_id})
+    await vu.pensar()
+    await vu.chamar("GET", "/orders/resumo")
+
+
+async def cenario_admin(vu: UsuarioVirtual):
+    await vu.entrar(ADMIN_EMAIL)
+    await vu.pensar()
+    await vu.chamar("GET", "/orders/listar", params={"status": "PENDENTE", "limite": 50})
+    await vu.pensar()
+    await vu.chamar("GET", "/orders/relatorio")
+
+
+CENARIOS = {
+    "pedido": cenario_pedido,
+    "cancelado": cenario_cancelado,
+    "consulta": cenario_consulta,
+    "admin": cenario_admin,
+}
+
+
+def parse_mix(texto: str) -> dict:
+    """
+    "pedido=5,consulta=3" -> {"pedido": 5.0, "consulta": 3.0}
+    """
+    mix = {}
+    for parte in filter(None, (p.strip() for p in texto.split(","))):
+        nome, _, peso = parte.partition("=")
+        if nome not in CENARIOS:
+            raise ValueError(f"cenário desconhecido: {nome} (opções: {', '.join(CENARIOS)})")
+        mix[nome] = float(peso or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("o mix precisa de ao menos um cenário com peso positivo")
+    return mix
+
+
+# -------------------------------
+# Execução
+# -------------------------------
+async def run_load(
+    client: httpx.AsyncClient,
+    vus: int,
+    duracao: float,
+    pensar: float,
+    mix: dict,
+    usuarios: int,
+    aquecimento: float = 0,
+    semente: int = 42
+) -> dict:
+    """
+    Roda `vus` usuários virtuais em laço fechado por aquecimento + duracao
+    segundos; só o intervalo após o aquecimento entra no resumo.
+    """
+    coleta = Coleta()
+    nomes, pesos = list(mix), list(mix.values())
+    fim = time.perf_counter() + aquecimento + duracao
+    erros_exemplo = []
+
+    async def _vu(indice: int):
+        vu = UsuarioVirtual(client, coleta, random.Random(semente + indice), pensar, usuarios)
+        while time.perf_counter() < fim:
+            cenario = vu.rnd.choices(nomes, pesos)[0]
+            try:
+                await CENARIOS[cenario](vu)
+            except FluxoInterrompido as erro:
+                coleta.fluxo(cenario, ok=False)
+                if len(erros_exemplo) < 5:
+                    erros_exemplo.append(str(erro))
+            else:
+                coleta.fluxo(cenario, ok=True)
+
+    tarefas = [asyncio.create_task(_vu(i)) for i in range(vus)]
+    await asyncio.sleep(aquecimento)
+    coleta.medindo = True
+    inicio = time.perf_counter()
+    await asyncio.gather(*tarefas)
+    # Fluxos em andamento no fim do prazo ainda terminam e contam
+    resultado = coleta.resumo(time.perf_counter() - inicio)
+    resultado["erros_exemplo"] = erros_exemplo
+    return resultado
+
+
+async def _carga_asgi(args) -> dict:
+    from app.db.session import dispose_engines
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=60) as client:
+            return await run_load(
+                client, args.vus, args.duracao, args.pensar, parse_mix(args.mix),
+                args.usuarios, args.aquecimento, args.semente
+            )
+    finally:
+        await dispose_engines()
+
+
+async def _carga_http(args) -> dict:
+    limites = httpx.Limits(max_connections=args.vus, max_keepalive_connections=args.vus)
+    async with httpx.AsyncClient(base_url=args.alvo, timeout=60, limits=limites) as client:
+        return await run_load(
+            client, args.vus, args.duracao, args.pensar, parse_mix(args.mix),
+            args.usuarios, args.aquecimento, args.semente
+        )
+
+
+def _imprimir(resultado: dict):
+    print(
+        f"\n{resultado['fluxos']} fluxos em {resultado['duracao_s']:.1f}s: "
+        f"{resultado['fluxos_por_s']:.2f} fluxos/s, {resultado['requisicoes_por_s']:.1f} req/s"
+    )
+    print(f"\n{'cenário':<12}{'concluídos':>12}{'falhas':>8}{'por s':>9}")
+    for cenario, r in resultado["cenarios"].items():
+        print(f"{cenario:<12}{r['concluidos']:>12}{r['falhas']:>8}{r['por_s']:>9.2f}")
+    print(f"\n{'rota':<50}{'n':>7}{'erros':>7}{'req/s':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for rota, r in resultado["rotas"].items():
+        print(
+            f"{rota:<50}{r['n']:>7}{r['erros']:>7}{r['por_s']:>8.1f}"
+            f"{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}"
+        )
+    for erro in resultado["erros_exemplo"]:
+        print(f"  erro: {erro}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--alvo", help="URL de um servidor no ar (padrão: ASGI em processo)")
+    parser.add_argument("--url", help="Banco do modo em processo (padrão: SQLite temporário)")
+    parser.add_argument("--sem-seed", action="store_true", help="Usa os dados já existentes em --url")
+    parser.add_argument("--usuarios", type=int, default=1_000, help="Usuários populados (ids 2..N fazem pedidos)")
+    parser.add_argument("--pedidos", type=int, default=20_000, help="Pedidos populados no modo em processo")
+    parser.add_argument("--vus", type=int, default=10, help="Usuários virtuais simultâneos")
+    parser.add_argument("--duracao", type=float, default=30, help="Segundos medidos")
+    parser.add_argument("--aquecimento", type=float, default=3, help="Segundos iniciais descartados")
+    parser.add_argument("--pensar", type=float, default=0, help="Pausa média entre passos (s); 0 desliga")
+    parser.add_argument("--mix", default=MIX_PADRAO, help=f"Pesos dos cenários (padrão: {MIX_PADRAO})")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", help="Grava o resultado em JSON")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    try:
+        parse_mix(args.mix)
+    except ValueError as erro:
+        parser.error(str(erro))
+
+    if args.worker:
+        print(json.dumps(asyncio.run(_carga_asgi(args))))
+        return 0
+
+    print(
+        f"{args.vus} usuários virtuais, {args.duracao:.0f}s (+{args.aquecimento:.0f}s de aquecimento), "
+        f"pensar {args.pensar}s, mix {args.mix}"
+    )
+    if args.alvo:
+        resultado = asyncio.run(_carga_http(args))
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            url = args.url or f"sqlite:///{os.path.join(tmp, 'load.db')}"
+            if not args.sem_seed:
+                from benchmarks.seed import seed_database
+
+                print(f"Populando {args.pedidos} pedidos / {args.usuarios} usuários...")
+                seed_database(url, args.usuarios, args.pedidos)
+            resultado = run_worker(
+                "benchmarks.load_test",
+                {"DATABASE_URL": url},
+                "--usuarios", args.usuarios,
+                "--vus", args.vus,
+                "--duracao", args.duracao,
+                "--aquecimento", args.aquecimento,
+                "--pensar", args.pensar,
+                "--mix", args.mix,
+                "--semente", args.semente,
+            )
+
+    _imprimir(resultado)
+    if args.saida:
+        with open(args.saida, "w") as arquivo:
+            json.dump({
+                "gerado_em": datetime.now(timezone.utc).isoformat(),
+                "alvo": args.alvo or "asgi",
+                "config": {
+                    "vus": args.vus,
+                    "duracao": args.duracao,
+                    "aquecimento": args.aquecimento,
+                    "pensar": args.pensar,
+                    "mix": parse_mix(args.mix),
+                    "db_async": os.environ.get("DB_ASYNC", "true"),
+                },
+                **resultado,
+            }, arquivo, indent=2, ensure_ascii=False)
+        print(f"\nResultado: {args.saida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
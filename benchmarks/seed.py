@@ -0,0 +1,167 @@
+"""
+Gerador de dados sintéticos para benchmarks.
+
+Cria usuários, pedidos e itens em lote (executemany via SQLAlchemy Core,
+um commit por lote), em qualquer banco suportado pela API, e recalcula
+a tabela de resumo. O usuário 1 é admin; todos usam a senha SENHA.
+
+Uso:
+    python -m benchmarks.seed --url sqlite:///bench.db --usuarios 10000 --pedidos 1000000 --itens 2
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, func, insert, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.security import hash_password  # noqa: E402
+from app.models.base import Base  # noqa: E402
+from app.models.order import Pedido, ItemPedido  # noqa: E402
+from app.models.user import Usuario  # noqa: E402
+from app.services.summary_service import rebuild_summaries  # noqa: E402
+
+SENHA = "bench123"
+ADMIN_EMAIL = "admin@bench.dev"
+
+# Histórico real: a maioria finalizada, poucos pendentes na fila do admin
+STATUS = ["PENDENTE", "CANCELADO", "FINALIZADO"]
+STATUS_PESOS = [2, 8, 90]
+SABORES = ["CALABRESA", "MARGUERITA", "FRANGO_COM_CATUPIRY", "PORTUGUESA", "QUATRO_QUEIJOS"]
+PRECOS = {"PEQUENA": 30.0, "MEDIA": 45.0, "GRANDE": 60.0}
+
+
+def user_email(usuario_id: int) -> str:
+    return ADMIN_EMAIL if usuario_id == 1 else f"u{usuario_id}@bench.dev"
+
+
+def _sqlite_bulk_pragmas(conn):
+    # Carga descartável: sem fsync e sem journal em disco
+    conn.exec_driver_sql("PRAGMA synchronous=OFF")
+    conn.exec_driver_sql("PRAGMA journal_mode=MEMORY")
+
+
+def seed_database(
+    url: str,
+    usuarios: int,
+    pedidos: int,
+    itens: int = 2,
+    lote: int = 50_000,
+    semente: int = 42
+) -> dict:
+    """
+    Popula um banco vazio e devolve contagens e tempos.
+
+    Os ids são atribuídos aqui (banco vazio), o que permite gerar os itens
+    de cada lote sem RETURNING.
+    """
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    rnd = random.Random(semente)
+    inicio = time.perf_counter()
+    agora = datetime.now()
+
+    with engine.begin() as conn:
+        if conn.execute(select(func.count()).select_from(Usuario)).scalar():
+            raise RuntimeError(f"{url} já tem dados; use um banco vazio")
+
+        # bcrypt uma única vez: todos os usuários compartilham o hash
+        senha = hash_password(SENHA)
+        for primeiro in range(1, usuarios + 1, lote):
+            conn.execute(insert(Usuario.__table__), [
+                {
+                    "id": i,
+                    "nome": f"Usuário {i}",
+                    "email": user_email(i),
+                    "senha": senha,
+                    "ativo": True,
+                    "admin": i == 1,
+                }
+                for i in range(primeiro, min(primeiro + lote, usuarios + 1))
+            ])
+
+    item_id = 0
+    for primeiro in range(1, pedidos + 1, lote):
+        linhas_pedidos, linhas_itens = [], []
+        for pedido_id in range(primeiro, min(primeiro + lote, pedidos + 1)):
+            preco = 0.0
+            for _ in range(itens):
+                item_id += 1
+                tamanho = rnd.choice(list(PRECOS))
+                quantidade = rnd.randint(1, 3)
+                preco += quantidade * PRECOS[tamanho]
+                linhas_itens.append({
+                    "id": item_id,
+                    "pedido": pedido_id,
+                    "quantidade": quantidade,
+                    "preco_unitario": PRECOS[tamanho],
+                    "sabor": rnd.choice(SABORES),
+                    "tamanho": tamanho,
+                })
+            linhas_pedidos.append({
+                "id": pedido_id,
+                "status": rnd.choices(STATUS, STATUS_PESOS)[0],
+                "usuario_id": rnd.randint(1, usuarios),
+                "preco": preco,
+                "versao": 1,
+                "criado_em": agora - timedelta(minutes=rnd.randint(0, 525_600)),
+            })
+
+        with engine.begin() as conn:
+            if engine.dialect.name == "sqlite":
+                _sqlite_bulk_pragmas(conn)
+            conn.execute(insert(Pedido.__table__), linhas_pedidos)
+            if linhas_itens:
+                conn.execute(insert(ItemPedido.__table__), linhas_itens)
+
+    carga = time.perf_counter() - inicio
+
+    with sessionmaker(bind=engine)() as db:
+        rebuild_summaries(db, lote=lote)
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            # ids explícitos não avançam as sequências
+            for tabela in ("usuarios", "pedidos", "itens_pedidos"):
+                conn.exec_driver_sql(
+                    f"SELECT setval(pg_get_serial_sequence('{tabela}', 'id'), "
+                    f"(SELECT MAX(id) FROM {tabela}))"
+                )
+        if engine.dialect.name in ("sqlite", "postgresql"):
+            conn.exec_driver_sql("ANALYZE")
+    engine.dispose()
+
+    return {
+        "usuarios": usuarios,
+        "pedidos": pedidos,
+        "itens": pedidos * itens,
+        "carga_s": round(carga, 2),
+        "total_s": round(time.perf_counter() - inicio, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--usuarios", type=int, default=1_000)
+    parser.add_argument("--pedidos", type=int, default=100_000)
+    parser.add_argument("--itens", type=int, default=2, help="Itens por pedido")
+    parser.add_argument("--lote", type=int, default=50_000)
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+
+    resultado = seed_database(
+        args.url, args.usuarios, args.pedidos, args.itens, args.lote, args.semente
+    )
+    print(
+        f"{resultado['usuarios']} usuários, {resultado['pedidos']} pedidos, "
+        f"{resultado['itens']} itens em {resultado['total_s']:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
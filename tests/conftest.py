@@ -1,13 +1,18 @@
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from fastapi.testclient import TestClient
 from app.main import app
-from app.db.session import get_session
+from app.db.session import get_session, get_async_session
 from app.models.base import Base
 from app.models.user import Usuario
 from app.models.order import Pedido, ItemPedido
 from app.core.security import hash_password
+from app.core.deps import user_cache
+from app.api.routes.order_routes import order_cache
+from app.services.analytics_service import analytics_cache
 
 # Banco de teste
 SQLALCHEMY_DATABASE_URL = "sqlite:///./banco.db"
@@ -18,6 +23,18 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Mesmo banco pelo driver assíncrono. NullPool: cada TestClient roda em um
+# event loop próprio, e conexões aiosqlite não podem passar de um loop a outro
+async_engine = create_async_engine(
+    "sqlite+aiosqlite:///./banco.db",
+    poolclass=NullPool
+)
+AsyncTestingSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # ---------------------------
 # Fixture de banco de dados
 # ---------------------------
@@ -25,6 +42,9 @@ TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engin
 def db_session():
     # Cria todas as tabelas antes do teste
     Base.metadata.create_all(bind=engine)
+    user_cache.clear()
+    order_cache.clear()
+    analytics_cache.clear()
     session = TestingSessionLocal()
     try:
         yield session
@@ -32,16 +52,39 @@ def db_session():
         session.close()
         Base.metadata.drop_all(bind=engine)
 
+# ---------------------------
+# Fábrica de AsyncSession no banco de teste
+# ---------------------------
+@pytest.fixture
+def async_session_factory(db_session):
+    return AsyncTestingSessionLocal
+
+# ---------------------------
+# Sessão entregue às rotas
+# "sync": a Session do db_session; "async": uma AsyncSession (aiosqlite)
+# no mesmo banco. Módulos de teste podem sobrescrever esta fixture com
+# params=["sync", "async"] para rodar as rotas pelos dois caminhos.
+# ---------------------------
+@pytest.fixture
+def session_mode():
+    return "sync"
+
 # ---------------------------
 # Fixture de TestClient
 # ---------------------------
 @pytest.fixture
-def client(db_session):
+def client(db_session, session_mode):
     # Override do get_session
     def override_get_session():
         yield db_session
 
-    app.dependency_overrides[get_session] = override_get_session
+    async def override_get_async_session():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    override = override_get_async_session if session_mode == "async" else override_get_session
+    app.dependency_overrides[get_session] = override
+    app.dependency_overrides[get_async_session] = override
 
     with TestClient(app) as c:
         yield c
@@ -1,5 +1,11 @@
 import pytest
 
+
+# Rotas pelos dois caminhos: Session (threadpool) e AsyncSession (aiosqlite)
+@pytest.fixture(params=["sync", "async"])
+def session_mode(request):
+    return request.param
+
 # ----------------------------------------
 # Cadastro de usuário
 # ----------------------------------------
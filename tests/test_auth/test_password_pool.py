@@ -0,0 +1,91 @@
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.password_pool import PasswordPool, password_pool
+from app.core.security import hash_password
+from app.core.exceptions import TooManyRequestsException
+
+# ----------------------------------------
+# Testes do pool de processos do bcrypt
+# ----------------------------------------
+
+# ----------------------------------------
+# Hash e verificação pelo pool
+# ----------------------------------------
+def test_pool_hash_and_verify():
+    pool = PasswordPool(workers=1, max_queue=1)
+    try:
+        hashed = pool.hash("123456")
+        assert pool.verify("123456", hashed) is True
+        assert pool.verify("errada", hashed) is False
+        assert pool.stats()["completed"] == 3
+    finally:
+        pool.shutdown()
+
+
+# ----------------------------------------
+# Fila cheia
+# Deve rejeitar imediatamente com 429, sem enfileirar
+# ----------------------------------------
+def test_pool_rejects_when_full():
+    pool = PasswordPool(workers=1, max_queue=0)
+    try:
+        ocupado = pool._submit(time.sleep, 0.5)
+        with pytest.raises(TooManyRequestsException) as exc:
+            pool.verify("123456", hash_password("123456"))
+        assert exc.value.status_code == 429
+        assert pool.stats()["rejected"] == 1
+        ocupado.result()
+    finally:
+        pool.shutdown()
+
+
+# ----------------------------------------
+# Shutdown com operação em andamento
+# Deve esperar a operação terminar, sem travar no lock dos callbacks
+# ----------------------------------------
+def test_pool_shutdown_with_job_in_flight():
+    pool = PasswordPool(workers=1, max_queue=1)
+    pool.hash("123456")  # processo já no ar
+    em_andamento = pool._submit(time.sleep, 0.5)
+
+    encerrado = threading.Thread(target=pool.shutdown)
+    encerrado.start()
+    encerrado.join(timeout=10)
+
+    assert not encerrado.is_alive()
+    assert em_andamento.done()
+    assert pool.stats()["in_flight"] == 0
+
+
+# ----------------------------------------
+# Login com a fila cheia
+# A rota deve responder 429 com Retry-After
+# ----------------------------------------
+def test_sign_in_returns_429_when_pool_full(client, user, monkeypatch):
+    def _cheio(*args):
+        raise TooManyRequestsException()
+
+    monkeypatch.setattr(password_pool, "_submit", _cheio)
+
+    response = client.post(
+        "/auth/sign-in",
+        json={"email": user.email, "senha": "123456"}
+    )
+
+    assert response.status_code == 429
+    assert "Retry-After" in response.headers
+
+
+# ----------------------------------------
+# Shutdown da aplicação
+# Deve encerrar os processos do bcrypt
+# ----------------------------------------
+def test_lifespan_shuts_down_pool(db_session, user):
+    with TestClient(app) as c:
+        c.post("/auth/sign-in", json={"email": user.email, "senha": "123456"})
+        assert password_pool._executor is not None
+
+    assert password_pool._executor is None
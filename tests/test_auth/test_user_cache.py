@@ -0,0 +1,99 @@
+import time
+from sqlalchemy import event
+from app.core.cache import TTLCache
+from app.core.deps import user_cache
+from app.core.config import settings
+
+# ----------------------------------------
+# Testes do cache de usuários autenticados
+# ----------------------------------------
+
+# ----------------------------------------
+# Requisições autenticadas repetidas
+# Apenas a primeira deve consultar a tabela usuarios
+# ----------------------------------------
+def test_current_user_cached(client, auth_headers, db_session):
+    consultas = []
+
+    def _before_cursor_execute(conn, cursor, statement, *args):
+        if "FROM usuarios" in statement:
+            consultas.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        for _ in range(5):
+            response = client.get("/orders/", headers=auth_headers)
+            assert response.status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+
+    assert len(consultas) == 1
+    assert user_cache.stats()["hits"] >= 4
+
+
+# ----------------------------------------
+# Alteração do usuário
+# Deve invalidar a entrada do cache
+# ----------------------------------------
+def test_user_update_invalidates_cache(client, auth_headers, db_session, user):
+    client.get("/orders/", headers=auth_headers)
+    assert user_cache.get(user.id) is not None
+
+    user.admin = True
+    db_session.commit()
+
+    assert user_cache.get(user.id) is None
+
+
+# ----------------------------------------
+# Expiração por tempo e descarte LRU
+# ----------------------------------------
+def test_ttl_cache_expiration_and_eviction():
+    cache = TTLCache(maxsize=2, ttl=0.05)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)  # descarta "b", o menos usado
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 2
+
+
+# ----------------------------------------
+# Modo stateless (claims no JWT)
+# Não deve consultar usuarios até a versão do token ser incrementada
+# ----------------------------------------
+def test_stateless_claims_skip_db(client, user, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "JWT_STATELESS_AUTH", True)
+    response = client.post(
+        "/auth/sign-in",
+        json={"email": user.email, "senha": "123456"}
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    consultas = []
+
+    def _before_cursor_execute(conn, cursor, statement, *args):
+        if "FROM usuarios" in statement:
+            consultas.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        assert client.get("/orders/", headers=headers).status_code == 200
+        assert consultas == []
+
+        # Promovido a admin: o token antigo deixa de ser confiável
+        user.admin = True
+        db_session.commit()
+        assert client.get("/orders/", headers=headers).status_code == 200
+        assert len(consultas) == 1
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+
+    assert user_cache.get(user.id).admin is True
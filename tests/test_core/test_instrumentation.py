@@ -0,0 +1,65 @@
+import json
+import logging
+import re
+import pytest
+from app.core.instrumentation import instrument_engine
+from app.core.middlewares import request_logger
+
+# ----------------------------------------
+# Testes da instrumentação por requisição
+# ----------------------------------------
+
+
+def _server_timing(response) -> dict:
+    return {
+        nome: float(duracao)
+        for nome, duracao in re.findall(r"(\w+);dur=([\d.]+)", response.headers["server-timing"])
+    }
+
+
+@pytest.fixture(autouse=True)
+def instrumented_engine(db_session):
+    # Engine de teste do conftest (o da aplicação já vem instrumentado)
+    instrument_engine(db_session.get_bind())
+
+
+# ----------------------------------------
+# Consultar pedidos
+# Deve informar tempo e statements do banco no header e no log
+# ----------------------------------------
+def test_server_timing_and_log(client, auth_headers):
+    linhas = []
+    handler = logging.Handler()
+    handler.emit = lambda record: linhas.append(json.loads(record.getMessage()))
+    request_logger.addHandler(handler)
+    try:
+        client.post("/orders/pedido", headers=auth_headers)
+        response = client.get("/orders/pedido/1", headers=auth_headers)
+    finally:
+        request_logger.removeHandler(handler)
+
+    assert response.status_code == 200
+    tempos = _server_timing(response)
+    assert set(tempos) == {"app", "db", "bcrypt"}
+    assert 'desc="' in response.headers["server-timing"]
+
+    log = linhas[-1]
+    assert log["route"] == "/orders/pedido/{pedido_id}"
+    assert log["status"] == 200
+    assert log["db_statements"] >= 1
+    assert log["duration_ms"] >= log["db_ms"]
+
+
+# ----------------------------------------
+# Login
+# O tempo do bcrypt aparece separado
+# ----------------------------------------
+def test_server_timing_bcrypt(client, user):
+    response = client.post(
+        "/auth/sign-in-form",
+        data={"username": user.email, "password": "123456"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"}
+    )
+
+    assert response.status_code == 200
+    assert _server_timing(response)["bcrypt"] > 0
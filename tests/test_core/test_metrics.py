@@ -0,0 +1,63 @@
+from app.core.metrics import MetricsRegistry
+
+# ----------------------------------------
+# Testes das métricas (Prometheus)
+# ----------------------------------------
+
+
+def _amostras(texto: str) -> dict:
+    return {
+        linha.rsplit(" ", 1)[0]: float(linha.rsplit(" ", 1)[1])
+        for linha in texto.splitlines()
+        if linha and not linha.startswith("#")
+    }
+
+
+# ----------------------------------------
+# Formato texto
+# Histograma cumulativo com _sum/_count e labels escapados
+# ----------------------------------------
+def test_registry_render():
+    registro = MetricsRegistry()
+    latencia = registro.histogram("latencia_seconds", "Latência.", ("route",), buckets=(0.1, 1))
+    falhas = registro.counter("falhas_total", "Falhas.", ("route",))
+    em_andamento = registro.gauge("em_andamento", "Em andamento.")
+
+    for valor in (0.05, 0.1, 0.5, 3):
+        latencia.observe(valor, "/pedido/{id}")
+    falhas.inc('a"b')
+
+    texto = registro.render()
+    amostras = _amostras(texto)
+
+    assert "# TYPE latencia_seconds histogram" in texto
+    assert amostras['latencia_seconds_bucket{route="/pedido/{id}",le="0.1"}'] == 2
+    assert amostras['latencia_seconds_bucket{route="/pedido/{id}",le="1.0"}'] == 3
+    assert amostras['latencia_seconds_bucket{route="/pedido/{id}",le="+Inf"}'] == 4
+    assert amostras['latencia_seconds_count{route="/pedido/{id}"}'] == 4
+    assert amostras['latencia_seconds_sum{route="/pedido/{id}"}'] == 3.65
+    assert amostras['falhas_total{route="a\\"b"}'] == 1
+    assert amostras["em_andamento"] == 0
+
+
+# ----------------------------------------
+# Endpoint /metrics
+# Latência por template de rota, pool e falhas de autenticação
+# ----------------------------------------
+def test_metrics_endpoint(client, auth_headers):
+    client.get("/orders/pedido/123", headers=auth_headers)
+    client.get("/orders/meus_pedidos", headers={"Authorization": "Bearer invalido"})
+
+    response = client.get("/metrics")
+    amostras = _amostras(response.text)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert amostras[
+        'delivery_http_request_duration_seconds_count'
+        '{method="GET",route="/orders/pedido/{pedido_id}",status="404"}'
+    ] >= 1
+    assert amostras['delivery_auth_failures_total{route="/orders/meus_pedidos"}'] >= 1
+    assert 'delivery_db_pool_checked_out{engine="primario"}' in amostras
+    assert 'delivery_cache_hit_ratio{cache="usuarios"}' in amostras
+    assert amostras["delivery_http_requests_in_flight"] >= 1
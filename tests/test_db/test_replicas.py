@@ -0,0 +1,76 @@
+import asyncio
+import pytest
+from sqlalchemy import create_engine
+from app.api.routes import order_routes
+from app.core import deps
+from app.db.session import ReadReplicas
+from app.models.base import Base
+from app.models.order import Pedido
+
+# ----------------------------------------
+# Testes do roteamento para réplicas de leitura
+# ----------------------------------------
+
+# ----------------------------------------
+# Réplica: outro SQLite com o mesmo schema e sem dados
+# (simula uma réplica atrasada em relação ao primário)
+# ----------------------------------------
+@pytest.fixture
+def replicas(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path}/replica.db"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    replicas = ReadReplicas([url], sticky_seconds=60)
+    monkeypatch.setattr(deps, "read_replicas", replicas)
+    monkeypatch.setattr(order_routes, "read_replicas", replicas)
+    yield replicas
+    asyncio.run(replicas.dispose())
+
+
+# ----------------------------------------
+# Sem réplicas configuradas
+# Deve usar sempre o primário
+# ----------------------------------------
+def test_without_replicas_uses_primary():
+    replicas = ReadReplicas([], sticky_seconds=60)
+    assert replicas.use_primary(1)
+
+
+# ----------------------------------------
+# Escrita recente do usuário
+# Deve fixar só esse usuário no primário
+# ----------------------------------------
+def test_mark_write_sticks_user_to_primary(replicas):
+    assert not replicas.use_primary(1)
+    replicas.mark_write(1)
+    assert replicas.use_primary(1)
+    assert not replicas.use_primary(2)
+
+
+# ----------------------------------------
+# Leituras de pedidos
+# Devem ir para a réplica
+# ----------------------------------------
+def test_reads_go_to_replica(client, db_session, user, auth_headers, replicas):
+    db_session.add(Pedido(usuario=user.id))
+    db_session.commit()
+
+    response = client.get("/orders/meus_pedidos", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json()["pedidos"] == []
+
+
+# ----------------------------------------
+# Leitura logo após uma escrita do usuário
+# Deve vir do primário (read-your-writes)
+# ----------------------------------------
+def test_read_your_writes_after_create(client, user, auth_headers, replicas):
+    pedido_id = client.post("/orders/pedido", headers=auth_headers).json()["pedido_id"]
+
+    response = client.get(f"/orders/pedido/{pedido_id}", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json()["id"] == pedido_id
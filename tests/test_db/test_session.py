@@ -0,0 +1,175 @@
+import asyncio
+import pytest
+from app.core.config import settings
+from app.db import session as session_module
+from app.db.session import build_async_url, run_in_session, run_write, engine_options
+from app.db.sqlite import WriteSerializer, install_sqlite_pragmas, write_serializer
+from app.db.pool import TimedQueuePool, TimedAsyncAdaptedQueuePool, pool_stats
+from sqlalchemy import create_engine, event, select, text
+from app.models.user import Usuario
+
+# ----------------------------------------
+# Testes da camada de sessão (sync / async)
+# ----------------------------------------
+
+# ----------------------------------------
+# Conversão da URL para o driver assíncrono
+# ----------------------------------------
+def test_build_async_url():
+    assert build_async_url("sqlite:///./banco.db") == "sqlite+aiosqlite:///./banco.db"
+    assert (
+        build_async_url("postgresql+psycopg2://u:p@host/db")
+        == "postgresql+asyncpg://u:p@host/db"
+    )
+
+
+# ----------------------------------------
+# Dialeto sem driver assíncrono conhecido
+# Deve lançar ValueError
+# ----------------------------------------
+def test_build_async_url_unknown_dialect():
+    with pytest.raises(ValueError):
+        build_async_url("oracle://u:p@host/db")
+
+
+# ----------------------------------------
+# Executar função síncrona com Session comum
+# Deve rodar no threadpool e devolver o resultado
+# ----------------------------------------
+def test_run_in_session_sync(db_session, user):
+    def _count(db):
+        return db.query(Usuario).count()
+
+    assert asyncio.run(run_in_session(db_session, _count)) == 1
+
+
+# ----------------------------------------
+# SessionLocal com expire_on_commit=False
+# O que o service devolve após o commit é lido sem novo SELECT
+# (que, vindo da rota, rodaria no event loop)
+# ----------------------------------------
+def test_session_local_keeps_state_after_commit(db_session):
+    statements = []
+
+    def _conta(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    db = session_module.SessionLocal()
+    try:
+        novo = Usuario("Outro", "outro@test.com", "x")
+        db.add(novo)
+        db.commit()
+
+        event.listen(session_module.engine, "before_cursor_execute", _conta)
+        try:
+            assert (novo.id, novo.email) == (novo.id, "outro@test.com")
+        finally:
+            event.remove(session_module.engine, "before_cursor_execute", _conta)
+    finally:
+        db.close()
+
+    assert statements == []
+
+
+# ----------------------------------------
+# Opções do engine por dialeto
+# ----------------------------------------
+def test_engine_options_by_dialect():
+    memoria = engine_options("sqlite://")
+    assert "poolclass" not in memoria
+    assert memoria["connect_args"] == {"check_same_thread": False}
+
+    postgres = engine_options("postgresql://u:p@host/db")
+    assert postgres["poolclass"] is TimedQueuePool
+    assert "connect_args" not in postgres
+    assert {"pool_size", "max_overflow", "pool_recycle", "pool_pre_ping"} <= postgres.keys()
+
+    assert engine_options("sqlite+aiosqlite:///x.db", is_async=True)["poolclass"] is TimedAsyncAdaptedQueuePool
+
+
+# ----------------------------------------
+# Métricas de checkout do pool
+# ----------------------------------------
+def test_pool_checkout_metrics(tmp_path):
+    url = f"sqlite:///{tmp_path}/pool.db"
+    engine = create_engine(url, **engine_options(url))
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        stats = pool_stats(engine.pool)
+        assert stats["checked_out"] == 1
+
+    stats = pool_stats(engine.pool)
+    assert stats["checkouts"] == 1
+    assert stats["checked_out"] == 0
+    engine.dispose()
+
+
+# ----------------------------------------
+# PRAGMAs do modo SQLite de produção
+# Cada conexão nova deve sair em WAL com busy_timeout
+# ----------------------------------------
+def test_install_sqlite_pragmas(tmp_path):
+    url = f"sqlite:///{tmp_path}/wal.db"
+    engine = create_engine(url, **engine_options(url))
+    install_sqlite_pragmas(engine)
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == settings.SQLITE_BUSY_TIMEOUT_MS
+    engine.dispose()
+
+
+# ----------------------------------------
+# Fila única de escrita
+# Escritas concorrentes nunca se sobrepõem
+# ----------------------------------------
+def test_write_serializer_one_writer_at_a_time():
+    serializer = WriteSerializer()
+    ativos = []
+    pico = []
+
+    async def _escrita():
+        async with serializer.async_lock():
+            ativos.append(1)
+            pico.append(len(ativos))
+            await asyncio.sleep(0.001)
+            ativos.pop()
+
+    async def _main():
+        await asyncio.gather(*[_escrita() for _ in range(20)])
+
+    asyncio.run(_main())
+    assert max(pico) == 1
+
+
+# ----------------------------------------
+# run_write com serialização ligada (AsyncSession)
+# Deve liberar a transação de leitura antes de entrar na fila
+# ----------------------------------------
+def test_run_write_async_releases_read_transaction(async_session_factory, user, monkeypatch):
+    monkeypatch.setattr(session_module, "SERIALIZE_WRITES", True)
+
+    def _escrita(db):
+        assert write_serializer.async_lock().locked()
+        return db.query(Usuario).count()
+
+    async def _main():
+        async with async_session_factory() as db:
+            await db.execute(select(Usuario.id))
+            assert db.in_transaction()
+            return await run_write(db, _escrita)
+
+    assert asyncio.run(_main()) == 1
+
+
+# ----------------------------------------
+# run_write no modo síncrono
+# Sem fila: não deve segurar uma thread esperando outro escritor
+# ----------------------------------------
+def test_run_write_sync_not_serialized(db_session, user, monkeypatch):
+    monkeypatch.setattr(session_module, "SERIALIZE_WRITES", True)
+
+    async def _main():
+        async with write_serializer.async_lock():
+            return await run_write(db_session, lambda db: db.query(Usuario).count())
+
+    assert asyncio.run(_main()) == 1
@@ -0,0 +1,117 @@
+import contextvars
+import json
+import logging
+import pytest
+from sqlalchemy import text
+from app.core.instrumentation import instrument_engine, start_request_timing
+from app.db.slow_queries import RateLimiter, redact_parameters, slow_query_log, slow_query_logger
+from app.services import auth_service, summary_service
+
+# ----------------------------------------
+# Testes do log de queries lentas
+# ----------------------------------------
+
+
+@pytest.fixture
+def slow_log(db_session, monkeypatch, caplog):
+    # Toda query é "lenta"; os registros chegam pela propagação (caplog)
+    slow_query_log.install(db_session.get_bind())
+    monkeypatch.setattr(slow_query_log, "threshold_ms", 0)
+    monkeypatch.setattr(slow_query_log, "explain", True)
+    monkeypatch.setattr(slow_query_log, "limiter", RateLimiter(100))
+    caplog.set_level(logging.WARNING, logger=slow_query_logger.name)
+
+    def _linhas():
+        return [
+            json.loads(record.getMessage())
+            for record in caplog.records
+            if record.name == slow_query_logger.name
+        ]
+    return _linhas
+
+
+# ----------------------------------------
+# Query lenta de um service
+# Deve registrar SQL, parâmetros redigidos, função e plano
+# ----------------------------------------
+def test_slow_query_logged_with_plan(db_session, user, slow_log):
+    auth_service._get_user_by_email(db_session, user.email)
+
+    log = slow_log()[-1]
+    assert "FROM usuarios" in log["statement"]
+    assert log["caller"].startswith("app.services.auth_service._get_user_by_email:")
+    assert user.email not in json.dumps(log)
+    assert f"<str len={len(user.email)}>" in log["parameters"]
+    assert log["explain"] and any("usuarios" in linha for linha in log["explain"])
+    assert log["suppressed"] == 0
+
+
+# ----------------------------------------
+# Ids e outros números
+# Devem aparecer como estão
+# ----------------------------------------
+def test_numeric_parameters_kept(db_session, user, slow_log):
+    summary_service.get_user_summary(db_session, user)
+
+    log = slow_log()[-1]
+    assert log["caller"].startswith("app.services.summary_service.get_user_summary:")
+    assert user.id in log["parameters"]
+
+
+# ----------------------------------------
+# Abaixo do limite
+# Não deve registrar nada
+# ----------------------------------------
+def test_fast_query_not_logged(db_session, slow_log, monkeypatch):
+    monkeypatch.setattr(slow_query_log, "threshold_ms", 60_000)
+    db_session.execute(text("SELECT 1"))
+
+    assert slow_log() == []
+
+
+# ----------------------------------------
+# Limite por minuto
+# Excedentes são descartados e contados no próximo registro
+# ----------------------------------------
+def test_rate_limited(db_session, slow_log, monkeypatch):
+    limiter = RateLimiter(2)
+    monkeypatch.setattr(slow_query_log, "limiter", limiter)
+
+    for _ in range(5):
+        db_session.execute(text("SELECT 1"))
+    assert len(slow_log()) == 2
+
+    limiter._inicio -= limiter.janela  # próxima janela
+    db_session.execute(text("SELECT 1"))
+    assert len(slow_log()) == 3
+    assert slow_log()[-1]["suppressed"] == 3
+
+
+# ----------------------------------------
+# Tempo da requisição e log de queries lentas
+# Devem usar a mesma medição, com um único par de eventos no engine
+# ----------------------------------------
+def test_shares_request_timing_measurement(db_session, slow_log):
+    engine = db_session.get_bind()
+    instrument_engine(engine)
+
+    def _consulta():
+        timing = start_request_timing()
+        db_session.execute(text("SELECT 1"))
+        return timing
+
+    timing = contextvars.copy_context().run(_consulta)
+
+    assert timing.statements == 1
+    assert slow_log()[-1]["duration_ms"] == round(timing.db_seconds * 1000, 2)
+    assert len(engine.dispatch.before_cursor_execute) == len(engine.dispatch.after_cursor_execute) == 1
+
+
+# ----------------------------------------
+# executemany
+# Deve registrar só a quantidade e o primeiro conjunto, sem EXPLAIN
+# ----------------------------------------
+def test_redact_executemany():
+    redigido = redact_parameters([("a@b.com", 1), ("c@d.com", 2)], executemany=True)
+
+    assert redigido == {"conjuntos": 2, "primeiro": ["<str len=7>", 1]}
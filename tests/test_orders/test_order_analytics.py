@@ -0,0 +1,116 @@
+import asyncio
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.main import app
+from app.models.order import Pedido, ItemPedido
+from app.services import analytics_service
+from app.services.analytics_service import order_analytics
+
+# ----------------------------------------
+# Testes do relatório de pedidos (admin)
+# ----------------------------------------
+
+client = TestClient(app)
+
+
+def _seed(db_session, usuario_id):
+    pedidos = [
+        Pedido(usuario=usuario_id, status="FINALIZADO", preco=70),
+        Pedido(usuario=usuario_id, status="FINALIZADO", preco=25),
+        Pedido(usuario=usuario_id, status="CANCELADO", preco=30),
+        Pedido(usuario=usuario_id, status="PENDENTE", preco=0),
+    ]
+    db_session.add_all(pedidos)
+    db_session.flush()
+    db_session.add_all([
+        ItemPedido(pedidos[0].id, 2, 25, "CALABRESA", "MEDIA"),
+        ItemPedido(pedidos[0].id, 1, 20, "MARGUERITA", "PEQUENA"),
+        ItemPedido(pedidos[1].id, 1, 25, "CALABRESA", "MEDIA"),
+        ItemPedido(pedidos[2].id, 1, 30, "PORTUGUESA", "GRANDE"),
+    ])
+    db_session.commit()
+
+
+# ----------------------------------------
+# Agregação no banco
+# Receita, contagens e combinações por status em duas consultas
+# ----------------------------------------
+def test_order_analytics_groups_by_status(db_session, user):
+    _seed(db_session, user.id)
+    consultas = []
+
+    def _before_cursor_execute(conn, cursor, statement, *args):
+        consultas.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        relatorio = order_analytics(db_session, top=1)
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+
+    grupos = {grupo["status"]: grupo for grupo in relatorio["por_status"]}
+
+    assert len(consultas) == 2
+    assert (relatorio["pedidos"], relatorio["receita"]) == (4, 125)
+    assert grupos["FINALIZADO"]["pedidos"] == 2
+    assert grupos["FINALIZADO"]["ticket_medio"] == 47.5
+    assert grupos["FINALIZADO"]["combinacoes"] == [
+        {"sabor": "CALABRESA", "tamanho": "MEDIA", "quantidade": 3, "receita": 75}
+    ]
+    assert grupos["PENDENTE"]["combinacoes"] == []
+
+
+# ----------------------------------------
+# Relatório pela API
+# Deve servir o resultado em cache até pedir atualizar=true
+# ----------------------------------------
+def test_report_route_cached(auth_headers_admin, db_session, admin):
+    _seed(db_session, admin.id)
+
+    primeiro = client.get("/orders/relatorio", headers=auth_headers_admin)
+    db_session.add(Pedido(usuario=admin.id, status="PENDENTE", preco=0))
+    db_session.commit()
+    em_cache = client.get("/orders/relatorio", headers=auth_headers_admin)
+    atualizado = client.get("/orders/relatorio", params={"atualizar": True}, headers=auth_headers_admin)
+
+    assert primeiro.status_code == 200
+    assert em_cache.json() == primeiro.json()
+    assert atualizado.json()["pedidos"] == 5
+
+
+# ----------------------------------------
+# Cache expirado com requisições simultâneas
+# Só uma deve recalcular; as demais recebem o mesmo resultado
+# ----------------------------------------
+def test_report_recomputed_once_when_concurrent(db_session, admin, async_session_factory, monkeypatch):
+    _seed(db_session, admin.id)
+    calculos = []
+
+    def _order_analytics(db, *args):
+        calculos.append(args)
+        return order_analytics(db, *args)
+
+    monkeypatch.setattr(analytics_service, "order_analytics", _order_analytics)
+
+    async def _requisicao():
+        async with async_session_factory() as db:
+            return await analytics_service.order_analytics_async(db, top=1)
+
+    async def _main():
+        return await asyncio.gather(*(_requisicao() for _ in range(5)))
+
+    relatorios = asyncio.run(_main())
+
+    assert len(calculos) == 1
+    assert all(relatorio is relatorios[0] for relatorio in relatorios)
+
+
+# ----------------------------------------
+# Relatório como usuário comum
+# Deve retornar 403
+# ----------------------------------------
+def test_report_forbidden(auth_headers):
+    response = client.get("/orders/relatorio", headers=auth_headers)
+
+    assert response.status_code == 403
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import threading
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.api.routes.order_routes import _order_event_stream
+from app.core.events import EventBroker, InMemoryBroker, get_order_broker
+from app.models.order import Pedido
+from app.schemas.order import OrderItem
+from app.services import order_service
+from app.services.order_service import cancel_order
+
+# ----------------------------------------
+# Testes do push de eventos de pedidos
+# ----------------------------------------
+
+# ----------------------------------------
+# Publicar para um usuário
+# Só os assinantes desse usuário recebem, inclusive vindo de outra thread
+# ----------------------------------------
+def test_broker_delivers_to_user_subscribers():
+    broker = InMemoryBroker(queue_size=10)
+
+    async def _main():
+        inscricao = broker.subscribe(1)
+        outra = broker.subscribe(2)
+
+        thread = threading.Thread(target=broker.publish, args=(1, {"pedido_id": 7}))
+        thread.start()
+        thread.join()
+
+        assert await inscricao.get(timeout=1) == {"pedido_id": 7}
+        assert await outra.get(timeout=0.05) is None
+
+        broker.unsubscribe(inscricao)
+        broker.unsubscribe(outra)
+        assert broker.stats()["subscribers"] == 0
+
+    asyncio.run(_main())
+
+
+# ----------------------------------------
+# Assinante lento
+# Deve manter só os eventos mais recentes
+# ----------------------------------------
+def test_broker_drops_oldest_when_full():
+    broker = InMemoryBroker(queue_size=2)
+
+    async def _main():
+        inscricao = broker.subscribe(1)
+        for versao in range(1, 4):
+            broker.publish(1, {"versao": versao})
+        await asyncio.sleep(0)
+
+        assert [(await inscricao.get(timeout=1))["versao"] for _ in range(2)] == [2, 3]
+        assert inscricao.dropped == 1
+
+    asyncio.run(_main())
+
+
+# ----------------------------------------
+# Broker incompleto
+# Deve falhar ao ser criado, não na primeira publicação
+# ----------------------------------------
+def test_incomplete_broker_fails_on_creation():
+    class SoPublica(EventBroker):
+        def publish(self, usuario_id, evento):
+            pass
+
+    with pytest.raises(TypeError):
+        SoPublica()
+
+
+# ----------------------------------------
+# Cancelar pedido
+# Deve publicar o novo status para o dono do pedido
+# ----------------------------------------
+def test_cancel_order_publishes_status(db_session, user):
+    pedido = Pedido(usuario=user.id)
+    db_session.add(pedido)
+    db_session.commit()
+
+    async def _main():
+        broker = get_order_broker()
+        inscricao = broker.subscribe(user.id)
+        try:
+            await asyncio.to_thread(cancel_order, db_session, pedido.id, user)
+            return await inscricao.get(timeout=1)
+        finally:
+            broker.unsubscribe(inscricao)
+
+    evento = asyncio.run(_main())
+
+    assert evento["tipo"] == "status"
+    assert evento["pedido_id"] == pedido.id
+    assert evento["status"] == "CANCELADO"
+    assert evento["versao"] == 2
+
+
+# ----------------------------------------
+# Alterar itens e o status
+# O evento deve sair com a nova versão, sem consultar o pedido após o commit
+# ----------------------------------------
+def test_mutations_publish_without_select(db_session, user, monkeypatch):
+    pedido = Pedido(usuario=user.id)
+    db_session.add(pedido)
+    db_session.commit()
+    pedido_id = pedido.id
+
+    eventos = []
+    broker = InMemoryBroker(queue_size=10)
+    monkeypatch.setattr(broker, "publish", lambda usuario_id, evento: eventos.append(evento))
+    monkeypatch.setattr(order_service, "get_order_broker", lambda: broker)
+
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    # Como o SessionLocal da aplicação: objetos continuam válidos após o commit
+    sessao = Session(bind=db_session.get_bind(), expire_on_commit=False)
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sessao, "after_commit", lambda _: statements.append("COMMIT"))
+    item = OrderItem(quantidade=1, preco_unitario=30, sabor="CALABRESA", tamanho="MEDIA")
+    try:
+        order_service.add_item_to_order(sessao, pedido_id, item, user)
+        assert statements[-1] == "COMMIT"
+
+        order_service.cancel_order(sessao, pedido_id, user)
+        assert statements[-1] == "COMMIT"
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+        sessao.close()
+
+    assert eventos == [
+        {"tipo": "preco", "pedido_id": pedido_id, "status": "PENDENTE", "preco": 30, "versao": 2},
+        {"tipo": "status", "pedido_id": pedido_id, "status": "CANCELADO", "preco": 30, "versao": 3},
+    ]
+
+
+# ----------------------------------------
+# Stream SSE
+# Deve enviar keep-alive quando ocioso e os eventos no formato SSE
+# ----------------------------------------
+def test_order_event_stream_format():
+    async def _main():
+        stream = _order_event_stream(1, keepalive=0.01)
+        assert (await anext(stream)).startswith("retry:")
+        assert await anext(stream) == ": keep-alive\n\n"
+
+        get_order_broker().publish(1, {"pedido_id": 3, "versao": 2, "status": "FINALIZADO"})
+        mensagem = await anext(stream)
+        while mensagem.startswith(":"):
+            mensagem = await anext(stream)
+        await stream.aclose()
+        return mensagem
+
+    mensagem = asyncio.run(_main())
+    linhas = mensagem.strip().split("\n")
+
+    assert linhas[0] == "id: 3-2"
+    assert linhas[1] == "event: pedido"
+    assert json.loads(linhas[2].removeprefix("data: "))["status"] == "FINALIZADO"
+    assert get_order_broker().stats()["subscribers"] == 0
@@ -0,0 +1,139 @@
+import asyncio
+import csv
+import io
+import json
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.main import app
+from app.db.session import stream_partitions
+from app.models.base import Base
+from app.models.order import Pedido, ItemPedido
+from app.services.export_service import NdjsonExport
+
+# ----------------------------------------
+# Testes da exportação de pedidos (admin)
+# ----------------------------------------
+
+client = TestClient(app)
+
+
+def _seed(db_session, usuario_id):
+    pedidos = [
+        Pedido(usuario=usuario_id, status="PENDENTE", preco=50),
+        Pedido(usuario=usuario_id, status="FINALIZADO", preco=20),
+        Pedido(usuario=usuario_id, status="PENDENTE", preco=0),
+    ]
+    db_session.add_all(pedidos)
+    db_session.flush()
+    db_session.add_all([
+        ItemPedido(pedidos[0].id, 2, 25, "CALABRESA", "MEDIA"),
+        ItemPedido(pedidos[1].id, 1, 10, "MARGUERITA", "PEQUENA"),
+        ItemPedido(pedidos[1].id, 1, 10, "PORTUGUESA", "PEQUENA"),
+    ])
+    db_session.commit()
+    return pedidos
+
+
+# ----------------------------------------
+# Exportar em NDJSON
+# Deve enviar um pedido por linha com os itens aninhados
+# ----------------------------------------
+def test_export_ndjson(auth_headers_admin, db_session, admin):
+    pedidos = _seed(db_session, admin.id)
+
+    response = client.get("/orders/exportar", headers=auth_headers_admin)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    linhas = [json.loads(linha) for linha in response.text.splitlines()]
+    assert [linha["id"] for linha in linhas] == [pedido.id for pedido in pedidos]
+    assert [len(linha["itens"]) for linha in linhas] == [1, 2, 0]
+    assert linhas[0]["criado_em"] is not None
+
+
+# ----------------------------------------
+# Exportar em CSV com filtros
+# Deve enviar uma linha por item, só dos pedidos filtrados
+# ----------------------------------------
+def test_export_csv_with_filters(auth_headers_admin, db_session, admin):
+    pedidos = _seed(db_session, admin.id)
+
+    response = client.get(
+        "/orders/exportar",
+        params={"formato": "csv", "status": "PENDENTE", "id_min": pedidos[0].id},
+        headers=auth_headers_admin
+    )
+
+    assert response.status_code == 200
+    linhas = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(linha["pedido_id"]) for linha in linhas] == [pedidos[0].id, pedidos[2].id]
+    assert linhas[0]["sabor"] == "CALABRESA"
+    assert linhas[1]["item_id"] == ""
+
+
+# ----------------------------------------
+# Filtro por data de criação
+# Pedidos criados antes do início do período não são exportados
+# ----------------------------------------
+def test_export_date_filter(auth_headers_admin, db_session, admin):
+    _seed(db_session, admin.id)
+
+    response = client.get(
+        "/orders/exportar",
+        params={"criado_de": "2999-01-01T00:00:00"},
+        headers=auth_headers_admin
+    )
+
+    assert response.status_code == 200
+    assert response.text == ""
+
+
+# ----------------------------------------
+# Exportar como usuário comum
+# Deve retornar 403
+# ----------------------------------------
+def test_export_forbidden(auth_headers):
+    response = client.get("/orders/exportar", headers=auth_headers)
+
+    assert response.status_code == 403
+
+
+# ----------------------------------------
+# Pedido dividido entre dois lotes
+# Deve sair em uma única linha
+# ----------------------------------------
+def test_ndjson_export_across_batches():
+    exportador = NdjsonExport()
+    linha = (1, 1, "PENDENTE", 20.0, None, 1, 1, 10.0, "CALABRESA", "MEDIA")
+
+    primeiro = exportador.encode([linha])
+    segundo = exportador.encode([(*linha[:5], 2, *linha[6:])])
+    ultimo = exportador.finish()
+
+    assert primeiro == segundo == b""
+    assert len(json.loads(ultimo)["itens"]) == 2
+
+
+# ----------------------------------------
+# Leitura em lotes com engine assíncrono
+# Deve entregar todas as linhas em lotes do tamanho pedido
+# ----------------------------------------
+def test_stream_partitions_async_engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/stream.db")
+
+    async def _main():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(
+                insert(Pedido),
+                [{"usuario_id": 1, "status": "PENDENTE", "preco": 0} for _ in range(25)]
+            )
+        lotes = [
+            len(lote)
+            async for lote in stream_partitions(engine, select(Pedido.id), tamanho=10)
+        ]
+        await engine.dispose()
+        return lotes
+
+    assert asyncio.run(_main()) == [10, 10, 5]
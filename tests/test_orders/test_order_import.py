@@ -0,0 +1,130 @@
+import json
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from app import cli
+from app.core.config import settings
+from app.main import app
+from app.models.order import Pedido, ItemPedido
+from app.services.import_service import import_orders
+
+# ----------------------------------------
+# Testes da importação de pedidos em lote
+# ----------------------------------------
+
+client = TestClient(app)
+
+
+def _linha(usuario_id, itens=None, **extra):
+    itens = itens if itens is not None else [
+        {"quantidade": 2, "preco_unitario": 25, "sabor": "CALABRESA", "tamanho": "MEDIA"}
+    ]
+    return json.dumps({"usuario": usuario_id, "itens": itens, **extra})
+
+
+# ----------------------------------------
+# Lote com linhas válidas e inválidas
+# Deve gravar as válidas e reportar as demais pelo número da linha
+# ----------------------------------------
+def test_import_orders_reports_row_errors(db_session, user):
+    linhas = [
+        _linha(user.id),
+        "{não é json",
+        _linha(user.id, [{"quantidade": 1, "preco_unitario": 10, "sabor": "ATUM", "tamanho": "MEDIA"}]),
+        "",
+        _linha(9999),
+        _linha(user.id, status="FINALIZADO", criado_em="2024-05-01T12:00:00"),
+    ]
+
+    resultado = import_orders(db_session, linhas, lote=2)
+
+    assert resultado["importados"] == 2
+    assert [erro["linha"] for erro in resultado["erros"]] == [2, 3, 5]
+    assert "itens.0.sabor" in resultado["erros"][1]["erro"]
+    assert "9999" in resultado["erros"][2]["erro"]
+
+    db_session.expire_all()
+    pedidos = db_session.scalars(select(Pedido).order_by(Pedido.id)).all()
+    assert [(p.status, p.preco) for p in pedidos] == [("PENDENTE", 50), ("FINALIZADO", 50)]
+    assert pedidos[1].criado_em.year == 2024
+    assert len(db_session.scalars(select(ItemPedido)).all()) == 2
+
+
+# ----------------------------------------
+# Importar pelo endpoint
+# Deve aceitar NDJSON no corpo e gravar em lotes
+# ----------------------------------------
+def test_import_route(auth_headers_admin, db_session, admin):
+    corpo = "\n".join(_linha(admin.id) for _ in range(5)) + "\n{}\n"
+
+    response = client.post(
+        "/orders/importar",
+        params={"lote": 2},
+        content=corpo,
+        headers={**auth_headers_admin, "Content-Type": "application/x-ndjson"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["importados"] == 5
+    assert [erro["linha"] for erro in response.json()["erros"]] == [6]
+
+
+# ----------------------------------------
+# Corpo enviado em pedaços (sem Content-Length)
+# Linhas partidas entre pedaços devem ser remontadas
+# ----------------------------------------
+def test_import_route_streamed(auth_headers_admin, db_session, admin):
+    corpo = ("\n".join(_linha(admin.id) for _ in range(4)) + "\n{}").encode()
+
+    def _pedacos(tamanho=7):
+        for inicio in range(0, len(corpo), tamanho):
+            yield corpo[inicio:inicio + tamanho]
+
+    response = client.post(
+        "/orders/importar",
+        params={"lote": 3},
+        content=_pedacos(),
+        headers={**auth_headers_admin, "Content-Type": "application/x-ndjson"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["importados"] == 4
+    assert [erro["linha"] for erro in response.json()["erros"]] == [5]
+
+
+# ----------------------------------------
+# Corpo acima de IMPORT_MAX_BYTES
+# Deve retornar 413, com ou sem Content-Length
+# ----------------------------------------
+def test_import_route_body_too_large(auth_headers_admin, admin, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_MAX_BYTES", 64)
+    corpo = "\n".join(_linha(admin.id) for _ in range(3)).encode()
+    headers = {**auth_headers_admin, "Content-Type": "application/x-ndjson"}
+
+    assert client.post("/orders/importar", content=corpo, headers=headers).status_code == 413
+    assert client.post(
+        "/orders/importar", content=iter([corpo[:40], corpo[40:]]), headers=headers
+    ).status_code == 413
+
+
+# ----------------------------------------
+# Importar como usuário comum
+# Deve retornar 403
+# ----------------------------------------
+def test_import_forbidden(auth_headers, user):
+    response = client.post("/orders/importar", content=_linha(user.id), headers=auth_headers)
+
+    assert response.status_code == 403
+
+
+# ----------------------------------------
+# Importar pela linha de comando
+# Deve ler o arquivo e sair com código 1 se houver erros
+# ----------------------------------------
+def test_import_cli(db_session, user, tmp_path, capsys):
+    arquivo = tmp_path / "pedidos.ndjson"
+    arquivo.write_text(_linha(user.id) + "\n" + _linha(user.id, itens=[]) + "\n[]\n")
+
+    codigo = cli.main(["importar-pedidos", str(arquivo), "--lote", "1"])
+
+    assert codigo == 1
+    assert "2 pedido(s) importado(s), 1 erro(s)" in capsys.readouterr().out
@@ -1,13 +1,21 @@
 # ----------------------------------------
 # Testes de integração para as rotas de pedidos
 # ----------------------------------------
+import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from app.main import app
 from app.models.order import Pedido, ItemPedido
 
 
 client = TestClient(app)
 
+
+# Rotas pelos dois caminhos: Session (threadpool) e AsyncSession (aiosqlite)
+@pytest.fixture(params=["sync", "async"])
+def session_mode(request):
+    return request.param
+
 # ----------------------------------------
 # Acessar rota base de pedidos
 # Deve retornar mensagem e user_id
@@ -37,6 +45,28 @@ def test_create_order_success(auth_headers):
     assert "pedido_id" in response.json()
 
 
+# ----------------------------------------
+# Criar pedido já com itens
+# Deve retornar 201 com o preço total calculado
+# ----------------------------------------
+def test_create_order_with_items(auth_headers):
+    payload = {
+        "itens": [
+            {"quantidade": 2, "preco_unitario": 25, "sabor": "CALABRESA", "tamanho": "MEDIA"},
+            {"quantidade": 1, "preco_unitario": 40, "sabor": "PORTUGUESA", "tamanho": "GRANDE"},
+        ]
+    }
+
+    response = client.post(
+        "/orders/pedido",
+        json=payload,
+        headers=auth_headers
+    )
+
+    assert response.status_code == 201
+    assert response.json()["preco_total"] == 90
+
+
 # ----------------------------------------
 # Cancelar pedido com sucesso
 # Usuário dono pode cancelar
@@ -84,7 +114,78 @@ def test_list_my_orders(auth_headers, db_session, user):
     )
 
     assert response.status_code == 200
-    assert len(response.json()) == 2
+    assert len(response.json()["pedidos"]) == 2
+    assert response.json()["next_cursor"] is None
+
+
+# ----------------------------------------
+# Paginação por cursor dos pedidos do usuário
+# Deve percorrer todas as páginas sem repetir pedidos
+# ----------------------------------------
+def test_list_my_orders_pagination(auth_headers, db_session, user):
+    db_session.add_all([Pedido(usuario=user.id) for _ in range(5)])
+    db_session.commit()
+
+    ids = []
+    cursor = None
+    while True:
+        params = {"limite": 2}
+        if cursor is not None:
+            params["cursor"] = cursor
+        response = client.get(
+            "/orders/meus_pedidos",
+            params=params,
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert len(body["pedidos"]) <= 2
+        ids += [pedido["id"] for pedido in body["pedidos"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert ids == sorted(ids)
+    assert len(ids) == 5
+
+
+# ----------------------------------------
+# Tamanho de página acima do limite
+# Deve retornar 422
+# ----------------------------------------
+def test_list_my_orders_page_size_cap(auth_headers):
+    response = client.get(
+        "/orders/meus_pedidos",
+        params={"limite": 10_000},
+        headers=auth_headers
+    )
+
+    assert response.status_code == 422
+
+
+# ----------------------------------------
+# Filtros por status e faixa de preço (admin)
+# Deve retornar apenas os pedidos que atendem aos filtros
+# ----------------------------------------
+def test_list_orders_filters(auth_headers_admin, db_session, admin):
+    db_session.add_all([
+        Pedido(usuario=admin.id, status="PENDENTE", preco=10),
+        Pedido(usuario=admin.id, status="PENDENTE", preco=80),
+        Pedido(usuario=admin.id, status="FINALIZADO", preco=50),
+    ])
+    db_session.commit()
+
+    response = client.get(
+        "/orders/listar",
+        params={"status": "PENDENTE", "preco_min": 20},
+        headers=auth_headers_admin
+    )
+
+    assert response.status_code == 200
+    pedidos = response.json()["pedidos"]
+    assert len(pedidos) == 1
+    assert pedidos[0]["preco"] == 80
+    assert pedidos[0]["usuario"] == admin.id
 
 
 # ----------------------------------------
@@ -151,7 +252,7 @@ def test_add_item_to_order(auth_headers, db_session, user):
 # Deve atualizar o preço após remoção
 # ----------------------------------------
 def test_remove_item_from_order(auth_headers, db_session, user):
-    pedido = Pedido(usuario=user.id)
+    pedido = Pedido(usuario=user.id, preco=40)
     db_session.add(pedido)
     db_session.commit()
 
@@ -174,6 +275,33 @@ def test_remove_item_from_order(auth_headers, db_session, user):
     assert response.json()["preco_total"] == 0
 
 
+# ----------------------------------------
+# Adicionar e remover itens em lote
+# Deve retornar o pedido final com o preço atualizado
+# ----------------------------------------
+def test_update_items_batch(auth_headers, db_session, user):
+    pedido = Pedido(usuario=user.id)
+    db_session.add(pedido)
+    db_session.commit()
+
+    payload = {
+        "adicionar": [
+            {"quantidade": 1, "preco_unitario": 25, "sabor": "CALABRESA", "tamanho": "MEDIA"},
+            {"quantidade": 2, "preco_unitario": 40, "sabor": "QUATRO_QUEIJOS", "tamanho": "GRANDE"},
+        ]
+    }
+
+    response = client.post(
+        f"/orders/pedido/atualizar_itens/{pedido.id}",
+        json=payload,
+        headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    assert response.json()["preco"] == 105
+    assert len(response.json()["itens"]) == 2
+
+
 # ----------------------------------------
 # Finalizar pedido
 # Deve alterar status para FINALIZADO
@@ -190,3 +318,117 @@ def test_finalize_order_success(auth_headers, db_session, user):
 
     assert response.status_code == 200
     assert response.json()["status"] == "FINALIZADO"
+
+
+# ----------------------------------------
+# Consulta condicional de um pedido
+# Deve responder 304 com a mesma ETag, sem consultar os itens
+# ----------------------------------------
+def test_view_order_etag_not_modified(auth_headers, db_session, user):
+    pedido = Pedido(usuario=user.id)
+    db_session.add(pedido)
+    db_session.commit()
+
+    response = client.get(f"/orders/pedido/{pedido.id}", headers=auth_headers)
+    etag = response.headers["ETag"]
+    assert etag == f'"{pedido.id}-1"'
+
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        response = client.get(
+            f"/orders/pedido/{pedido.id}",
+            headers={**auth_headers, "If-None-Match": etag}
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert not any("itens_pedidos" in statement for statement in statements)
+
+
+# ----------------------------------------
+# Pedido fora do cache
+# ETag e corpo devem sair de um único SELECT do pedido
+# ----------------------------------------
+def test_view_order_reads_order_row_once(auth_headers, db_session, user, async_session_factory):
+    pedido = Pedido(usuario=user.id)
+    db_session.add(pedido)
+    db_session.commit()
+    pedido_id = pedido.id
+
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    # Rota síncrona ou assíncrona: cada uma consulta pelo seu engine
+    engines = [db_session.get_bind(), async_session_factory.kw["bind"].sync_engine]
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        response = client.get(f"/orders/pedido/{pedido_id}", headers=auth_headers)
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == f'"{pedido_id}-1"'
+    assert sum("FROM pedidos" in statement for statement in statements) == 1
+
+
+# ----------------------------------------
+# Consulta condicional após alteração do pedido
+# Deve responder 200 com nova ETag e o conteúdo atualizado
+# ----------------------------------------
+def test_view_order_etag_changes_after_mutation(auth_headers, db_session, user):
+    pedido = Pedido(usuario=user.id)
+    db_session.add(pedido)
+    db_session.commit()
+
+    etag = client.get(f"/orders/pedido/{pedido.id}", headers=auth_headers).headers["ETag"]
+    client.post(
+        f"/orders/pedido/adicionar_item/{pedido.id}",
+        json={"quantidade": 1, "preco_unitario": 30, "sabor": "CALABRESA", "tamanho": "MEDIA"},
+        headers=auth_headers
+    )
+
+    response = client.get(
+        f"/orders/pedido/{pedido.id}",
+        headers={**auth_headers, "If-None-Match": etag}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["preco"] == 30
+    assert len(response.json()["itens"]) == 1
+
+
+# ----------------------------------------
+# Consulta condicional da lista de pedidos
+# Deve responder 304 até algum pedido da página mudar
+# ----------------------------------------
+def test_list_my_orders_etag(auth_headers, db_session, user):
+    pedidos = [Pedido(usuario=user.id) for _ in range(3)]
+    db_session.add_all(pedidos)
+    db_session.commit()
+
+    etag = client.get("/orders/meus_pedidos", headers=auth_headers).headers["ETag"]
+    headers = {**auth_headers, "If-None-Match": etag}
+
+    assert client.get("/orders/meus_pedidos", headers=headers).status_code == 304
+
+    client.post(f"/orders/pedido/cancelar/{pedidos[1].id}", headers=auth_headers)
+    response = client.get("/orders/meus_pedidos", headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert [pedido["status"] for pedido in response.json()["pedidos"]] == [
+        "PENDENTE", "CANCELADO", "PENDENTE"
+    ]
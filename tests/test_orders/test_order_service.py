@@ -1,4 +1,5 @@
 import pytest
+from sqlalchemy import event, insert
 from app.services.order_service import (
     create_order,
     cancel_order,
@@ -8,11 +9,16 @@ from app.services.order_service import (
     get_order_by_id,
     add_item_to_order,
     remove_item_from_order,
+    check_order_totals,
+    update_order_items,
+    get_order_version,
+    list_all_orders_projected,
+    get_orders_projected,
 )
 from app.models.user import Usuario
 from app.models.order import Pedido, ItemPedido
-from app.schemas.order import OrderItem
-from app.core.exceptions import ForbiddenException, NotFoundException
+from app.schemas.order import OrderItem, OrderItemsBatch, ResponsePedidoSchema
+from app.core.exceptions import ForbiddenException, NotFoundException, BadRequestException
 
 # ----------------------------------------
 # Testes unitários para o serviço de pedidos
@@ -31,6 +37,23 @@ def test_create_order_success(db_session, user):
     assert pedido.preco == 0
 
 
+# ----------------------------------------
+# Criar pedido já com itens
+# Deve inserir os itens e calcular o preço em um único commit
+# ----------------------------------------
+def test_create_order_with_items(db_session, user):
+    itens = [
+        OrderItem(quantidade=2, preco_unitario=30, sabor="CALABRESA", tamanho="MEDIA"),
+        OrderItem(quantidade=1, preco_unitario=45, sabor="QUATRO_QUEIJOS", tamanho="GRANDE"),
+    ]
+
+    pedido = create_order(db=db_session, user=user, itens=itens)
+
+    assert pedido.preco == 105
+    assert len(pedido.itens) == 2
+    assert check_order_totals(db_session) == []
+
+
 # ----------------------------------------
 # Cancelar pedido com sucesso
 # Dono do pedido pode cancelar
@@ -234,6 +257,7 @@ def test_remove_item_from_order(db_session, user):
         tamanho="GRANDE"
     )
     db_session.add(item)
+    pedido.preco = 50
     db_session.commit()
 
     pedido_atualizado = remove_item_from_order(
@@ -256,3 +280,242 @@ def test_remove_item_not_found(db_session, user):
             item_id=999,
             user=user
         )
+
+
+# ----------------------------------------
+# Preço mantido de forma incremental
+# Adições e remoções aplicam apenas a diferença, em um único commit
+# ----------------------------------------
+def test_add_and_remove_items_incremental_price(db_session, user):
+    pedido = create_order(db_session, user)
+
+    commits = []
+
+    def _after_commit(session):
+        commits.append(session)
+
+    event.listen(db_session, "after_commit", _after_commit)
+    try:
+        for quantidade, preco in [(2, 30), (1, 15.5), (3, 10)]:
+            add_item_to_order(
+                db=db_session,
+                pedido_id=pedido.id,
+                item_data=OrderItem(
+                    quantidade=quantidade,
+                    preco_unitario=preco,
+                    sabor="CALABRESA",
+                    tamanho="MEDIA"
+                ),
+                user=user
+            )
+        assert len(commits) == 3
+    finally:
+        event.remove(db_session, "after_commit", _after_commit)
+
+    assert pedido.preco == 105.5
+
+    item = db_session.query(ItemPedido).filter(ItemPedido.preco_unitario == 15.5).first()
+    pedido_atualizado = remove_item_from_order(db=db_session, item_id=item.id, user=user)
+    assert pedido_atualizado.preco == 90
+    assert check_order_totals(db_session) == []
+
+
+# ----------------------------------------
+# Adicionar e remover itens em lote
+# Deve aplicar tudo em um commit e manter o preço consistente
+# ----------------------------------------
+def test_update_order_items_batch(db_session, user):
+    pedido = create_order(db_session, user)
+    existente = add_item_to_order(
+        db=db_session,
+        pedido_id=pedido.id,
+        item_data=OrderItem(quantidade=1, preco_unitario=40, sabor="PORTUGUESA", tamanho="GRANDE"),
+        user=user
+    ).itens[0]
+
+    pedido_atualizado = update_order_items(
+        db=db_session,
+        pedido_id=pedido.id,
+        itens=OrderItemsBatch(
+            adicionar=[
+                OrderItem(quantidade=2, preco_unitario=30, sabor="CALABRESA", tamanho="MEDIA")
+                for _ in range(30)
+            ],
+            remover=[existente.id]
+        ),
+        user=user
+    )
+
+    assert len(pedido_atualizado.itens) == 30
+    assert pedido_atualizado.preco == 1800
+    assert check_order_totals(db_session) == []
+
+
+# ----------------------------------------
+# Remover em lote item de outro pedido
+# Deve lançar NotFoundException sem alterar nada
+# ----------------------------------------
+def test_update_order_items_foreign_item(db_session, user):
+    pedido = create_order(db_session, user)
+    outro = add_item_to_order(
+        db=db_session,
+        pedido_id=create_order(db_session, user).id,
+        item_data=OrderItem(quantidade=1, preco_unitario=40, sabor="PORTUGUESA", tamanho="GRANDE"),
+        user=user
+    )
+
+    with pytest.raises(NotFoundException):
+        update_order_items(
+            db=db_session,
+            pedido_id=pedido.id,
+            itens=OrderItemsBatch(remover=[outro.itens[0].id]),
+            user=user
+        )
+
+
+# ----------------------------------------
+# Lote vazio
+# Deve lançar BadRequestException
+# ----------------------------------------
+def test_update_order_items_empty(db_session, user):
+    pedido = create_order(db_session, user)
+
+    with pytest.raises(BadRequestException):
+        update_order_items(
+            db=db_session,
+            pedido_id=pedido.id,
+            itens=OrderItemsBatch(),
+            user=user
+        )
+
+
+# ----------------------------------------
+# Verificação de consistência
+# Deve reportar e corrigir pedidos com preço divergente dos itens
+# ----------------------------------------
+def test_check_order_totals_reports_and_fixes_drift(db_session, user):
+    pedido = create_order(db_session, user)
+    db_session.add(ItemPedido(
+        pedido=pedido.id,
+        quantidade=2,
+        preco_unitario=20,
+        sabor="PORTUGUESA",
+        tamanho="GRANDE"
+    ))
+    db_session.commit()
+
+    divergencias = check_order_totals(db_session, lote=1)
+    assert divergencias == [
+        {"pedido_id": pedido.id, "preco": 0, "preco_calculado": 40}
+    ]
+
+    check_order_totals(db_session, corrigir=True)
+    db_session.refresh(pedido)
+    assert pedido.preco == 40
+    assert check_order_totals(db_session) == []
+
+
+# ----------------------------------------
+# Versão do pedido
+# Cada alteração do pedido ou dos itens deve incrementá-la
+# ----------------------------------------
+def test_order_version_bumped_by_mutations(db_session, user):
+    pedido = create_order(db_session, user)
+    assert get_order_version(db_session, pedido.id, user) == 1
+
+    item = OrderItem(quantidade=1, preco_unitario=10, sabor="CALABRESA", tamanho="MEDIA")
+    add_item_to_order(db_session, pedido.id, item, user)
+    assert get_order_version(db_session, pedido.id, user) == 2
+
+    update_order_items(db_session, pedido.id, OrderItemsBatch(adicionar=[item]), user)
+    assert get_order_version(db_session, pedido.id, user) == 3
+
+    item_id = db_session.query(ItemPedido.id).filter(ItemPedido.pedido == pedido.id).first()[0]
+    remove_item_from_order(db_session, item_id, user)
+    assert get_order_version(db_session, pedido.id, user) == 4
+
+    finalize_order(db_session, pedido.id, user)
+    assert get_order_version(db_session, pedido.id, user) == 5
+
+
+# ----------------------------------------
+# Projeção direta em dicts
+# Deve produzir o mesmo conteúdo do ResponsePedidoSchema
+# ----------------------------------------
+def test_projected_orders_match_schema(db_session, admin):
+    _seed_orders(db_session, admin.id, 3)
+
+    pedidos = list_user_orders(db_session, admin)
+    esperado = [ResponsePedidoSchema.model_validate(pedido).model_dump() for pedido in pedidos]
+    projetados = get_orders_projected(db_session, [pedido.id for pedido in pedidos])
+
+    assert [corpo for _, corpo in projetados] == esperado
+    assert [versao for versao, _ in projetados] == [1, 1, 1]
+
+    admin_pedidos = list_all_orders_projected(db_session, admin, limite=2)
+    assert [pedido["usuario"] for pedido in admin_pedidos] == [admin.id, admin.id]
+    assert all("id" in item for pedido in admin_pedidos for item in pedido["itens"])
+
+
+# ----------------------------------------
+# Listagens sem N+1
+# O número de SELECTs não deve crescer com a quantidade de pedidos
+# ----------------------------------------
+def _seed_orders(db_session, usuario_id, quantidade):
+    pedidos = db_session.execute(
+        insert(Pedido).returning(Pedido.id),
+        [{"usuario": usuario_id, "status": "PENDENTE", "preco": 10} for _ in range(quantidade)]
+    ).scalars().all()
+    db_session.execute(
+        insert(ItemPedido),
+        [
+            {
+                "pedido": pedido_id,
+                "quantidade": 1,
+                "preco_unitario": 10,
+                "sabor": "CALABRESA",
+                "tamanho": "MEDIA",
+            }
+            for pedido_id in pedidos
+        ]
+    )
+    db_session.commit()
+
+
+def _count_statements(db_session, fn):
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        db_session.expire_all()
+        pedidos = fn()
+        [ResponsePedidoSchema.model_validate(pedido) for pedido in pedidos]
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+    return len(pedidos), len(statements)
+
+
+def test_list_orders_statement_count_constant(db_session, admin):
+    _seed_orders(db_session, admin.id, 10)
+    total_10, user_stmts_10 = _count_statements(
+        db_session, lambda: list_user_orders(db=db_session, user=admin)
+    )
+    _, all_stmts_10 = _count_statements(
+        db_session, lambda: list_all_orders(db=db_session, user=admin)
+    )
+
+    _seed_orders(db_session, admin.id, 10_000 - 10)
+    total_10k, user_stmts_10k = _count_statements(
+        db_session, lambda: list_user_orders(db=db_session, user=admin)
+    )
+    _, all_stmts_10k = _count_statements(
+        db_session, lambda: list_all_orders(db=db_session, user=admin)
+    )
+
+    assert (total_10, total_10k) == (10, 10_000)
+    assert user_stmts_10 == user_stmts_10k
+    assert all_stmts_10 == all_stmts_10k
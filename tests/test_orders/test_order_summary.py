@@ -0,0 +1,148 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.main import app
+from app.models.order import ItemPedido, Pedido
+from app.schemas.order import OrderItem, OrderItemsBatch
+from app.services.order_service import (
+    create_order,
+    cancel_order,
+    finalize_order,
+    add_item_to_order,
+    remove_item_from_order,
+    update_order_items,
+    check_order_totals,
+)
+from app.services.import_service import import_orders
+from app.services.summary_service import get_user_summary, rebuild_summaries
+from app.core.exceptions import ForbiddenException
+
+# ----------------------------------------
+# Testes do resumo de pedidos por usuário
+# ----------------------------------------
+
+client = TestClient(app)
+
+ITEM = OrderItem(quantidade=2, preco_unitario=25, sabor="CALABRESA", tamanho="MEDIA")
+
+
+def _resumo(db_session, user):
+    db_session.expire_all()
+    return get_user_summary(db_session, user)
+
+
+# ----------------------------------------
+# Ciclo de vida dos pedidos
+# O resumo acompanha criação, mudanças de status e de preço
+# ----------------------------------------
+def test_summary_follows_mutations(db_session, user):
+    primeiro = create_order(db_session, user, [ITEM])
+    segundo = create_order(db_session, user, [ITEM])
+    terceiro = create_order(db_session, user)
+
+    finalize_order(db_session, primeiro.id, user)
+    update_order_items(db_session, primeiro.id, OrderItemsBatch(adicionar=[ITEM]), user)
+    cancel_order(db_session, segundo.id, user)
+    cancel_order(db_session, segundo.id, user)
+
+    resumo = _resumo(db_session, user)
+
+    assert resumo["pendentes"] == 1
+    assert resumo["cancelados"] == 1
+    assert resumo["finalizados"] == 1
+    assert resumo["total_gasto"] == 100
+    assert resumo["ultimo_pedido_id"] == terceiro.id
+
+    # Cancelar um pedido finalizado tira o valor do total gasto
+    cancel_order(db_session, primeiro.id, user)
+    resumo = _resumo(db_session, user)
+    assert (resumo["finalizados"], resumo["cancelados"], resumo["total_gasto"]) == (0, 2, 0)
+
+
+# ----------------------------------------
+# Reconstrução em lotes
+# Deve chegar ao mesmo resultado da atualização incremental
+# ----------------------------------------
+def test_rebuild_matches_incremental(db_session, user, admin):
+    for dono in (user, admin, user):
+        pedido = create_order(db_session, dono, [ITEM])
+    finalize_order(db_session, pedido.id, user)
+
+    # Item gravado sem atualizar o preço: corrigir totais ajusta
+    # também o gasto dos pedidos finalizados
+    db_session.add(ItemPedido(pedido.id, 1, 20, "CALABRESA", "MEDIA"))
+    db_session.commit()
+    check_order_totals(db_session, corrigir=True)
+
+    incremental = [_resumo(db_session, dono) for dono in (user, admin)]
+    assert incremental[0]["total_gasto"] == 70
+
+    assert rebuild_summaries(db_session, lote=1) == 2
+    assert [_resumo(db_session, dono) for dono in (user, admin)] == incremental
+
+
+# ----------------------------------------
+# Importação em lote
+# Pedidos importados entram no resumo
+# ----------------------------------------
+def test_import_updates_summary(db_session, user):
+    item = {"quantidade": 1, "preco_unitario": 30, "sabor": "MARGUERITA", "tamanho": "GRANDE"}
+    linhas = [
+        json.dumps({"usuario": user.id, "status": status, "itens": [item]})
+        for status in ("PENDENTE", "FINALIZADO", "FINALIZADO")
+    ]
+
+    import_orders(db_session, linhas, lote=2)
+    resumo = _resumo(db_session, user)
+
+    assert (resumo["pendentes"], resumo["finalizados"], resumo["total_gasto"]) == (1, 2, 60)
+
+
+# ----------------------------------------
+# Alterações de itens
+# Devem ler o pedido com a linha bloqueada (FOR UPDATE), como
+# cancelar/finalizar: o status decide se o delta entra no total gasto
+# ----------------------------------------
+def test_item_changes_lock_order_row(db_session, user):
+    pedido = create_order(db_session, user, [ITEM])
+    item_id = db_session.query(ItemPedido.id).filter(ItemPedido.pedido == pedido.id).scalar()
+    bloqueados = []
+
+    @event.listens_for(db_session, "do_orm_execute")
+    def _captura(state):
+        if state.is_select and state.statement._for_update_arg is not None:
+            bloqueados.append(state.statement.column_descriptions[0]["entity"])
+
+    try:
+        add_item_to_order(db_session, pedido.id, ITEM, user)
+        update_order_items(db_session, pedido.id, OrderItemsBatch(adicionar=[ITEM]), user)
+        remove_item_from_order(db_session, item_id, user)
+    finally:
+        event.remove(db_session, "do_orm_execute", _captura)
+
+    assert bloqueados == [Pedido, Pedido, Pedido]
+
+
+# ----------------------------------------
+# Resumo de outro usuário
+# Apenas admin pode consultar
+# ----------------------------------------
+def test_summary_permission(db_session, user, admin):
+    with pytest.raises(ForbiddenException):
+        get_user_summary(db_session, user, admin.id)
+
+    assert get_user_summary(db_session, admin, user.id)["pendentes"] == 0
+
+
+# ----------------------------------------
+# Consultar resumo pela API
+# ----------------------------------------
+def test_summary_route(auth_headers):
+    criado = client.post("/orders/pedido", json={"itens": [ITEM.model_dump()]}, headers=auth_headers)
+
+    response = client.get("/orders/resumo", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json()["pendentes"] == 1
+    assert response.json()["ultimo_pedido_id"] == criado.json()["pedido_id"]